@@ -1,20 +1,14 @@
 from fastapi import APIRouter, HTTPException, status
 from models.user_model import LoginUser
 from utils.hash_and_verify_password import verify_password
-from core.database import mongodb
+from repositories.storage import storage
 from repositories.user_repository import UserRepository
 from utils.auth_manager import create_token  
-import os
 import logging
 
 logger = logging.getLogger(__name__)
 router = APIRouter(prefix="/auth")
 
-# Obtener secret_key desde env
-env_secret = os.getenv("JWT_SECRET_KEY")
-if not env_secret:
-    raise RuntimeError("JWT_SECRET_KEY no configurado en variables de entorno")
-secret_key = env_secret
 
 @router.post(
     "/login",
@@ -24,7 +18,7 @@ secret_key = env_secret
 async def login(user_data: LoginUser):  
     try:
         # Obtener colección con await
-        users_collection = await mongodb.get_collection("users")
+        users_collection = await storage.get_collection("users")
         repo = UserRepository(users_collection)
         
         # Buscar usuario por email
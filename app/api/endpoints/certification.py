@@ -1,10 +1,16 @@
-from fastapi import APIRouter, Depends, status
+from fastapi import APIRouter, Body, Depends, Query, status, Request, Response
+from typing import Annotated
 from models.certification_model import (
     CertificationCreate,
     CertificationResponse
 )
 from services.certification_service import CertificationService
+from models.bulk_model import BulkResult
+from core.config import settings
 from utils.auth_manager import check_admin_role
+from utils.etag import check_etag
+from utils.serialization import fast_response
+from utils.pagination import LimitQuery, CursorQuery, paginate
 
 router = APIRouter(prefix="/certifications")
 service = CertificationService()
@@ -16,8 +22,18 @@ service = CertificationService()
     summary="Listar certificaciones por usuario",
     description="Obtiene todas las certificaciones de un usuario por su nombre"
 )
-async def list_certifications(username: str):
-    return await service.list_certifications(username)
+async def list_certifications(
+    username: str,
+    request: Request,
+    response: Response,
+    limit: LimitQuery = None,
+    cursor: CursorQuery = None,
+):
+    not_modified = check_etag(request, response, await service.get_etag(username))
+    if not_modified:
+        return not_modified
+    page = await service.list_certifications(username, limit, cursor)
+    return fast_response(paginate(response, page), response)
 
 @router.get(
     "/p/{username}/{id}",
@@ -25,8 +41,11 @@ async def list_certifications(username: str):
     summary="Obtener certificación por ID y usuario",
     description="Obtiene una certificación específica de un usuario por su ID"
 )
-async def get_certification(username: str, id: str):
-    return await service.get_certification(id, username)
+async def get_certification(username: str, id: str, request: Request, response: Response):
+    not_modified = check_etag(request, response, await service.get_etag(username, id))
+    if not_modified:
+        return not_modified
+    return fast_response(await service.get_certification(id, username), response)
     
 
 # -- Operaciones privadas (POST, PUT, DELETE) --
@@ -45,6 +64,27 @@ async def create_certification(
     
     
 
+@router.post(
+    "/bulk",
+    response_model=BulkResult,
+    status_code=status.HTTP_200_OK,
+    summary="Importar certificaciones",
+    description=(
+        "Crea varios certificaciones del usuario autenticado en una sola petición. "
+        "Con replace=true los existentes se eliminan después de crear el lote, solo si no falló ningún elemento. "
+        "Se rechazan como conflicto los elementos cuya certificación ya existe (o se repite en el lote), "
+        "igual que en la creación individual. El resultado se reporta por elemento."
+    ),
+)
+async def bulk_create_certifications(
+    payloads: Annotated[
+        list[CertificationCreate], Body(min_length=1, max_length=settings.BULK_MAX_ITEMS)
+    ],
+    replace: bool = Query(False, description="Reemplazar todos los registros existentes"),
+    current_user=Depends(check_admin_role)
+):
+    return await service.bulk_create_certifications(payloads, current_user.username, replace)
+
 @router.put(
     "/{id}",
     status_code=status.HTTP_200_OK,
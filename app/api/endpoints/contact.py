@@ -1,10 +1,13 @@
-from fastapi import APIRouter, Depends, status
+from fastapi import APIRouter, Depends, status, Request, Response
 from models.contact_model import (
     ContactCreate,
     ContactResponse
 )
 from services.contact_service import ContactService
 from utils.auth_manager import check_admin_role
+from utils.etag import check_etag
+from utils.serialization import fast_response
+from utils.pagination import LimitQuery, CursorQuery, paginate
 
 router = APIRouter(prefix="/contact")
 service = ContactService()
@@ -16,8 +19,18 @@ service = ContactService()
     summary="Listar datos de contacto por usuario",
     description="Obtiene todas los datos de contacto de un usuario por su nombre"
 )
-async def list_contact(username: str):
-    return await service.list_contact(username)
+async def list_contact(
+    username: str,
+    request: Request,
+    response: Response,
+    limit: LimitQuery = None,
+    cursor: CursorQuery = None,
+):
+    not_modified = check_etag(request, response, await service.get_etag(username))
+    if not_modified:
+        return not_modified
+    page = await service.list_contact(username, limit, cursor)
+    return fast_response(paginate(response, page), response)
 
 
 # -- Operaciones privadas (POST, PUT, DELETE) --
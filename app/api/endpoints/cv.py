@@ -0,0 +1,21 @@
+from fastapi import APIRouter, Request, Response
+from models.cv_model import CVResponse
+from services.cv_service import CVService
+from utils.etag import check_etag
+from utils.serialization import fast_response
+
+router = APIRouter(prefix="/cv")
+service = CVService()
+
+# -- GET públicos con prefijo /p/ --
+@router.get(
+    "/p/{username}",
+    response_model=CVResponse,
+    summary="Obtener CV completo de usuario",
+    description="Obtiene en una sola petición todas las secciones del CV de un usuario (las secciones sin datos se devuelven vacías)"
+)
+async def get_cv(username: str, request: Request, response: Response):
+    not_modified = check_etag(request, response, await service.get_etag(username))
+    if not_modified:
+        return not_modified
+    return fast_response(await service.get_cv(username), response)
@@ -1,10 +1,16 @@
-from fastapi import APIRouter, Depends, status
+from fastapi import APIRouter, Body, Depends, Query, status, Request, Response
+from typing import Annotated
 from models.education_model import (
     EducationCreate,
     EducationResponse
 )
 from services.education_service import EducationService
+from models.bulk_model import BulkResult
+from core.config import settings
 from utils.auth_manager import check_admin_role
+from utils.etag import check_etag
+from utils.serialization import fast_response
+from utils.pagination import LimitQuery, CursorQuery, paginate
 
 router = APIRouter(prefix="/education")
 service = EducationService()
@@ -16,8 +22,18 @@ service = EducationService()
     summary="Listar datos de educación por usuario",
     description="Obtiene todas los datos de educación de un usuario por su nombre"
 )
-async def list_education(username: str):
-    return await service.list_education(username)
+async def list_education(
+    username: str,
+    request: Request,
+    response: Response,
+    limit: LimitQuery = None,
+    cursor: CursorQuery = None,
+):
+    not_modified = check_etag(request, response, await service.get_etag(username))
+    if not_modified:
+        return not_modified
+    page = await service.list_education(username, limit, cursor)
+    return fast_response(paginate(response, page), response)
 
 @router.get(
     "/p/{username}/{id}",
@@ -25,8 +41,11 @@ async def list_education(username: str):
     summary="Obtener educación por ID y usuario",
     description="Obtiene una educación específica de un usuario por su ID"
 )
-async def get_education(username: str, id: str):
-    return await service.get_education(id, username)
+async def get_education(username: str, id: str, request: Request, response: Response):
+    not_modified = check_etag(request, response, await service.get_etag(username, id))
+    if not_modified:
+        return not_modified
+    return fast_response(await service.get_education(id, username), response)
 
 
 # -- Operaciones privadas (POST, PUT, DELETE) --
@@ -43,6 +62,27 @@ async def create_education(
 ):
     return await service.create_education(payload, current_user.username)
 
+@router.post(
+    "/bulk",
+    response_model=BulkResult,
+    status_code=status.HTTP_200_OK,
+    summary="Importar educación",
+    description=(
+        "Crea varios registros de educación del usuario autenticado en una sola petición. "
+        "Con replace=true los existentes se eliminan después de crear el lote, solo si no falló ningún elemento. "
+        "Se rechazan como conflicto los elementos cuya carrera ya existe (o se repite en el lote), "
+        "igual que en la creación individual. El resultado se reporta por elemento."
+    ),
+)
+async def bulk_create_education(
+    payloads: Annotated[
+        list[EducationCreate], Body(min_length=1, max_length=settings.BULK_MAX_ITEMS)
+    ],
+    replace: bool = Query(False, description="Reemplazar todos los registros existentes"),
+    current_user=Depends(check_admin_role)
+):
+    return await service.bulk_create_education(payloads, current_user.username, replace)
+
 @router.put(
     "/{id}",
     status_code=status.HTTP_200_OK,
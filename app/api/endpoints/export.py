@@ -0,0 +1,26 @@
+from fastapi import APIRouter, Depends
+from fastapi.responses import StreamingResponse
+from services.export_service import export_service
+from utils.auth_manager import check_admin_role
+from exceptions import ForbiddenException
+
+router = APIRouter(prefix="/export")
+
+@router.get(
+    "/{username}",
+    summary="Exportar portafolio completo",
+    description=(
+        "Descarga como NDJSON todos los documentos del usuario en las colecciones del CV, "
+        "una línea por documento. Solo el propio usuario o un super-admin pueden exportarlo."
+    ),
+    response_class=StreamingResponse,
+    responses={200: {"content": {"application/x-ndjson": {}}}},
+)
+async def export_portfolio(username: str, current_user=Depends(check_admin_role)):
+    if current_user.username != username and "super-admin" not in (current_user.roles or []):
+        raise ForbiddenException("Solo puedes exportar tu propio portafolio")
+    return StreamingResponse(
+        export_service.stream(username),
+        media_type="application/x-ndjson",
+        headers={"Content-Disposition": f'attachment; filename="{username}.ndjson"'},
+    )
@@ -1,6 +1,10 @@
-from fastapi import APIRouter
+from fastapi import APIRouter, Depends, Response, status
 from core.config import settings
-from core.database import mongodb
+from core.health import health_prober
+from core.cache import response_cache, stale_responses
+from core import slow_queries
+from utils.auth_manager import check_admin_role
+from utils.hash_and_verify_password import hashing_engine
 
 router = APIRouter()
 
@@ -11,23 +15,68 @@ router = APIRouter()
     description="Proporciona el estado actual del servicio y sus dependencias"
 )
 async def health_check():
-    service_status = {
-        "status": "healthy",
+    # Lee el último sondeo en segundo plano: no hace ping a la base en cada llamada
+    return {
+        "status": "healthy" if health_prober.ready else "degraded",
         "version": settings.PROJECT_VERSION,
         "dependencies": {
-            "database": "healthy"
-        }
+            "database": health_prober.database
+        },
+        "probe": health_prober.state(),
     }
 
-    # Verificación de la base de datos
-    if mongodb.client:
-        try:
-            await mongodb.client.admin.command("ping")
-        except Exception as e:
-            service_status["dependencies"]["database"] = f"unhealthy: {str(e)}"
-            service_status["status"] = "degraded"
-    else:
-        service_status["dependencies"]["database"] = "disconnected"
-        service_status["status"] = "degraded"
-
-    return service_status
+@router.get(
+    "/healthcheck/live",
+    include_in_schema=False,
+    summary="Liveness",
+    description="El proceso responde. No depende de la base de datos"
+)
+async def liveness():
+    return {"status": "alive", "loop_lag_ms": health_prober.loop_lag_ms}
+
+@router.get(
+    "/healthcheck/ready",
+    include_in_schema=False,
+    summary="Readiness",
+    description="200 si el último sondeo de la base de datos fue correcto y reciente; 503 si no"
+)
+async def readiness(response: Response):
+    if not health_prober.ready:
+        response.status_code = status.HTTP_503_SERVICE_UNAVAILABLE
+    return {"status": "ready" if health_prober.ready else "not ready", **health_prober.state()}
+
+@router.get(
+    "/healthcheck/cache",
+    include_in_schema=False,
+    summary="Estadísticas de la caché",
+    description="Contadores de aciertos, fallos y desalojos de la caché de respuestas públicas"
+)
+async def cache_stats():
+    return response_cache.stats()
+
+@router.get(
+    "/healthcheck/stale",
+    include_in_schema=False,
+    summary="Estadísticas de las copias de respaldo",
+    description="Copias last-known-good de las rutas públicas, modo degradado y respuestas obsoletas servidas"
+)
+async def stale_stats():
+    return stale_responses.stats()
+
+@router.get(
+    "/healthcheck/hashing",
+    include_in_schema=False,
+    summary="Estadísticas del pool de hashing",
+    description="Profundidad de la cola, operaciones en curso y latencia de bcrypt"
+)
+async def hashing_stats():
+    return hashing_engine.stats()
+
+@router.get(
+    "/healthcheck/slow-queries",
+    include_in_schema=False,
+    summary="Consultas lentas recientes",
+    description="Últimos comandos de MongoDB que superaron el umbral, con la forma del filtro y su plan"
+)
+async def slow_query_stats(current_user=Depends(check_admin_role)):
+    return slow_queries.recent()
@@ -0,0 +1,13 @@
+from fastapi import APIRouter, Response
+from prometheus_client import CONTENT_TYPE_LATEST, generate_latest
+
+router = APIRouter()
+
+@router.get(
+    "/metrics",
+    include_in_schema=False,
+    summary="Métricas de Prometheus",
+    description="Latencias y contadores de las peticiones HTTP y de los comandos de MongoDB"
+)
+async def metrics():
+    return Response(generate_latest(), media_type=CONTENT_TYPE_LATEST)
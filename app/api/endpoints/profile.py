@@ -1,10 +1,14 @@
-from fastapi import APIRouter, Body, Depends, status
+from fastapi import APIRouter, Body, Depends, status, Request, Response
 from models.profile_model import (
     ProfileCreate,
     ProfileResponse
 )
+from models.skill_model import SkillsPayload, SkillsAddResult, SkillsRemoveResult
 from services.profile_service import ProfileService
 from utils.auth_manager import check_admin_role
+from utils.etag import check_etag
+from utils.serialization import fast_response
+from utils.pagination import LimitQuery, CursorQuery, paginate
 
 router = APIRouter(prefix="/profile")
 service = ProfileService()
@@ -16,8 +20,18 @@ service = ProfileService()
     summary="Obtner perfil de usuario",
     description="Obtiene el perfil de un usuario por su nombre"
 )
-async def list_profiles(username: str):
-    return await service.list_profiles(username)
+async def list_profiles(
+    username: str,
+    request: Request,
+    response: Response,
+    limit: LimitQuery = None,
+    cursor: CursorQuery = None,
+):
+    not_modified = check_etag(request, response, await service.get_etag(username))
+    if not_modified:
+        return not_modified
+    page = await service.list_profiles(username, limit, cursor)
+    return fast_response(paginate(response, page), response)
 
 # -- Operaciones privadas (POST, PUT, DELETE) --
 @router.post(
@@ -62,6 +76,34 @@ async def delete_profile(
     await service.delete_profile(id, current_user.username)
     
 # -- Nuevos endpoints para habilidades --
+@router.post(
+    "/skills",
+    response_model=SkillsAddResult,
+    status_code=status.HTTP_200_OK,
+    summary="Agregar varias habilidades",
+    description="Agrega en una sola operación varias habilidades al perfil del usuario autenticado (las repetidas se ignoran)"
+)
+async def add_skills(
+    payload: SkillsPayload,
+    current_user=Depends(check_admin_role)
+):
+    return await service.add_skills(payload.skills, current_user.username)
+
+
+@router.post(
+    "/skills/remove",
+    response_model=SkillsRemoveResult,
+    status_code=status.HTTP_200_OK,
+    summary="Remover varias habilidades",
+    description="Elimina en una sola operación varias habilidades del perfil del usuario autenticado"
+)
+async def remove_skills(
+    payload: SkillsPayload,
+    current_user=Depends(check_admin_role)
+):
+    return await service.remove_skills(payload.skills, current_user.username)
+
+
 @router.post(
     "/skill",
     status_code=status.HTTP_200_OK,
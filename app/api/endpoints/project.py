@@ -1,10 +1,17 @@
-from fastapi import APIRouter, Body, Depends, status
+from fastapi import APIRouter, Body, Depends, Query, status, Request, Response
+from typing import Annotated
 from models.project_model import (
     ProjectCreate,
     ProjectResponse
 )
+from models.skill_model import SkillsPayload, SkillsAddResult, SkillsRemoveResult
 from services.project_service import ProjectService
+from models.bulk_model import BulkResult
+from core.config import settings
 from utils.auth_manager import check_admin_role
+from utils.etag import check_etag
+from utils.serialization import fast_response
+from utils.pagination import LimitQuery, CursorQuery, paginate
 
 router = APIRouter(prefix="/projects")
 service = ProjectService()
@@ -16,8 +23,18 @@ service = ProjectService()
     summary="Obtener proyectos de usuario",
     description="Obtiene el proyectos de un usuario por su nombre"
 )
-async def list_projects(username: str):
-    return await service.list_projects(username)
+async def list_projects(
+    username: str,
+    request: Request,
+    response: Response,
+    limit: LimitQuery = None,
+    cursor: CursorQuery = None,
+):
+    not_modified = check_etag(request, response, await service.get_etag(username))
+    if not_modified:
+        return not_modified
+    page = await service.list_projects(username, limit, cursor)
+    return fast_response(paginate(response, page), response)
 
 @router.get(
     "/p/{username}/{id}",
@@ -25,8 +42,11 @@ async def list_projects(username: str):
     summary="Obtener proyecto por ID y usuario",
     description="Obtiene una proyecto específica de un usuario por su ID"
 )
-async def get_project(username: str, id: str):
-    return await service.get_project(id, username)
+async def get_project(username: str, id: str, request: Request, response: Response):
+    not_modified = check_etag(request, response, await service.get_etag(username, id))
+    if not_modified:
+        return not_modified
+    return fast_response(await service.get_project(id, username), response)
 
 # -- Operaciones privadas (POST, PUT, DELETE) --
 @router.post(
@@ -44,6 +64,27 @@ async def create_project(
     
     
 
+@router.post(
+    "/bulk",
+    response_model=BulkResult,
+    status_code=status.HTTP_200_OK,
+    summary="Importar proyectos",
+    description=(
+        "Crea varios proyectos del usuario autenticado en una sola petición. "
+        "Con replace=true los existentes se eliminan después de crear el lote, solo si no falló ningún elemento. "
+        "Se rechazan como conflicto los elementos cuyo título ya existe (o se repite en el lote), "
+        "igual que en la creación individual. El resultado se reporta por elemento."
+    ),
+)
+async def bulk_create_projects(
+    payloads: Annotated[
+        list[ProjectCreate], Body(min_length=1, max_length=settings.BULK_MAX_ITEMS)
+    ],
+    replace: bool = Query(False, description="Reemplazar todos los registros existentes"),
+    current_user=Depends(check_admin_role)
+):
+    return await service.bulk_create_projects(payloads, current_user.username, replace)
+
 @router.put(
     "/{id}",
     status_code=status.HTTP_200_OK,
@@ -71,6 +112,36 @@ async def delete_project(
     await service.delete_project(id, current_user.username)
     
 # -- Nuevos endpoints para stack (skills) --
+@router.post(
+    "/{id}/skills",
+    response_model=SkillsAddResult,
+    status_code=status.HTTP_200_OK,
+    summary="Agregar varias skills al proyecto",
+    description="Agrega en una sola operación varias skills al stack de un proyecto del usuario autenticado (las repetidas se ignoran)"
+)
+async def add_skills_to_project(
+    id: str,
+    payload: SkillsPayload,
+    current_user=Depends(check_admin_role)
+):
+    return await service.add_skills(payload.skills, id, current_user.username)
+
+
+@router.post(
+    "/{id}/skills/remove",
+    response_model=SkillsRemoveResult,
+    status_code=status.HTTP_200_OK,
+    summary="Remover varias skills del proyecto",
+    description="Remueve en una sola operación varias skills del stack de un proyecto del usuario autenticado"
+)
+async def remove_skills_from_project(
+    id: str,
+    payload: SkillsPayload,
+    current_user=Depends(check_admin_role)
+):
+    return await service.remove_skills(payload.skills, id, current_user.username)
+
+
 @router.post(
     "/{id}/skill",
     status_code=status.HTTP_200_OK,
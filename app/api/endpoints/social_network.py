@@ -1,10 +1,16 @@
-from fastapi import APIRouter, Depends, status
+from fastapi import APIRouter, Body, Depends, Query, status, Request, Response
+from typing import Annotated
 from models.social_network_model import (
     SocialNetworkCreate,
     SocialNetworkResponse
 )
 from services.social_network_service import SocialNetworkService
+from models.bulk_model import BulkResult
+from core.config import settings
 from utils.auth_manager import check_admin_role
+from utils.etag import check_etag
+from utils.serialization import fast_response
+from utils.pagination import LimitQuery, CursorQuery, paginate
 from exceptions import (
     NotFoundException,
     ConflictException,
@@ -21,8 +27,18 @@ service = SocialNetworkService()
     summary="Listar redes sociales de usuario",
     description="Obtiene todas las redes sociales de un usuario por su nombre"
 )
-async def list_social_networks(username: str):
-    return await service.list_social_networks(username)
+async def list_social_networks(
+    username: str,
+    request: Request,
+    response: Response,
+    limit: LimitQuery = None,
+    cursor: CursorQuery = None,
+):
+    not_modified = check_etag(request, response, await service.get_etag(username))
+    if not_modified:
+        return not_modified
+    page = await service.list_social_networks(username, limit, cursor)
+    return fast_response(paginate(response, page), response)
 
 @router.get(
     "/p/{username}/{id}",
@@ -30,8 +46,11 @@ async def list_social_networks(username: str):
     summary="Obtener red social por ID",
     description="Obtiene una red social específica por su ID y usuario"
 )
-async def get_social_network(username: str, id: str):
-    return await service.get_social_network(id, username)
+async def get_social_network(username: str, id: str, request: Request, response: Response):
+    not_modified = check_etag(request, response, await service.get_etag(username, id))
+    if not_modified:
+        return not_modified
+    return fast_response(await service.get_social_network(id, username), response)
     
 
 # -- Operaciones privadas (POST, PUT, DELETE) --
@@ -49,6 +68,27 @@ async def create_social_network(
     return await service.create_social_network(payload, current_user.username)
    
 
+@router.post(
+    "/bulk",
+    response_model=BulkResult,
+    status_code=status.HTTP_200_OK,
+    summary="Importar redes sociales",
+    description=(
+        "Crea varios redes sociales del usuario autenticado en una sola petición. "
+        "Con replace=true los existentes se eliminan después de crear el lote, solo si no falló ningún elemento. "
+        "Se rechazan como conflicto los elementos cuyo título ya existe (o se repite en el lote), "
+        "igual que en la creación individual. El resultado se reporta por elemento."
+    ),
+)
+async def bulk_create_social_networks(
+    payloads: Annotated[
+        list[SocialNetworkCreate], Body(min_length=1, max_length=settings.BULK_MAX_ITEMS)
+    ],
+    replace: bool = Query(False, description="Reemplazar todos los registros existentes"),
+    current_user=Depends(check_admin_role)
+):
+    return await service.bulk_create_social_networks(payloads, current_user.username, replace)
+
 @router.put(
     "/{id}",
     response_model=SocialNetworkResponse,
@@ -1,4 +1,4 @@
-from fastapi import APIRouter, Depends
+from fastapi import APIRouter, Depends, Request, Response
 from pydantic import EmailStr
 from services.user_service import UserService
 from models.user_model import (
@@ -8,10 +8,12 @@ from models.user_model import (
     ResetPasswordModel,
 )
 from utils.auth_manager import check_admin_role
+from utils.etag import check_etag
 from exceptions import (
     ConflictException,
     ValidationException,
     DatabaseException,
+    ServiceUnavailableException,
 )
 
 router = APIRouter(prefix="/users")
@@ -26,7 +28,7 @@ service = UserService()
 async def create_user_endpoint(new_user: UserModel):
     try:
         return await service.create_user(new_user)
-    except (ConflictException, ValidationException) as e:
+    except (ConflictException, ValidationException, ServiceUnavailableException) as e:
         raise e
     except Exception as e:
         raise DatabaseException(str(e))
@@ -36,7 +38,10 @@ async def create_user_endpoint(new_user: UserModel):
     response_model=UserResponseModel,
     summary="Obtener usuario por nombre",
 )
-async def get_user_endpoint(username: str):
+async def get_user_endpoint(username: str, request: Request, response: Response):
+    not_modified = check_etag(request, response, await service.get_etag(username))
+    if not_modified:
+        return not_modified
     return await service.get_user(username)
 
 @router.get(
@@ -44,7 +49,10 @@ async def get_user_endpoint(username: str):
     response_model=UserResponseModel,
     summary="Obtener usuario por email",
 )
-async def get_user_by_email_endpoint(email: EmailStr):
+async def get_user_by_email_endpoint(email: EmailStr, request: Request, response: Response):
+    not_modified = check_etag(request, response, await service.get_etag_by_email(email))
+    if not_modified:
+        return not_modified
     return await service.get_user_by_email(email)
 
 @router.put(
@@ -1,11 +1,17 @@
-from fastapi import APIRouter, Depends, status
-from typing import List, Union
+from fastapi import APIRouter, Body, Depends, Query, status, Request, Response
+from typing import Annotated, List, Union
 from models.work_experience_model import (
     WorkExperienceCreate,
-    WorkExperienceResponse
+    WorkExperienceResponse,
+    WorkExperienceStats,
 )
 from services.work_experience_service import WorkExperienceService
+from models.bulk_model import BulkResult
+from core.config import settings
 from utils.auth_manager import check_admin_role
+from utils.etag import check_etag
+from utils.serialization import fast_response
+from utils.pagination import LimitQuery, CursorQuery, paginate
 
 router = APIRouter(prefix="/work_experience")
 service = WorkExperienceService()
@@ -15,10 +21,28 @@ service = WorkExperienceService()
     "/p/{username}/total_years",
     response_model=int,
     summary="Total de años de experiencia laboral",
-    description="Calcula y devuelve el total de años de experiencia laboral de un usuario"
+    description="Calcula y devuelve el total de años de experiencia laboral de un usuario (sin contar dos veces los trabajos simultáneos)"
 )
-async def total_work_years(username: str):
-    return await service.get_total_work_experience(username)
+async def total_work_years(username: str, request: Request, response: Response):
+    not_modified = check_etag(request, response, await service.get_etag(username))
+    if not_modified:
+        return not_modified
+    return fast_response(await service.get_total_work_experience(username), response)
+
+@router.get(
+    "/p/{username}/stats",
+    response_model=WorkExperienceStats,
+    summary="Estadísticas de experiencia laboral",
+    description=(
+        "Total de experiencia (los trabajos simultáneos no se cuentan dos veces), "
+        "experiencia por empresa y trabajo más largo de un usuario"
+    )
+)
+async def work_experience_stats(username: str, request: Request, response: Response):
+    not_modified = check_etag(request, response, await service.get_etag(username))
+    if not_modified:
+        return not_modified
+    return fast_response(await service.get_stats(username), response)
 
 @router.get(
     "/p/{username}",
@@ -26,8 +50,18 @@ async def total_work_years(username: str):
     summary="Listar experiencias laborales por usuario",
     description="Obtiene todas las experiencias laborales de un usuario por su nombre"
 )
-async def list_work_experiences(username: str):
-    return await service.list_WorkExperience(username)
+async def list_work_experiences(
+    username: str,
+    request: Request,
+    response: Response,
+    limit: LimitQuery = None,
+    cursor: CursorQuery = None,
+):
+    not_modified = check_etag(request, response, await service.get_etag(username))
+    if not_modified:
+        return not_modified
+    page = await service.list_WorkExperience(username, limit, cursor)
+    return fast_response(paginate(response, page), response)
 
 @router.get(
     "/p/{username}/{id}",
@@ -35,8 +69,11 @@ async def list_work_experiences(username: str):
     summary="Obtener experiencia laboral por ID y usuario",
     description="Obtiene una experiencia específica de un usuario por su ID"
 )
-async def get_work_experience(username: str, id: Union[str, int]):
-    return await service.get_WorkExperience(id, username)
+async def get_work_experience(username: str, id: Union[str, int], request: Request, response: Response):
+    not_modified = check_etag(request, response, await service.get_etag(username, id))
+    if not_modified:
+        return not_modified
+    return fast_response(await service.get_WorkExperience(id, username), response)
 
 # -- Operaciones privadas (POST, PUT, DELETE) --
 @router.post(
@@ -52,6 +89,26 @@ async def create_work_experience(
 ):
     return await service.create_WorkExperience(payload, current_user.username)
 
+@router.post(
+    "/bulk",
+    response_model=BulkResult,
+    status_code=status.HTTP_200_OK,
+    summary="Importar experiencias laborales",
+    description=(
+        "Crea varios experiencias laborales del usuario autenticado en una sola petición. "
+        "Con replace=true los existentes se eliminan después de crear el lote, solo si no falló ningún elemento. "
+        "El resultado se reporta por elemento."
+    ),
+)
+async def bulk_create_WorkExperience(
+    payloads: Annotated[
+        list[WorkExperienceCreate], Body(min_length=1, max_length=settings.BULK_MAX_ITEMS)
+    ],
+    replace: bool = Query(False, description="Reemplazar todos los registros existentes"),
+    current_user=Depends(check_admin_role)
+):
+    return await service.bulk_create_WorkExperience(payloads, current_user.username, replace)
+
 @router.put(
     "/{id}",
     status_code=status.HTTP_200_OK,
@@ -0,0 +1,43 @@
+import asyncio
+import logging
+from datetime import datetime, timedelta
+from typing import Awaitable, Callable
+
+logger = logging.getLogger(__name__)
+
+# Tareas en segundo plano iniciadas en el lifespan de la aplicación
+_tasks: set[asyncio.Task] = set()
+
+
+def seconds_until_midnight(now: datetime | None = None) -> float:
+    now = now or datetime.now()
+    tomorrow = (now + timedelta(days=1)).replace(hour=0, minute=0, second=0, microsecond=0)
+    return (tomorrow - now).total_seconds()
+
+
+async def run_daily(name: str, job: Callable[[], Awaitable[object]]) -> None:
+    """Ejecuta `job` al iniciar y luego cada medianoche (hora local). Los errores se registran y no detienen el ciclo."""
+    while True:
+        try:
+            result = await job()
+            logger.info("Tarea diaria %s completada: %s", name, result)
+        except asyncio.CancelledError:
+            raise
+        except Exception:
+            logger.exception("Error en la tarea diaria %s", name)
+        await asyncio.sleep(seconds_until_midnight())
+
+
+def start(name: str, coro: Awaitable[None]) -> asyncio.Task:
+    task = asyncio.create_task(coro, name=name)
+    _tasks.add(task)
+    task.add_done_callback(_tasks.discard)
+    return task
+
+
+async def stop_all() -> None:
+    """Cancela las tareas en segundo plano y espera a que terminen."""
+    tasks = list(_tasks)
+    for task in tasks:
+        task.cancel()
+    await asyncio.gather(*tasks, return_exceptions=True)
@@ -0,0 +1,384 @@
+import asyncio
+import logging
+import time
+from collections import OrderedDict
+from contextlib import contextmanager
+from contextvars import ContextVar
+from functools import wraps
+from typing import Any, Awaitable, Callable, Iterator, Optional
+from pydantic_core import to_json
+from pymongo.errors import PyMongoError
+from core.config import settings
+from exceptions import DatabaseException, ServiceUnavailableException
+
+logger = logging.getLogger(__name__)
+
+MISSING = object()
+
+
+def _estimate_size(value: Any) -> int:
+    """Tamaño aproximado (bytes) de un valor cacheado, medido como su JSON serializado."""
+    try:
+        return len(to_json(value, warnings=False))
+    except Exception:
+        return len(repr(value))
+
+
+class TTLCache:
+    """
+    Caché en proceso con expiración por TTL, desalojo LRU y presupuesto de memoria.
+
+    Las claves son tuplas cuyo primer y segundo elemento son (colección, username),
+    p.ej. ("projects", "jimcostdev") o ("projects", "jimcostdev", id). Eso permite
+    invalidar de una vez todas las entradas de un usuario en una colección.
+
+    Cada worker de uvicorn mantiene su propia caché: la invalidación es inmediata en
+    el proceso que recibe la escritura y el TTL acota el desfase en los demás.
+    """
+
+    def __init__(self, max_entries: int, max_bytes: int, ttl_seconds: float, enabled: bool = True):
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.ttl_seconds = ttl_seconds
+        self.enabled = enabled
+        # clave -> (expira_en, tamaño, valor); el orden refleja el uso (LRU al inicio)
+        self._data: OrderedDict[tuple, tuple[float, int, Any]] = OrderedDict()
+        # (colección, username) -> claves asociadas
+        self._index: dict[tuple, set[tuple]] = {}
+        # (colección, username) -> generación, para descartar cargas que compiten con una escritura
+        self._generations: dict[tuple, int] = {}
+        self._inflight: dict[tuple, asyncio.Future] = {}
+        self.current_bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+        self.invalidations = 0
+
+    def get(self, key: tuple) -> Any:
+        entry = self._data.get(key)
+        if entry is None:
+            self.misses += 1
+            return MISSING
+        expires_at, _, value = entry
+        if expires_at <= time.monotonic():
+            self._remove(key)
+            self.expirations += 1
+            self.misses += 1
+            return MISSING
+        self._data.move_to_end(key)
+        self.hits += 1
+        return value
+
+    def set(self, key: tuple, value: Any, ttl: Optional[float] = None) -> None:
+        if not self.enabled:
+            return
+        size = _estimate_size(value)
+        if size > self.max_bytes:
+            return
+        if key in self._data:
+            self._remove(key)
+        expires_at = time.monotonic() + (self.ttl_seconds if ttl is None else ttl)
+        self._data[key] = (expires_at, size, value)
+        self._index.setdefault(key[:2], set()).add(key)
+        self.current_bytes += size
+        while len(self._data) > self.max_entries or self.current_bytes > self.max_bytes:
+            oldest = next(iter(self._data))
+            self._remove(oldest)
+            self.evictions += 1
+
+    def invalidate(self, collection: str, username: str) -> None:
+        """Elimina todas las entradas de `username` en `collection`."""
+        prefix = (collection, username)
+        self._generations[prefix] = self._generations.get(prefix, 0) + 1
+        for key in list(self._index.get(prefix, ())):
+            self._remove(key)
+            self.invalidations += 1
+
+    def clear(self) -> None:
+        self._data.clear()
+        self._index.clear()
+        self._generations.clear()
+        self.current_bytes = 0
+
+    async def get_or_load(
+        self, key: tuple, loader: Callable[[], Awaitable[Any]], ttl: Optional[float] = None
+    ) -> Any:
+        """
+        Devuelve el valor cacheado o lo carga con `loader`. Las cargas concurrentes de
+        la misma clave se agrupan en una sola consulta.
+        """
+        if not self.enabled:
+            return await loader()
+
+        value = self.get(key)
+        if value is not MISSING:
+            return value
+
+        pending = self._inflight.get(key)
+        if pending is not None:
+            return await asyncio.shield(pending)
+
+        generation = self._generations.get(key[:2], 0)
+        future = asyncio.get_running_loop().create_future()
+        self._inflight[key] = future
+        try:
+            value = await loader()
+        except BaseException as e:
+            future.set_exception(e)
+            # Evita el aviso de "exception was never retrieved" si nadie más esperaba
+            future.exception()
+            raise
+        else:
+            future.set_result(value)
+            # Si hubo una escritura mientras se cargaba, el valor podría estar obsoleto
+            if self._generations.get(key[:2], 0) == generation:
+                self.set(key, value, ttl)
+            return value
+        finally:
+            self._inflight.pop(key, None)
+
+    def stats(self) -> dict:
+        lookups = self.hits + self.misses
+        return {
+            "enabled": self.enabled,
+            "entries": len(self._data),
+            "max_entries": self.max_entries,
+            "bytes": self.current_bytes,
+            "max_bytes": self.max_bytes,
+            "ttl_seconds": self.ttl_seconds,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_ratio": round(self.hits / lookups, 4) if lookups else 0.0,
+            "evictions": self.evictions,
+            "expirations": self.expirations,
+            "invalidations": self.invalidations,
+        }
+
+    def _remove(self, key: tuple) -> None:
+        _, size, _ = self._data.pop(key)
+        self.current_bytes -= size
+        keys = self._index.get(key[:2])
+        if keys is not None:
+            keys.discard(key)
+            if not keys:
+                del self._index[key[:2]]
+
+
+# Edades (segundos) de las copias obsoletas servidas en la petición en curso
+_stale_ages: ContextVar[list[float] | None] = ContextVar("stale_ages", default=None)
+# Lecturas internas que no deben recibir copias obsoletas (p.ej. reconstruir el snapshot)
+_fresh_only: ContextVar[bool] = ContextVar("stale_fresh_only", default=False)
+
+
+@contextmanager
+def fresh_reads() -> Iterator[None]:
+    """
+    Dentro del bloque (y de las tareas que cree) `StaleStore.serve` siempre va a la
+    base de datos: lo que se construya con esas lecturas se guarda y no puede
+    basarse en una copia anterior a la última escritura.
+    """
+    token = _fresh_only.set(True)
+    try:
+        yield
+    finally:
+        _fresh_only.reset(token)
+
+
+def _unavailable(error: BaseException) -> bool:
+    """Errores que indican que la base de datos no responde (y no, p.ej., un 404)."""
+    return isinstance(error, (DatabaseException, ServiceUnavailableException, PyMongoError))
+
+
+class StaleStore(TTLCache):
+    """
+    Última respuesta correcta de cada lectura pública (last-known-good), para
+    servirla si MongoDB está caído o lento en lugar de responder 500.
+
+    A diferencia de `response_cache`, las escrituras no la invalidan: solo se
+    consulta cuando la base de datos falla y entonces una copia anterior es mejor
+    que un error. Tras un fallo, durante `retry_seconds` las lecturas con copia
+    se sirven de inmediato (sin volver a esperar los timeouts del driver) mientras
+    una tarea en segundo plano intenta refrescarla; la primera carga correcta
+    termina el modo degradado. Sin copia se responde 503.
+    """
+
+    def __init__(self, max_entries: int, max_bytes: int, max_age_seconds: float, retry_seconds: float, enabled: bool = True):
+        super().__init__(max_entries, max_bytes, max_age_seconds, enabled)
+        self.retry_seconds = retry_seconds
+        self.degraded_until = 0.0
+        self._refreshing: set[tuple] = set()
+        self.stale_served = 0
+        self.unavailable = 0
+        self.refreshes = 0
+
+    def remember(self, key: tuple, value: Any) -> None:
+        self.set(key, value)
+
+    def recovered(self) -> None:
+        """Termina el modo degradado: una escritura acaba de funcionar."""
+        self.degraded_until = 0.0
+
+    def _copy(self, key: tuple) -> Any:
+        """(valor, edad en segundos) de la copia de `key`, o MISSING si no hay o es demasiado vieja."""
+        entry = self._data.get(key)
+        if entry is None:
+            return MISSING
+        expires_at, _, value = entry
+        now = time.monotonic()
+        if expires_at <= now:
+            self._remove(key)
+            self.expirations += 1
+            return MISSING
+        return value, now - (expires_at - self.ttl_seconds)
+
+    def _serve_stale(self, copy: tuple[Any, float]) -> Any:
+        value, age = copy
+        self.stale_served += 1
+        ages = _stale_ages.get()
+        if ages is not None:
+            ages.append(age)
+        return value
+
+    def _revalidate(self, key: tuple, load: Callable[[], Awaitable[Any]]) -> None:
+        """Refresca `key` en segundo plano (una sola tarea por clave)."""
+        if key in self._refreshing:
+            return
+        from core import background
+
+        self._refreshing.add(key)
+        background.start(f"revalidate:{key[0]}", self._refresh(key, load))
+
+    async def _refresh(self, key: tuple, load: Callable[[], Awaitable[Any]]) -> None:
+        try:
+            await load()
+            self.refreshes += 1
+            self.degraded_until = 0.0
+        except Exception as e:
+            if _unavailable(e):
+                self.degraded_until = time.monotonic() + self.retry_seconds
+            logger.info(f"No se pudo refrescar {key}: {str(e)}")
+        finally:
+            self._refreshing.discard(key)
+
+    async def serve(self, key: tuple, load: Callable[[], Awaitable[Any]], cache: TTLCache) -> Any:
+        """Ejecuta `load` y, si la base de datos falla, sirve la última copia correcta de `key`."""
+        if not self.enabled or _fresh_only.get():
+            return await load()
+
+        if time.monotonic() < self.degraded_until:
+            value = cache.get(key) if cache.enabled else MISSING
+            if value is not MISSING:
+                return value
+            copy = self._copy(key)
+            if copy is not MISSING:
+                self._revalidate(key, load)
+                return self._serve_stale(copy)
+
+        try:
+            return await load()
+        except Exception as e:
+            if not _unavailable(e):
+                raise
+            self.degraded_until = time.monotonic() + self.retry_seconds
+            copy = self._copy(key)
+            if copy is MISSING:
+                self.unavailable += 1
+                raise ServiceUnavailableException("Base de datos no disponible y sin copia en caché") from e
+            logger.warning(f"Base de datos no disponible, se sirve una copia de {copy[1]:.0f} s de {key}: {str(e)}")
+            return self._serve_stale(copy)
+
+    def stats(self) -> dict:
+        return {
+            "enabled": self.enabled,
+            "entries": len(self._data),
+            "max_entries": self.max_entries,
+            "bytes": self.current_bytes,
+            "max_bytes": self.max_bytes,
+            "max_age_seconds": self.ttl_seconds,
+            "degraded": time.monotonic() < self.degraded_until,
+            "refreshing": len(self._refreshing),
+            "stale_served": self.stale_served,
+            "unavailable": self.unavailable,
+            "refreshes": self.refreshes,
+            "expirations": self.expirations,
+        }
+
+
+class StaleResponseMiddleware:
+    """Middleware ASGI que marca con `Age` y `Warning` las respuestas servidas desde copias obsoletas."""
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        ages: list[float] = []
+
+        async def send_wrapper(message):
+            if message["type"] == "http.response.start" and ages:
+                message["headers"] = [
+                    *message.get("headers", []),
+                    (b"age", str(int(max(ages))).encode()),
+                    (b"warning", b'110 - "Response is Stale"'),
+                ]
+            await send(message)
+
+        token = _stale_ages.set(ages)
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            _stale_ages.reset(token)
+
+
+def cached(key: Callable[..., tuple], cache: Optional[TTLCache] = None):
+    """
+    Decorador para métodos de servicio de solo lectura. `key` recibe los mismos
+    argumentos que el método (sin `self`) y devuelve la clave de caché. Cada valor
+    leído de la base de datos se guarda además en `stale_responses` para servirlo
+    si más adelante la base de datos no responde.
+    """
+    def decorator(func):
+        @wraps(func)
+        async def wrapper(self, *args, **kwargs):
+            target = cache or response_cache
+            cache_key = key(*args, **kwargs)
+
+            async def load_fresh():
+                value = await func(self, *args, **kwargs)
+                stale_responses.remember(cache_key, value)
+                return value
+
+            return await stale_responses.serve(
+                cache_key, lambda: target.get_or_load(cache_key, load_fresh), target
+            )
+        return wrapper
+    return decorator
+
+
+response_cache = TTLCache(
+    max_entries=settings.CACHE_MAX_ENTRIES,
+    max_bytes=settings.CACHE_MAX_BYTES,
+    ttl_seconds=settings.CACHE_TTL_SECONDS,
+    enabled=settings.CACHE_ENABLED,
+)
+
+# Última copia correcta de cada lectura pública, para cuando MongoDB no responde
+stale_responses = StaleStore(
+    max_entries=settings.STALE_MAX_ENTRIES,
+    max_bytes=settings.STALE_MAX_BYTES,
+    max_age_seconds=settings.STALE_MAX_AGE_SECONDS,
+    retry_seconds=settings.STALE_RETRY_SECONDS,
+    enabled=settings.STALE_ENABLED,
+)
+
+# Usuarios autenticados, clave ("principal", username, exp del token)
+principal_cache = TTLCache(
+    max_entries=settings.PRINCIPAL_CACHE_MAX_ENTRIES,
+    max_bytes=settings.PRINCIPAL_CACHE_MAX_ENTRIES * 2048,
+    ttl_seconds=settings.PRINCIPAL_CACHE_TTL_SECONDS,
+    enabled=settings.PRINCIPAL_CACHE_ENABLED,
+)
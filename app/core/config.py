@@ -1,6 +1,6 @@
 from pydantic_settings import BaseSettings, SettingsConfigDict
 from pydantic import Field
-from typing import List
+from typing import List, Literal, Optional
 
 class Settings(BaseSettings):
     # Estas dos *siempre* vienen de las env vars del sistema:
@@ -10,6 +10,30 @@ class Settings(BaseSettings):
     # Nombre hardcodeado de la base de datos
     MONGODB_NAME: str = "jimcostdev_api"
 
+    # Pool de conexiones, timeouts y compresión del cliente de MongoDB.
+    # None deja el valor de MONGO_URI o, si no lo trae, el del driver
+    # (maxPoolSize=100, minPoolSize=0, serverSelectionTimeoutMS=30000, ...).
+    MONGO_MAX_POOL_SIZE: Optional[int] = None
+    MONGO_MIN_POOL_SIZE: Optional[int] = None
+    MONGO_MAX_IDLE_TIME_MS: Optional[int] = None
+    MONGO_WAIT_QUEUE_TIMEOUT_MS: Optional[int] = None
+    MONGO_SERVER_SELECTION_TIMEOUT_MS: Optional[int] = None
+    MONGO_CONNECT_TIMEOUT_MS: Optional[int] = None
+    MONGO_SOCKET_TIMEOUT_MS: Optional[int] = None
+    # Lista separada por comas en orden de preferencia, p.ej. "zstd,snappy,zlib".
+    # zstd y snappy requieren pymongo[zstd] / pymongo[snappy]; si faltan se omiten.
+    MONGO_COMPRESSORS: str = ""
+    MONGO_ZLIB_COMPRESSION_LEVEL: Optional[int] = None
+    # Crear al arrancar los índices declarados en los repositorios
+    MONGO_AUTO_INDEXES: bool = True
+    # Conectar (ping) y crear índices en segundo plano para que el arranque en frío
+    # no espere a la base de datos. False: el arranque falla si MongoDB no responde.
+    DEFERRED_STARTUP: bool = True
+
+    # Backend de los repositorios: "motor" (MongoDB) o "memory" (en memoria, para
+    # tests, benchmarks, demos y desarrollo sin base de datos; no persiste nada)
+    STORAGE_BACKEND: Literal["motor", "memory"] = "motor"
+
     # Resto de defaults
     JWT_ALGORITHM: str = "HS256"
     ACCESS_TOKEN_EXPIRE_MINUTES: int = 30
@@ -27,6 +51,63 @@ class Settings(BaseSettings):
         "http://localhost:4321/",
     ]
 
+    # Caché en proceso para las rutas públicas /p/
+    CACHE_ENABLED: bool = True
+    CACHE_TTL_SECONDS: int = 300
+    CACHE_MAX_ENTRIES: int = 2048
+    CACHE_MAX_BYTES: int = 32 * 1024 * 1024
+
+    # Última copia correcta de las rutas públicas, servida (con Age y Warning) si
+    # MongoDB falla; sin copia se responde 503. Tras un fallo, las copias se sirven
+    # sin reintentar la consulta durante STALE_RETRY_SECONDS mientras se refrescan.
+    STALE_ENABLED: bool = True
+    STALE_MAX_AGE_SECONDS: int = 24 * 60 * 60
+    STALE_MAX_ENTRIES: int = 2048
+    STALE_MAX_BYTES: int = 32 * 1024 * 1024
+    STALE_RETRY_SECONDS: float = 10.0
+
+    # Caché del usuario autenticado (nunca vive más que el token)
+    PRINCIPAL_CACHE_ENABLED: bool = True
+    PRINCIPAL_CACHE_TTL_SECONDS: int = 60
+    PRINCIPAL_CACHE_MAX_ENTRIES: int = 1024
+
+    # Sondeo en segundo plano que alimenta /healthcheck, /healthcheck/live y /healthcheck/ready
+    HEALTH_PROBE_INTERVAL_SECONDS: float = 5.0
+    HEALTH_PROBE_TIMEOUT_SECONDS: float = 2.0
+
+    # Endpoint /metrics (Prometheus) con latencias HTTP y de MongoDB
+    METRICS_ENABLED: bool = True
+
+    # Cabecera Server-Timing con el desglose auth/db/model/serialize de cada petición
+    SERVER_TIMING_ENABLED: bool = True
+
+    # Registro de consultas lentas de MongoDB y captura de su plan (explain)
+    SLOW_QUERY_ENABLED: bool = True
+    SLOW_QUERY_THRESHOLD_MS: float = 100.0
+    SLOW_QUERY_EXPLAIN: bool = True
+    SLOW_QUERY_EXPLAIN_INTERVAL_SECONDS: float = 300.0
+    SLOW_QUERY_HISTORY: int = 100
+
+    # Lecturas públicas sin revalidar documentos propios y codificadas con orjson
+    FAST_RESPONSES: bool = True
+
+    # Paginación por cursor de los listados /p/ (sin `limit` se devuelve todo)
+    PAGE_MAX_LIMIT: int = 100
+
+    # Tarea diaria que recalcula la duración de los trabajos sin end_date
+    DURATION_REFRESH_ENABLED: bool = True
+
+    # Máximo de elementos por petición en los endpoints /bulk
+    BULK_MAX_ITEMS: int = 1000
+
+    # Documentos por lote al leer los cursores de /export
+    EXPORT_BATCH_SIZE: int = 500
+
+    # Pool de procesos para bcrypt (0 workers = thread pool por defecto)
+    HASH_POOL_WORKERS: int = 2
+    HASH_MAX_IN_FLIGHT: int = 4
+    HASH_QUEUE_TIMEOUT_SECONDS: float = 5.0
+
     model_config = SettingsConfigDict(
         env_file=None,   # desactiva carga automática de .env
         extra="ignore",  # ignora cualquier otra var no definidas aquí
@@ -1,30 +1,94 @@
-from motor.motor_asyncio import AsyncIOMotorClient
+from typing import TYPE_CHECKING
 from core.config import settings
 
+if TYPE_CHECKING:
+    from motor.motor_asyncio import AsyncIOMotorClient
+
 class MongoDB:
     def __init__(self):
-        self.client: AsyncIOMotorClient = None
+        self.client: "AsyncIOMotorClient" = None
         self.db = None
         self.is_connected = False
+
+    @staticmethod
+    def client_options() -> dict:
+        """Opciones del cliente construidas desde Settings (se omiten las no configuradas)."""
+        options = {
+            "maxPoolSize": settings.MONGO_MAX_POOL_SIZE,
+            "minPoolSize": settings.MONGO_MIN_POOL_SIZE,
+            "maxIdleTimeMS": settings.MONGO_MAX_IDLE_TIME_MS,
+            "waitQueueTimeoutMS": settings.MONGO_WAIT_QUEUE_TIMEOUT_MS,
+            "serverSelectionTimeoutMS": settings.MONGO_SERVER_SELECTION_TIMEOUT_MS,
+            "connectTimeoutMS": settings.MONGO_CONNECT_TIMEOUT_MS,
+            "socketTimeoutMS": settings.MONGO_SOCKET_TIMEOUT_MS,
+            "compressors": settings.MONGO_COMPRESSORS or None,
+            "zlibCompressionLevel": settings.MONGO_ZLIB_COMPRESSION_LEVEL,
+            "event_listeners": MongoDB.event_listeners(),
+        }
+        return {key: value for key, value in options.items() if value is not None}
+
+    @staticmethod
+    def event_listeners() -> list | None:
+        """Listeners de comandos y del pool: salud, métricas de /metrics y consultas lentas."""
+        from core.health import pool_usage
+
+        listeners = [pool_usage]
+        if settings.METRICS_ENABLED:
+            from core.metrics import mongo_listeners
+            listeners += mongo_listeners()
+        if settings.SLOW_QUERY_ENABLED:
+            from core.slow_queries import slow_query_listener
+            listeners.append(slow_query_listener())
+        return listeners
+
+    def pool_summary(self) -> str:
+        """
+        Configuración efectiva del pool, tal como la resolvió el driver (URI + Settings).
+        Los compresores son los pedidos en MONGO_COMPRESSORS: el driver no expone
+        públicamente los negociados (y un compresor en la URI no se refleja aquí).
+        """
+        options = self.client.options
+        pool = options.pool_options
+        compressors = settings.MONGO_COMPRESSORS or "none"
+        return (
+            f"maxPoolSize={pool.max_pool_size} minPoolSize={pool.min_pool_size} "
+            f"maxIdleTimeS={pool.max_idle_time_seconds} waitQueueTimeoutS={pool.wait_queue_timeout} "
+            f"serverSelectionTimeoutS={options.server_selection_timeout} "
+            f"connectTimeoutS={pool.connect_timeout} socketTimeoutS={pool.socket_timeout} "
+            f"compressors={compressors}"
+        )
     
+    def _ensure_client(self):
+        """
+        Crea el cliente si aún no existe. No espera a la red: el driver descubre el
+        servidor en segundo plano y cada operación espera a que esté disponible.
+        Motor se importa aquí para no cargarlo al importar la aplicación.
+        """
+        if self.client is None:
+            from motor.motor_asyncio import AsyncIOMotorClient
+
+            self.client = AsyncIOMotorClient(settings.MONGO_URI, **self.client_options())
+            self.db = self.client[settings.MONGODB_NAME]
+
     async def connect(self):
         if not self.is_connected:
-            self.client = AsyncIOMotorClient(settings.MONGO_URI)
-            self.db = self.client[settings.MONGODB_NAME]
+            self._ensure_client()
             await self.client.admin.command('ping')
             self.is_connected = True
             print("Conexión a MongoDB exitosa.")
+            print(f"Pool de MongoDB: {self.pool_summary()}")
     
     async def disconnect(self):
         if self.client:
             self.client.close()
+            self.client = None
+            self.db = None
             self.is_connected = False
             print("Conexión a MongoDB cerrada.")
     
     async def get_collection(self, collection_name: str):
-        """Obtiene una colección conectando automáticamente si es necesario"""
-        if not self.is_connected:
-            await self.connect()
+        """Obtiene una colección creando el cliente si es necesario (sin esperar al ping)"""
+        self._ensure_client()
         return self.db[collection_name]
 
-mongodb = MongoDB()
\ No newline at end of file
+mongodb = MongoDB()
@@ -0,0 +1,176 @@
+"""
+Estado de salud mantenido por una única tarea en segundo plano.
+
+El prober hace ping a la base de datos cada HEALTH_PROBE_INTERVAL_SECONDS y
+guarda el resultado. /healthcheck, /healthcheck/live y /healthcheck/ready solo
+leen ese estado: los balanceadores y monitores pueden consultarlos con cualquier
+frecuencia sin generar un ping por petición ni esperar detrás del tráfico real.
+
+Además del ping (RTT y último error) se registra la utilización del pool de
+MongoDB y el retraso del event loop, medido como lo que se pasa de la espera
+entre sondeos: un loop bloqueado por trabajo síncrono se ve aquí antes que en
+las latencias.
+"""
+import asyncio
+import time
+from collections import deque
+from datetime import datetime, timezone
+from pymongo import monitoring
+from core.config import settings
+
+
+class PoolUsageListener(monitoring.ConnectionPoolListener):
+    """Conexiones abiertas y en uso del pool de MongoDB, por servidor."""
+
+    def __init__(self):
+        self.open: dict[tuple, int] = {}
+        self.checked_out: dict[tuple, int] = {}
+
+    def _add(self, counts: dict[tuple, int], address: tuple, delta: int) -> None:
+        counts[address] = max(counts.get(address, 0) + delta, 0)
+
+    def pool_created(self, event) -> None:
+        pass
+
+    def pool_ready(self, event) -> None:
+        pass
+
+    def pool_cleared(self, event) -> None:
+        pass
+
+    def pool_closed(self, event) -> None:
+        self.open.pop(event.address, None)
+        self.checked_out.pop(event.address, None)
+
+    def connection_created(self, event) -> None:
+        self._add(self.open, event.address, 1)
+
+    def connection_ready(self, event) -> None:
+        pass
+
+    def connection_closed(self, event) -> None:
+        self._add(self.open, event.address, -1)
+
+    def connection_check_out_started(self, event) -> None:
+        pass
+
+    def connection_check_out_failed(self, event) -> None:
+        pass
+
+    def connection_checked_out(self, event) -> None:
+        self._add(self.checked_out, event.address, 1)
+
+    def connection_checked_in(self, event) -> None:
+        self._add(self.checked_out, event.address, -1)
+
+
+# Registrado en el cliente de Motor (ver MongoDB.event_listeners)
+pool_usage = PoolUsageListener()
+
+
+def _pool_state() -> dict | None:
+    from core.database import mongodb
+
+    if mongodb.client is None:
+        return None
+    max_pool_size = mongodb.client.options.pool_options.max_pool_size
+    # Con un replica set cada servidor tiene su pool: se reporta el más ocupado
+    in_use = max(pool_usage.checked_out.values(), default=0)
+    return {
+        "open": sum(pool_usage.open.values()),
+        "in_use": in_use,
+        "max_pool_size": max_pool_size,
+        "utilization": round(in_use / max_pool_size, 4) if max_pool_size else None,
+    }
+
+
+def _now() -> str:
+    return datetime.now(timezone.utc).isoformat()
+
+
+class HealthProber:
+    """Sondea el almacenamiento en segundo plano y guarda el último estado conocido."""
+
+    def __init__(self, interval: float, timeout: float):
+        self.interval = interval
+        self.timeout = timeout
+        self.storage = None
+        self.database = "unknown"
+        self.ping_rtt_ms: float | None = None
+        self.loop_lag_ms: float | None = None
+        # Últimas mediciones del retraso, para no perder un bloqueo entre lecturas
+        self._lags: deque[float] = deque(maxlen=12)
+        self.last_probe_at: str | None = None
+        self.last_success_at: str | None = None
+        self.last_error: str | None = None
+        self.last_error_at: str | None = None
+        self._last_probe = 0.0
+        self._wake: asyncio.Event | None = None
+
+    async def probe(self) -> None:
+        if not self.storage.is_connected:
+            self.database = "disconnected"
+        else:
+            started = time.perf_counter()
+            try:
+                await asyncio.wait_for(self.storage.ping(), self.timeout)
+            except Exception as e:
+                error = str(e) or type(e).__name__
+                self.database = f"unhealthy: {error}"
+                self.last_error = error
+                self.last_error_at = _now()
+            else:
+                self.ping_rtt_ms = round((time.perf_counter() - started) * 1000, 2)
+                self.database = "healthy"
+                self.last_success_at = _now()
+        self.last_probe_at = _now()
+        self._last_probe = time.monotonic()
+
+    def probe_now(self) -> None:
+        """Adelanta el próximo sondeo (p.ej. en cuanto termina la conexión inicial)."""
+        if self._wake is not None:
+            self._wake.set()
+
+    async def run(self, storage) -> None:
+        self.storage = storage
+        self._wake = asyncio.Event()
+        while True:
+            await self.probe()
+            self._wake.clear()
+            expected = time.perf_counter() + self.interval
+            try:
+                await asyncio.wait_for(self._wake.wait(), self.interval)
+            except asyncio.TimeoutError:
+                # Lo que el loop tardó de más en despertarnos
+                self.loop_lag_ms = round(max(time.perf_counter() - expected, 0.0) * 1000, 2)
+                self._lags.append(self.loop_lag_ms)
+
+    @property
+    def stalled(self) -> bool:
+        """El prober no sondea hace demasiado: el loop está bloqueado o la tarea murió."""
+        return time.monotonic() - self._last_probe > 3 * self.interval + self.timeout
+
+    @property
+    def ready(self) -> bool:
+        return self.database == "healthy" and not self.stalled
+
+    def state(self) -> dict:
+        return {
+            "database": self.database,
+            "backend": self.storage.name if self.storage else None,
+            "ping_rtt_ms": self.ping_rtt_ms,
+            "pool": _pool_state() if settings.STORAGE_BACKEND == "motor" else None,
+            "loop_lag_ms": self.loop_lag_ms,
+            "max_loop_lag_ms": max(self._lags, default=None),
+            "last_probe_at": self.last_probe_at,
+            "last_success_at": self.last_success_at,
+            "last_error": self.last_error,
+            "last_error_at": self.last_error_at,
+            "stalled": self.stalled,
+        }
+
+
+health_prober = HealthProber(
+    interval=settings.HEALTH_PROBE_INTERVAL_SECONDS,
+    timeout=settings.HEALTH_PROBE_TIMEOUT_SECONDS,
+)
@@ -0,0 +1,201 @@
+"""
+Métricas en formato Prometheus, expuestas en /metrics.
+
+- Peticiones HTTP: latencia por método y plantilla de ruta (p.ej.
+  /projects/p/{username}, nunca la URL concreta), contador por código de estado
+  y peticiones en curso.
+- MongoDB: latencia y errores por colección y comando (CommandListener) y espera
+  para obtener una conexión del pool (ConnectionPoolListener), registrados como
+  `event_listeners` del cliente de Motor.
+
+Cada worker de uvicorn expone sus propias métricas: Prometheus debe consultar
+cada proceso o agregarlas por instancia.
+"""
+import time
+from pymongo import monitoring
+from prometheus_client import Counter, Gauge, Histogram
+from core.config import settings
+
+HTTP_REQUEST_DURATION = Histogram(
+    "http_request_duration_seconds",
+    "Latencia de las peticiones HTTP",
+    ["method", "route"],
+    buckets=(0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0),
+)
+HTTP_REQUESTS = Counter(
+    "http_requests_total",
+    "Peticiones HTTP atendidas",
+    ["method", "route", "status"],
+)
+HTTP_REQUESTS_IN_PROGRESS = Gauge(
+    "http_requests_in_progress",
+    "Peticiones HTTP en curso",
+    ["method"],
+)
+
+MONGO_COMMAND_DURATION = Histogram(
+    "mongodb_command_duration_seconds",
+    "Latencia de los comandos de MongoDB",
+    ["collection", "command"],
+    buckets=(0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 5.0),
+)
+MONGO_COMMAND_ERRORS = Counter(
+    "mongodb_command_errors_total",
+    "Comandos de MongoDB que fallaron",
+    ["collection", "command"],
+)
+MONGO_POOL_CHECKOUT_WAIT = Histogram(
+    "mongodb_pool_checkout_wait_seconds",
+    "Espera para obtener una conexión del pool de MongoDB",
+    buckets=(0.0001, 0.0005, 0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 5.0),
+)
+MONGO_POOL_CHECKOUT_FAILURES = Counter(
+    "mongodb_pool_checkout_failures_total",
+    "Intentos fallidos de obtener una conexión del pool de MongoDB",
+    ["reason"],
+)
+MONGO_POOL_CONNECTIONS = Gauge(
+    "mongodb_pool_connections",
+    "Conexiones abiertas en el pool de MongoDB",
+    ["address"],
+)
+MONGO_POOL_CHECKED_OUT = Gauge(
+    "mongodb_pool_checked_out_connections",
+    "Conexiones del pool de MongoDB en uso",
+    ["address"],
+)
+
+
+# Rutas sin plantilla (las sirve FastAPI sin APIRoute) que se etiquetan por nombre
+NAMED_PATHS = frozenset({
+    f"{settings.API_PREFIX}/openapi.json",
+    "/docs",
+    "/docs/oauth2-redirect",
+    "/redoc",
+})
+
+
+def route_template(scope: dict) -> str:
+    """
+    Etiqueta de ruta con cardinalidad acotada: la plantilla, el mount, una de
+    NAMED_PATHS o "unmatched". Nunca la URL concreta: p.ej. las redirecciones 307
+    de barra final (/projects/p/<usuario>/) crearían una serie por usuario.
+    """
+    route = scope.get("route")
+    if route is not None and getattr(route, "path", None):
+        return route.path
+    if scope.get("root_path"):
+        # Archivos estáticos y demás aplicaciones montadas
+        return scope["root_path"]
+    if scope["path"] in NAMED_PATHS:
+        return scope["path"]
+    return "unmatched"
+
+
+class MetricsMiddleware:
+    """Middleware ASGI que mide cada petición HTTP."""
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        method = scope["method"]
+        status = 500
+
+        async def send_wrapper(message):
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+            await send(message)
+
+        in_progress = HTTP_REQUESTS_IN_PROGRESS.labels(method)
+        in_progress.inc()
+        started = time.perf_counter()
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            route = route_template(scope)
+            HTTP_REQUEST_DURATION.labels(method, route).observe(time.perf_counter() - started)
+            HTTP_REQUESTS.labels(method, route, str(status)).inc()
+            in_progress.dec()
+
+
+def _command_collection(command_name: str, command: dict) -> str:
+    target = command.get(command_name)
+    if command_name == "getMore":
+        target = command.get("collection")
+    return target if isinstance(target, str) else ""
+
+
+class CommandMetricsListener(monitoring.CommandListener):
+    """Latencia y errores de cada comando. El evento final no trae el comando: se guarda al empezar."""
+
+    def __init__(self):
+        self._pending: dict[tuple, str] = {}
+
+    def started(self, event: monitoring.CommandStartedEvent) -> None:
+        key = (event.request_id, event.connection_id)
+        self._pending[key] = _command_collection(event.command_name, event.command)
+
+    def succeeded(self, event: monitoring.CommandSucceededEvent) -> None:
+        collection = self._pending.pop((event.request_id, event.connection_id), "")
+        MONGO_COMMAND_DURATION.labels(collection, event.command_name).observe(event.duration_micros / 1e6)
+
+    def failed(self, event: monitoring.CommandFailedEvent) -> None:
+        collection = self._pending.pop((event.request_id, event.connection_id), "")
+        MONGO_COMMAND_DURATION.labels(collection, event.command_name).observe(event.duration_micros / 1e6)
+        MONGO_COMMAND_ERRORS.labels(collection, event.command_name).inc()
+
+
+class PoolMetricsListener(monitoring.ConnectionPoolListener):
+    """Espera de checkout y conexiones abiertas/en uso por servidor."""
+
+    @staticmethod
+    def _address(event) -> str:
+        host, port = event.address
+        return f"{host}:{port}"
+
+    def pool_created(self, event) -> None:
+        pass
+
+    def pool_ready(self, event) -> None:
+        pass
+
+    def pool_cleared(self, event) -> None:
+        pass
+
+    def pool_closed(self, event) -> None:
+        MONGO_POOL_CONNECTIONS.labels(self._address(event)).set(0)
+        MONGO_POOL_CHECKED_OUT.labels(self._address(event)).set(0)
+
+    def connection_created(self, event) -> None:
+        MONGO_POOL_CONNECTIONS.labels(self._address(event)).inc()
+
+    def connection_ready(self, event) -> None:
+        pass
+
+    def connection_closed(self, event) -> None:
+        MONGO_POOL_CONNECTIONS.labels(self._address(event)).dec()
+
+    def connection_check_out_started(self, event) -> None:
+        pass
+
+    def connection_check_out_failed(self, event) -> None:
+        MONGO_POOL_CHECKOUT_FAILURES.labels(str(event.reason)).inc()
+        MONGO_POOL_CHECKOUT_WAIT.observe(event.duration)
+
+    def connection_checked_out(self, event) -> None:
+        MONGO_POOL_CHECKOUT_WAIT.observe(event.duration)
+        MONGO_POOL_CHECKED_OUT.labels(self._address(event)).inc()
+
+    def connection_checked_in(self, event) -> None:
+        MONGO_POOL_CHECKED_OUT.labels(self._address(event)).dec()
+
+
+def mongo_listeners() -> list:
+    """Listeners a registrar en el cliente de Motor."""
+    return [CommandMetricsListener(), PoolMetricsListener()]
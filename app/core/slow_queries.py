@@ -0,0 +1,207 @@
+"""
+Registro de consultas lentas a partir del command monitoring del cliente de Motor.
+
+Cada comando que supera SLOW_QUERY_THRESHOLD_MS se registra con su colección, la
+forma del filtro (sin valores), la duración y los documentos devueltos. Para los
+`find` lentos se pide además, en segundo plano, `explain` con "executionStats" y
+se registra el plan ganador: un COLLSCAN aparece en el log en cuanto ocurre.
+El explain se repite como mucho una vez por forma de consulta cada
+SLOW_QUERY_EXPLAIN_INTERVAL_SECONDS para no sumar carga a una base ya lenta.
+"""
+import asyncio
+import json
+import logging
+import time
+from collections import deque
+from datetime import datetime, timezone
+from typing import Any
+from pymongo import monitoring
+from core.config import settings
+
+logger = logging.getLogger(__name__)
+
+# Campos del comando find que se reenvían a explain (sin lsid, $clusterTime, ...)
+EXPLAIN_FIELDS = ("find", "filter", "sort", "projection", "limit", "skip", "hint", "collation")
+# Comandos propios del driver que no interesan aunque tarden (p.ej. esperas de hello)
+IGNORED_COMMANDS = {"hello", "isMaster", "ismaster", "ping", "endSessions", "saslStart", "saslContinue", "explain"}
+
+
+def redact(value: Any) -> Any:
+    """Forma de un filtro: conserva campos y operadores y sustituye los valores por "?"."""
+    if isinstance(value, dict):
+        return {k: redact(v) for k, v in value.items()}
+    if isinstance(value, (list, tuple)):
+        # $or/$and llevan subfiltros; $in y demás, listas de valores
+        if value and all(isinstance(v, dict) for v in value):
+            return [redact(v) for v in value]
+        return "?"
+    return "?"
+
+
+def _collection(command_name: str, command: dict) -> str:
+    target = command.get(command_name)
+    if command_name == "getMore":
+        target = command.get("collection")
+    return target if isinstance(target, str) else ""
+
+
+def _filter(command_name: str, command: dict) -> dict | None:
+    if command_name in ("find", "count", "distinct", "findAndModify"):
+        return command.get("filter", command.get("query"))
+    if command_name == "aggregate":
+        pipeline = command.get("pipeline") or []
+        return pipeline[0].get("$match") if pipeline and "$match" in pipeline[0] else None
+    if command_name in ("update", "delete"):
+        statements = command.get("updates") or command.get("deletes") or []
+        return statements[0].get("q") if statements else None
+    return None
+
+
+def _docs_returned(command_name: str, reply: dict) -> int | None:
+    cursor = reply.get("cursor")
+    if isinstance(cursor, dict):
+        batch = cursor.get("firstBatch", cursor.get("nextBatch"))
+        return len(batch) if batch is not None else None
+    if command_name == "findAndModify":
+        return 1 if reply.get("value") is not None else 0
+    n = reply.get("n")
+    return n if isinstance(n, int) else None
+
+
+def summarize_plan(stage: dict) -> str:
+    """Plan como cadena de etapas, de la raíz a la hoja: "FETCH <- IXSCAN {...}"."""
+    stage = stage.get("queryPlan", stage)
+    parts = []
+    while stage:
+        name = stage.get("stage", "?")
+        if "keyPattern" in stage:
+            name += " " + json.dumps(stage["keyPattern"], default=str)
+        parts.append(name)
+        children = stage.get("inputStages")
+        stage = stage.get("inputStage") or (children[0] if children else None)
+    return " <- ".join(parts)
+
+
+class SlowQueryListener(monitoring.CommandListener):
+    """
+    Recibe los eventos de comandos (en los hilos del driver) y registra los lentos.
+    El explain se agenda en el event loop que creó el listener.
+    """
+
+    def __init__(self, threshold_ms: float, explain: bool, explain_interval: float, history: int):
+        self.threshold_ms = threshold_ms
+        self.explain = explain
+        self.explain_interval = explain_interval
+        self.recent: deque[dict] = deque(maxlen=history)
+        self._pending: dict[tuple, tuple] = {}
+        self._explained_at: dict[tuple, float] = {}
+        try:
+            self._loop = asyncio.get_running_loop()
+        except RuntimeError:
+            self._loop = None
+
+    def started(self, event: monitoring.CommandStartedEvent) -> None:
+        if event.command_name in IGNORED_COMMANDS:
+            return
+        command = event.command
+        explainable = None
+        if event.command_name == "find":
+            explainable = {k: command[k] for k in EXPLAIN_FIELDS if k in command}
+        self._pending[(event.request_id, event.connection_id)] = (
+            _collection(event.command_name, command),
+            _filter(event.command_name, command),
+            explainable,
+        )
+
+    def succeeded(self, event: monitoring.CommandSucceededEvent) -> None:
+        self._finish(event, _docs_returned(event.command_name, event.reply), None)
+
+    def failed(self, event: monitoring.CommandFailedEvent) -> None:
+        # Solo el código: el errmsg del servidor puede traer valores (p.ej. el email de un E11000)
+        failure = event.failure
+        self._finish(event, None, failure.get("codeName") or f"code {failure.get('code', 'unknown')}")
+
+    def _finish(self, event, docs: int | None, error: str | None) -> None:
+        pending = self._pending.pop((event.request_id, event.connection_id), None)
+        duration_ms = event.duration_micros / 1000
+        if pending is None or duration_ms < self.threshold_ms:
+            return
+        collection, query, explainable = pending
+        shape = json.dumps(redact(query), default=str) if query is not None else None
+        record = {
+            "at": datetime.now(timezone.utc).isoformat(),
+            "database": event.database_name,
+            "collection": collection,
+            "command": event.command_name,
+            "filter": shape,
+            "duration_ms": round(duration_ms, 1),
+            "docs_returned": docs,
+            "error": error,
+            "plan": None,
+        }
+        self.recent.append(record)
+        logger.warning(
+            f"Consulta lenta: {collection}.{event.command_name} {duration_ms:.1f} ms "
+            f"docs={docs} filtro={shape}" + (f" error={error}" if error else "")
+        )
+        if explainable is not None and self.explain and self._loop is not None:
+            key = (event.database_name, collection, shape)
+            now = time.monotonic()
+            if now - self._explained_at.get(key, float("-inf")) >= self.explain_interval:
+                if len(self._explained_at) > 1000:
+                    self._explained_at.clear()
+                self._explained_at[key] = now
+                self._loop.call_soon_threadsafe(
+                    self._schedule_explain, event.database_name, explainable, record
+                )
+
+    def _schedule_explain(self, database: str, command: dict, record: dict) -> None:
+        from core import background
+
+        background.start(f"explain:{record['collection']}", self._explain(database, command, record))
+
+    async def _explain(self, database: str, command: dict, record: dict) -> None:
+        from core.database import mongodb
+
+        try:
+            result = await mongodb.client[database].command(
+                {"explain": command, "verbosity": "executionStats"}
+            )
+        except Exception as e:
+            logger.warning(f"No se pudo obtener el plan de {record['collection']} {record['filter']}: {str(e)}")
+            return
+        stats = result.get("executionStats", {})
+        plan = summarize_plan(result.get("queryPlanner", {}).get("winningPlan", {}))
+        record["plan"] = {
+            "winning_plan": plan,
+            "collscan": "COLLSCAN" in plan,
+            "n_returned": stats.get("nReturned"),
+            "keys_examined": stats.get("totalKeysExamined"),
+            "docs_examined": stats.get("totalDocsExamined"),
+            "execution_ms": stats.get("executionTimeMillis"),
+        }
+        logger.warning(
+            f"Plan de {record['collection']} {record['filter']}: {plan} "
+            f"(devueltos={stats.get('nReturned')} claves={stats.get('totalKeysExamined')} "
+            f"documentos={stats.get('totalDocsExamined')})"
+        )
+
+
+# Listener activo (el del último cliente creado), para consultar el historial
+recorder: SlowQueryListener | None = None
+
+
+def slow_query_listener() -> SlowQueryListener:
+    global recorder
+    recorder = SlowQueryListener(
+        threshold_ms=settings.SLOW_QUERY_THRESHOLD_MS,
+        explain=settings.SLOW_QUERY_EXPLAIN,
+        explain_interval=settings.SLOW_QUERY_EXPLAIN_INTERVAL_SECONDS,
+        history=settings.SLOW_QUERY_HISTORY,
+    )
+    return recorder
+
+
+def recent() -> list[dict]:
+    """Consultas lentas más recientes primero."""
+    return list(reversed(recorder.recent)) if recorder else []
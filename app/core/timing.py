@@ -0,0 +1,95 @@
+"""
+Desglose del tiempo de cada petición en la cabecera `Server-Timing`, visible en
+las devtools del navegador y en los monitores sintéticos sin mirar los logs.
+
+Fases:
+- auth: decodificar el JWT y obtener el usuario en `get_current_user`.
+- db: operaciones del almacenamiento hechas por los repositorios.
+- model: construcción de modelos de Pydantic en los servicios.
+- serialize: codificación a JSON de las respuestas rápidas (FastJSONResponse).
+- app: el resto (routing, validación de entrada y salida, middlewares, ...).
+
+Las fases no se solapan: lo que ocurre dentro de una fase ya abierta cuenta para
+esa fase (la consulta del usuario cuenta como auth, no como db). Las operaciones
+concurrentes de una misma fase (asyncio.gather) suman su tiempo de pared, no la
+suma de cada una, así que las fases nunca superan al total.
+"""
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Iterator
+from core.config import settings
+
+PHASES = ("auth", "db", "model", "serialize")
+
+# Tiempos de la petición en curso: fase -> [segundos, operaciones abiertas, inicio]
+_timings: ContextVar[dict[str, list] | None] = ContextVar("server_timing", default=None)
+# Fase abierta en la tarea actual; las mediciones anidadas se atribuyen a ella
+_phase: ContextVar[str | None] = ContextVar("server_timing_phase", default=None)
+
+
+@contextmanager
+def measure(phase: str) -> Iterator[None]:
+    """Suma a `phase` el tiempo del bloque. Fuera de una petición no hace nada."""
+    timings = _timings.get()
+    if timings is None or _phase.get() is not None:
+        yield
+        return
+    entry = timings.setdefault(phase, [0.0, 0, 0.0])
+    if entry[1] == 0:
+        entry[2] = time.perf_counter()
+    entry[1] += 1
+    token = _phase.set(phase)
+    try:
+        yield
+    finally:
+        _phase.reset(token)
+        entry[1] -= 1
+        if entry[1] == 0:
+            entry[0] += time.perf_counter() - entry[2]
+
+
+def header(timings: dict[str, list], total: float) -> str:
+    """Valor de `Server-Timing` en milisegundos, p.ej. "auth;dur=1.2, db;dur=3.4, ..., total;dur=6.1"."""
+    parts = []
+    measured = 0.0
+    for phase in PHASES:
+        seconds = timings[phase][0] if phase in timings else 0.0
+        measured += seconds
+        parts.append(f"{phase};dur={seconds * 1000:.2f}")
+    parts.append(f"app;dur={max(total - measured, 0.0) * 1000:.2f}")
+    parts.append(f"total;dur={total * 1000:.2f}")
+    return ", ".join(parts)
+
+
+class ServerTimingMiddleware:
+    """Middleware ASGI que abre el contexto de tiempos y agrega `Server-Timing` a la respuesta."""
+
+    def __init__(self, app):
+        self.app = app
+        # Sin Timing-Allow-Origin el navegador oculta la cabecera a los orígenes cruzados
+        self.allow_origin = ", ".join(origin.rstrip("/") for origin in settings.CORS_ORIGINS).encode()
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        timings: dict[str, list] = {}
+        started = time.perf_counter()
+
+        async def send_wrapper(message):
+            if message["type"] == "http.response.start":
+                value = header(timings, time.perf_counter() - started)
+                message["headers"] = [
+                    *message.get("headers", []),
+                    (b"server-timing", value.encode()),
+                    (b"timing-allow-origin", self.allow_origin),
+                ]
+            await send(message)
+
+        token = _timings.set(timings)
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            _timings.reset(token)
@@ -17,10 +17,18 @@ class UnauthorizedException(AppException):
     def __init__(self, detail: str = "No autorizado"):
         super().__init__(status.HTTP_401_UNAUTHORIZED, detail)
 
+class ForbiddenException(AppException):
+    def __init__(self, detail: str = "Permiso denegado"):
+        super().__init__(status.HTTP_403_FORBIDDEN, detail)
+
 class ValidationException(AppException):
     def __init__(self, detail: str = "Error de validación"):
         super().__init__(status.HTTP_422_UNPROCESSABLE_ENTITY, detail)
 
+class ServiceUnavailableException(AppException):
+    def __init__(self, detail: str = "Servicio no disponible temporalmente"):
+        super().__init__(status.HTTP_503_SERVICE_UNAVAILABLE, detail)
+
 class DatabaseException(HTTPException):
     def __init__(self, detail: str):
         super().__init__(
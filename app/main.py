@@ -1,9 +1,14 @@
+import asyncio
 from contextlib import asynccontextmanager
 from fastapi import FastAPI
 from fastapi.staticfiles import StaticFiles
 from fastapi.middleware.cors import CORSMiddleware
 from core.config import settings
-from core.database import mongodb 
+from repositories.storage import storage
+from utils.hash_and_verify_password import hashing_engine
+from core import background
+from core.health import health_prober
+from services.work_experience_service import WorkExperienceService
 
 # Importar routers de los endpoints
 from api.endpoints.healthcheck import router as healthcheck_router
@@ -16,22 +21,67 @@ from api.endpoints.education import router as education_router
 from api.endpoints.profile import router as profile_router
 from api.endpoints.project import router as project_router
 from api.endpoints.work_experience import router as work_experience_router
+from api.endpoints.cv import router as cv_router
+from api.endpoints.export import router as export_router
+from api.endpoints.metrics import router as metrics_router
+from core.metrics import MetricsMiddleware
+from core.timing import ServerTimingMiddleware
+from core.cache import StaleResponseMiddleware
+
+# Espera entre intentos de conexión cuando el arranque es diferido
+STARTUP_RETRY_SECONDS = 5
+
+async def prepare_storage():
+    """Conecta el almacenamiento (con ping) y crea los índices que falten."""
+    await storage.connect()
+    print(f"✅ Conexión a {storage.name} establecida correctamente")
+    health_prober.probe_now()
+    if settings.MONGO_AUTO_INDEXES:
+        created = await storage.ensure_indexes()
+        for collection, names in created.items():
+            print(f"🗂️ Índices creados en {collection}: {', '.join(names)}")
+
+async def prepare_storage_in_background():
+    """Reintenta `prepare_storage` hasta lograrlo, sin bloquear el arranque ni las peticiones."""
+    while True:
+        try:
+            await prepare_storage()
+            return
+        except Exception as e:
+            print(f"❌ Error de conexión a {storage.name}: {str(e)} (reintento en {STARTUP_RETRY_SECONDS} s)")
+            await asyncio.sleep(STARTUP_RETRY_SECONDS)
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
-    # Inicialización de la conexión a MongoDB
-    try:
-        await mongodb.connect()
-        print("✅ Conexión a MongoDB establecida correctamente")
-    except Exception as e:
-        print(f"❌ Error fatal de conexión a MongoDB: {str(e)}")
-        raise RuntimeError("No se pudo iniciar la aplicación - Error de base de datos") from e
+    # Inicialización del almacenamiento (MongoDB o en memoria, según STORAGE_BACKEND)
+    if settings.DEFERRED_STARTUP:
+        # La app acepta peticiones de inmediato; las primeras consultas esperan al
+        # driver y /healthcheck informa "disconnected" hasta que el ping responda
+        background.start("storage_startup", prepare_storage_in_background())
+    else:
+        try:
+            await prepare_storage()
+        except Exception as e:
+            print(f"❌ Error fatal de conexión a {storage.name}: {str(e)}")
+            raise RuntimeError("No se pudo iniciar la aplicación - Error de base de datos") from e
+
+    # Estado de salud que leen los endpoints /healthcheck sin consultar la base
+    background.start("health_probe", health_prober.run(storage))
+
+    if settings.DURATION_REFRESH_ENABLED:
+        background.start(
+            "work_experience_durations",
+            background.run_daily("work_experience_durations", WorkExperienceService().refresh_durations),
+        )
+        print("⏱️ Refresco diario de duraciones de experiencia laboral activado")
         
     yield  # La aplicación se ejecuta aquí
         
     # Cierre de la conexión al finalizar
-    await mongodb.disconnect()
-    print("🔌 Conexión a MongoDB cerrada")
+    await background.stop_all()
+    await storage.disconnect()
+    print(f"🔌 Conexión a {storage.name} cerrada")
+    hashing_engine.shutdown()
 
 app = FastAPI(
     lifespan=lifespan,
@@ -50,8 +100,22 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    # Cabeceras que el frontend necesita leer (caché condicional y paginación)
+    expose_headers=["ETag", "X-Next-Cursor", "Server-Timing", "Age", "Warning"],
 )
 
+# Métricas de Prometheus: latencia por ruta, estados y peticiones en curso
+if settings.METRICS_ENABLED:
+    app.add_middleware(MetricsMiddleware)
+
+# Age y Warning en las respuestas servidas desde la última copia correcta
+if settings.STALE_ENABLED:
+    app.add_middleware(StaleResponseMiddleware)
+
+# Desglose del tiempo de cada petición en la cabecera Server-Timing
+if settings.SERVER_TIMING_ENABLED:
+    app.add_middleware(ServerTimingMiddleware)
+
 # Registrar routers
 app.include_router(healthcheck_router, prefix=settings.API_PREFIX, tags=["healthcheck"])
 app.include_router(auth_router,  prefix=settings.API_PREFIX, tags=["auth"])
@@ -63,6 +127,10 @@ app.include_router(education_router, prefix=settings.API_PREFIX, tags=["educatio
 app.include_router(profile_router, prefix=settings.API_PREFIX, tags=["profile"])
 app.include_router(project_router, prefix=settings.API_PREFIX, tags=["projects"])
 app.include_router(work_experience_router, prefix=settings.API_PREFIX, tags=["work_experience"])
+app.include_router(cv_router, prefix=settings.API_PREFIX, tags=["cv"])
+app.include_router(export_router, prefix=settings.API_PREFIX, tags=["export"])
+if settings.METRICS_ENABLED:
+    app.include_router(metrics_router, prefix=settings.API_PREFIX, tags=["metrics"])
 
 # Archivos estáticos
 app.mount("/static", StaticFiles(directory="assets"), name="static")
@@ -0,0 +1,90 @@
+"""
+Comandos de administración.
+
+Uso (desde la carpeta app/):
+    python manage.py rebuild-snapshots [--username USERNAME]
+    python manage.py indexes [--apply] [--drop-extra]
+    python manage.py refresh-durations
+"""
+import argparse
+import asyncio
+from core.database import mongodb
+from repositories.storage import storage
+
+
+async def rebuild_snapshots(args: argparse.Namespace) -> None:
+    from services.snapshot_service import snapshot_service
+
+    if args.username:
+        cv = await snapshot_service.rebuild(args.username)
+        print(f"Snapshot de {args.username}: {'reconstruido' if cv else 'eliminado (sin datos)'}")
+    else:
+        total = await snapshot_service.rebuild_all()
+        print(f"Snapshots reconstruidos para {total} usuario(s)")
+
+
+async def indexes(args: argparse.Namespace) -> None:
+    from repositories.indexes import diff_indexes, drop_extra_indexes, ensure_indexes
+
+    # Los índices solo existen en MongoDB, sea cual sea STORAGE_BACKEND
+    await mongodb.connect()
+    if args.apply:
+        for collection, names in (await ensure_indexes(mongodb.db)).items():
+            print(f"Creados en {collection}: {', '.join(names)}")
+    if args.drop_extra:
+        for collection, names in (await drop_extra_indexes(mongodb.db)).items():
+            print(f"Eliminados en {collection}: {', '.join(names)}")
+
+    for collection, entry in (await diff_indexes(mongodb.db)).items():
+        missing = ", ".join(entry["missing"]) or "-"
+        extra = ", ".join(entry["extra"]) or "-"
+        print(f"{collection:<16} faltan: {missing:<40} sobran: {extra}")
+
+
+async def refresh_durations(args: argparse.Namespace) -> None:
+    from services.work_experience_service import WorkExperienceService
+
+    changed = await WorkExperienceService().refresh_durations()
+    print(f"Duraciones actualizadas: {changed}")
+
+
+async def run(args: argparse.Namespace) -> None:
+    await storage.connect()
+    try:
+        await args.handler(args)
+    finally:
+        await storage.disconnect()
+        if mongodb.is_connected:
+            await mongodb.disconnect()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Comandos de administración de JimcostDev API")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    rebuild = subparsers.add_parser(
+        "rebuild-snapshots",
+        help="Reconstruye los snapshots materializados del CV (backfill/reparación)",
+    )
+    rebuild.add_argument("--username", help="Reconstruir solo el snapshot de este usuario")
+    rebuild.set_defaults(handler=rebuild_snapshots)
+
+    index_parser = subparsers.add_parser(
+        "indexes",
+        help="Compara los índices declarados en los repositorios con los de MongoDB",
+    )
+    index_parser.add_argument("--apply", action="store_true", help="Crear los índices que faltan")
+    index_parser.add_argument("--drop-extra", action="store_true", help="Eliminar los índices no declarados")
+    index_parser.set_defaults(handler=indexes)
+
+    durations = subparsers.add_parser(
+        "refresh-durations",
+        help="Recalcula la duración guardada de las experiencias laborales abiertas o sin duración",
+    )
+    durations.set_defaults(handler=refresh_durations)
+
+    asyncio.run(run(parser.parse_args()))
+
+
+if __name__ == "__main__":
+    main()
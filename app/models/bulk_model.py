@@ -0,0 +1,31 @@
+from pydantic import BaseModel, Field
+from typing import List, Literal, Optional
+
+
+class BulkItemResult(BaseModel):
+    index: int = Field(..., description="Posición del elemento en el lote enviado")
+    status: Literal["created", "conflict", "error"] = Field(..., description="Resultado de la inserción")
+    id: Optional[str] = Field(None, description="ID asignado si se creó")
+    detail: Optional[str] = Field(None, description="Motivo si no se creó")
+
+
+class BulkResult(BaseModel):
+    created: int = Field(..., description="Elementos creados")
+    failed: int = Field(..., description="Elementos no creados (conflicto o error)")
+    deleted: int = Field(0, description="Documentos previos eliminados con replace=true")
+    items: List[BulkItemResult] = Field(default_factory=list)
+
+    model_config = {
+        "json_schema_extra": {
+            "example": {
+                "created": 2,
+                "failed": 1,
+                "deleted": 0,
+                "items": [
+                    {"index": 0, "status": "created", "id": "665f1c2e9b1e8a3d4c5b6a70"},
+                    {"index": 1, "status": "conflict", "detail": "Ya existe 'Mi proyecto'"},
+                    {"index": 2, "status": "created", "id": "665f1c2e9b1e8a3d4c5b6a71"},
+                ],
+            }
+        }
+    }
@@ -0,0 +1,37 @@
+from typing import List
+from pydantic import BaseModel, Field
+from models.profile_model import ProfileResponse
+from models.project_model import ProjectResponse
+from models.work_experience_model import WorkExperienceResponse
+from models.education_model import EducationResponse
+from models.certification_model import CertificationResponse
+from models.contact_model import ContactResponse
+from models.social_network_model import SocialNetworkResponse
+
+
+class CVResponse(BaseModel):
+    username: str = Field(..., description="Usuario propietario del CV")
+    profile: List[ProfileResponse] = Field(default_factory=list, description="Perfil profesional")
+    projects: List[ProjectResponse] = Field(default_factory=list, description="Proyectos")
+    work_experience: List[WorkExperienceResponse] = Field(default_factory=list, description="Experiencia laboral")
+    education: List[EducationResponse] = Field(default_factory=list, description="Educación")
+    certifications: List[CertificationResponse] = Field(default_factory=list, description="Certificaciones")
+    contact: List[ContactResponse] = Field(default_factory=list, description="Datos de contacto")
+    social_networks: List[SocialNetworkResponse] = Field(default_factory=list, description="Redes sociales")
+    total_years: int = Field(0, description="Total de años de experiencia laboral")
+
+    model_config = {
+        "json_schema_extra": {
+            "example": {
+                "username": "jimcostdev",
+                "profile": [],
+                "projects": [],
+                "work_experience": [],
+                "education": [],
+                "certifications": [],
+                "contact": [],
+                "social_networks": [],
+                "total_years": 5
+            }
+        }
+    }
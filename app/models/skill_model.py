@@ -0,0 +1,28 @@
+from pydantic import BaseModel, Field
+from typing import List
+
+
+class SkillsPayload(BaseModel):
+    skills: List[str] = Field(
+        ..., min_length=1, max_length=100, description="Habilidades a agregar o remover"
+    )
+
+    model_config = {
+        "json_schema_extra": {
+            "example": {
+                "skills": ["python", "fastapi", "mongodb"]
+            }
+        }
+    }
+
+
+class SkillsAddResult(BaseModel):
+    message: str
+    added: List[str] = Field(..., description="Habilidades agregadas")
+    ignored: List[str] = Field(..., description="Habilidades que ya existían")
+
+
+class SkillsRemoveResult(BaseModel):
+    message: str
+    removed: List[str] = Field(..., description="Habilidades removidas")
+    missing: List[str] = Field(..., description="Habilidades que no existían")
@@ -1,4 +1,4 @@
-from typing import Optional, Union
+from typing import List, Optional, Union
 from pydantic import BaseModel, Field
 
 class WorkExperienceCreate(BaseModel):
@@ -42,3 +42,37 @@ class WorkExperienceResponse(WorkExperienceCreate):
             }
         }
     }
+
+
+class CompanyExperience(BaseModel):
+    company: str = Field(..., title="Empresa")
+    months: int = Field(..., title="Meses trabajados en la empresa (sin contar solapamientos)")
+    years: float = Field(..., title="Años trabajados en la empresa, con un decimal")
+
+
+class LongestTenure(BaseModel):
+    company: str = Field(..., title="Empresa")
+    rol: str = Field(..., title="Cargo")
+    months: int = Field(..., title="Duración en meses")
+    years: float = Field(..., title="Duración en años, con un decimal")
+
+
+class WorkExperienceStats(BaseModel):
+    total_months: int = Field(..., title="Meses de experiencia, uniendo los periodos que se solapan")
+    total_years: float = Field(..., title="Años de experiencia, con un decimal")
+    by_company: List[CompanyExperience] = Field(default_factory=list, title="Experiencia por empresa")
+    longest_tenure: Optional[LongestTenure] = Field(None, title="Experiencia más larga")
+
+    model_config = {
+        "json_schema_extra": {
+            "example": {
+                "total_months": 69,
+                "total_years": 5.8,
+                "by_company": [
+                    {"company": "Empresa X", "months": 45, "years": 3.8},
+                    {"company": "Empresa Y", "months": 30, "years": 2.5}
+                ],
+                "longest_tenure": {"company": "Empresa X", "rol": "Desarrollador de software", "months": 45, "years": 3.8}
+            }
+        }
+    }
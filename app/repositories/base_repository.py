@@ -1,10 +1,26 @@
-from motor.motor_asyncio import AsyncIOMotorCollection
+import hashlib
+from datetime import datetime, timezone
+from typing import AsyncIterator
 from bson import ObjectId, errors
+from pymongo import IndexModel, ASCENDING, DESCENDING
+from core.config import settings
+from repositories.storage.base import StorageCollection
+from repositories.storage.timed import TimedCollection
+from utils.pagination import encode_cursor, decode_cursor
 from exceptions import NotFoundException, DatabaseException
 
 
 class BaseRepository:
-    def __init__(self, collection: AsyncIOMotorCollection):
+    # Índices que necesita la colección; cada repositorio declara los suyos
+    indexes: list[IndexModel] = []
+    # Orden de los listados; el último campo debe ser `_id` para que sea total.
+    # Cada repositorio declara un índice (username, *page_sort) para paginar sin skip.
+    page_sort: list[tuple[str, int]] = [("_id", ASCENDING)]
+
+    def __init__(self, collection: StorageCollection):
+        # Con SERVER_TIMING cada operación suma su tiempo a la fase "db" de la petición
+        if settings.SERVER_TIMING_ENABLED and not isinstance(collection, TimedCollection):
+            collection = TimedCollection(collection)
         self.collection = collection
 
     async def _validate_id(self, id: str):
@@ -15,32 +31,151 @@ class BaseRepository:
         except errors.InvalidId:
             raise NotFoundException("ID inválido")
 
-    async def find_by_username(self, username: str) -> list[dict]:
+    async def find_by_username(self, username: str, projection: dict | None = None) -> list[dict]:
         try:
-            cursor = self.collection.find({"username": username})
             results = []
-            async for doc in cursor:
+            async for doc in self.collection.find({"username": username}, projection):
                 doc["_id"] = str(doc["_id"])
                 results.append(doc)
             return results
         except Exception as e:
             raise DatabaseException(f"Error al buscar por username: {str(e)}")
 
+    @staticmethod
+    def _after(field: str, value, direction: int) -> dict:
+        """Condición "`field` viene después de `value`" en el orden `direction`."""
+        op = "$gt" if direction == ASCENDING else "$lt"
+        condition = {field: {op: value}}
+        if field != "_id":
+            return condition
+        # MongoDB compara por tipo antes que por valor (números < ObjectId) y $gt/$lt
+        # no cruzan de tipo: hay que incluir a mano los _id del otro tipo que siguen.
+        if direction == ASCENDING and isinstance(value, (int, float)):
+            return {"$or": [condition, {"_id": {"$type": "objectId"}}]}
+        if direction == DESCENDING and isinstance(value, ObjectId):
+            return {"$or": [condition, {"_id": {"$type": "number"}}]}
+        return condition
+
+    def _keyset_filter(self, last: list) -> dict:
+        """Filtro de los documentos posteriores a `last` según `page_sort`."""
+        clauses = []
+        for i, (field, direction) in enumerate(self.page_sort):
+            clause = {f: v for (f, _), v in zip(self.page_sort[:i], last[:i])}
+            clause.update(self._after(field, last[i], direction))
+            clauses.append(clause)
+        return clauses[0] if len(clauses) == 1 else {"$or": clauses}
+
+    async def find_page(
+        self,
+        username: str,
+        limit: int | None = None,
+        cursor: str | None = None,
+        projection: dict | None = None,
+    ) -> tuple[list[dict], str | None]:
+        """
+        Documentos del usuario ordenados por `page_sort` a partir de `cursor`.
+        La página se recorre con el índice (sin skip), así que cuesta lo mismo la
+        primera que la centésima. Devuelve los documentos y el cursor siguiente.
+        """
+        query = {"username": username}
+        if cursor:
+            query.update(self._keyset_filter(decode_cursor(cursor, len(self.page_sort))))
+        if projection is not None:
+            projection = {**projection, **{f: 1 for f, _ in self.page_sort}}
+        try:
+            # Uno de más para saber si hay otra página
+            find = self.collection.find(
+                query, projection, sort=self.page_sort, limit=None if limit is None else limit + 1
+            )
+            docs = [doc async for doc in find]
+        except Exception as e:
+            raise DatabaseException(f"Error al listar por username: {str(e)}")
+
+        next_cursor = None
+        if limit is not None and len(docs) > limit:
+            docs = docs[:limit]
+            next_cursor = encode_cursor([docs[-1].get(f) for f, _ in self.page_sort])
+        for doc in docs:
+            doc["_id"] = str(doc["_id"])
+        return docs, next_cursor
+
+    async def list_by_username(
+        self,
+        username: str,
+        not_found_detail: str | None = None,
+        projection: dict | None = None,
+        limit: int | None = None,
+        cursor: str | None = None,
+    ) -> tuple[list[dict], str | None]:
+        """
+        Devuelve una página de documentos del usuario (todos si no hay `limit`) con
+        una sola consulta. Si la primera página está vacía lanza NotFoundException,
+        sin una consulta previa de existencia; las siguientes pueden venir vacías.
+        """
+        docs, next_cursor = await self.find_page(username, limit, cursor, projection)
+        if not docs and not cursor:
+            raise NotFoundException(
+                not_found_detail or f"No se encontraron datos para el usuario {username}"
+            )
+        return docs, next_cursor
+
+    async def iter_by_username(self, username: str, batch_size: int) -> AsyncIterator[dict]:
+        """
+        Recorre los documentos del usuario sin acumularlos: el cursor trae lotes de
+        `batch_size` y solo el lote actual vive en memoria. Los documentos se
+        devuelven tal cual (con `_id` original) para exportarlos sin pérdidas.
+        """
+        try:
+            cursor = self.collection.find({"username": username}, sort=self.page_sort, batch_size=batch_size)
+            async for doc in cursor:
+                yield doc
+        except Exception as e:
+            raise DatabaseException(f"Error al recorrer documentos: {str(e)}")
+
+    def _etag_salt(self) -> str:
+        """Valor adicional del ETag para respuestas que no dependen solo de los documentos."""
+        return settings.PROJECT_VERSION
+
+    async def compute_etag(self, query: dict) -> str | None:
+        """
+        Calcula un ETag fuerte a partir de `_id` y `updated_at` de los documentos que
+        cumplen `query`. La consulta solo proyecta esos campos, sin traer el documento
+        completo. Devuelve None si no hay documentos.
+        """
+        try:
+            cursor = self.collection.find(query, {"updated_at": 1})
+            parts = sorted([f"{doc['_id']}:{doc.get('updated_at', '')}" async for doc in cursor])
+        except Exception as e:
+            raise DatabaseException(f"Error al calcular ETag: {str(e)}")
+        if not parts:
+            return None
+        parts.append(self._etag_salt())
+        return f'"{hashlib.sha1("|".join(parts).encode()).hexdigest()}"'
+
+    async def etag_for(self, username: str, id: str | None = None) -> str | None:
+        """ETag de la lista de documentos del usuario o, si se indica `id`, de uno solo."""
+        query = {"username": username}
+        if id is not None:
+            try:
+                query["_id"] = await self._validate_id(str(id))
+            except NotFoundException:
+                return None
+        return await self.compute_etag(query)
+
     async def find_all(self):
         try:
-            cursor = self.collection.find()
             documents = []
-            async for document in cursor:
+            async for document in self.collection.find({}):
                 document["_id"] = str(document["_id"])
                 documents.append(document)
             return documents
         except Exception as e:
             raise DatabaseException(f"Error al obtener documentos: {str(e)}")
 
-    async def find_by_id(self, id: str):
+    async def find_by_id(self, id: str, projection: dict | None = None):
         try:
             obj_id = await self._validate_id(id)
-            document = await self.collection.find_one({"_id": obj_id})
+            document = await self.collection.find_one({"_id": obj_id}, projection)
             if not document:
                 raise NotFoundException("Documento no encontrado")
             document["_id"] = str(document["_id"])
@@ -52,18 +187,45 @@ class BaseRepository:
 
     async def create(self, data: dict):
         try:
-            result = await self.collection.insert_one(data)
-            return await self.find_by_id(str(result.inserted_id))
+            inserted_id = await self.collection.insert_one(data)
+            return await self.find_by_id(str(inserted_id))
         except Exception as e:
             raise DatabaseException(f"Error al crear documento: {str(e)}")
 
+    async def bulk_create(self, docs: list[dict]) -> dict[int, str]:
+        """
+        Inserta `docs` en una sola operación no ordenada: un fallo no detiene el
+        resto. Los `_id` se asignan antes de enviar para poder reportarlos por
+        elemento. Devuelve {posición: error} de los documentos que no se insertaron.
+        """
+        if not docs:
+            return {}
+        for doc in docs:
+            doc.setdefault("_id", ObjectId())
+        try:
+            return await self.collection.bulk_insert(docs)
+        except Exception as e:
+            raise DatabaseException(f"Error en la inserción masiva: {str(e)}")
+
+    async def ids_by_username(self, username: str) -> list:
+        try:
+            return await self.collection.distinct("_id", {"username": username})
+        except Exception as e:
+            raise DatabaseException(f"Error al obtener documentos: {str(e)}")
+
+    async def delete_by_ids(self, ids: list, username: str) -> int:
+        if not ids:
+            return 0
+        try:
+            return await self.collection.delete_many({"username": username, "_id": {"$in": ids}})
+        except Exception as e:
+            raise DatabaseException(f"Error al eliminar documentos: {str(e)}")
+
     async def update(self, id: str, update_data: dict):
         try:
             obj_id = await self._validate_id(id)
-            result = await self.collection.update_one(
-                {"_id": obj_id}, {"$set": update_data}
-            )
-            if result.matched_count == 0:
+            matched = await self.collection.update_one({"_id": obj_id}, update_data)
+            if matched == 0:
                 raise NotFoundException("Documento a actualizar no encontrado")
             return await self.find_by_id(id)
         except NotFoundException:
@@ -71,11 +233,36 @@ class BaseRepository:
         except Exception as e:
             raise DatabaseException(f"Error al actualizar: {str(e)}")
 
+    async def add_to_array(self, query: dict, field: str, values: list) -> list | None:
+        """
+        Agrega a `field` los `values` que aún no contiene, conservando el orden (como
+        $addToSet con $each), en una sola operación atómica que además normaliza el
+        campo y actualiza `updated_at`. Devuelve el arreglo previo o None si no hay documento.
+        """
+        try:
+            return await self.collection.add_to_array(
+                query, field, values, datetime.now(timezone.utc).isoformat()
+            )
+        except Exception as e:
+            raise DatabaseException(f"Error al actualizar {field}: {str(e)}")
+
+    async def remove_from_array(self, query: dict, field: str, values: list) -> list | None:
+        """
+        Quita de `field` todas las apariciones de `values` (como $pullAll).
+        Devuelve el arreglo previo o None si no hay documento.
+        """
+        try:
+            return await self.collection.remove_from_array(
+                query, field, values, datetime.now(timezone.utc).isoformat()
+            )
+        except Exception as e:
+            raise DatabaseException(f"Error al actualizar {field}: {str(e)}")
+
     async def delete(self, id: str):
         try:
             obj_id = await self._validate_id(id)
-            result = await self.collection.delete_one({"_id": obj_id})
-            if result.deleted_count == 0:
+            deleted = await self.collection.delete_one({"_id": obj_id})
+            if deleted == 0:
                 raise NotFoundException("Documento a eliminar no encontrado")
             return True
         except NotFoundException:
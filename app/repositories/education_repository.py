@@ -1,7 +1,11 @@
-from motor.motor_asyncio import AsyncIOMotorCollection
+from repositories.storage.base import StorageCollection
+from pymongo import IndexModel
 from repositories.base_repository import BaseRepository
 
 
 class EducationRepository(BaseRepository):
-    def __init__(self, collection: AsyncIOMotorCollection):
+    # Índices que se crean al arrancar (ver repositories/indexes.py)
+    indexes = [IndexModel([("username", 1), ("_id", 1)])]
+
+    def __init__(self, collection: StorageCollection):
         super().__init__(collection)
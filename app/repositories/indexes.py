@@ -0,0 +1,95 @@
+"""
+Registro declarativo de índices: una entrada por repositorio. Cada repositorio
+declara en `indexes` los índices que necesitan sus consultas; este módulo los
+compara con los existentes en MongoDB y crea los que falten.
+"""
+import logging
+from pymongo import IndexModel
+from pymongo.errors import PyMongoError
+from repositories.base_repository import BaseRepository
+from repositories.certification_repository import CertificationRepository
+from repositories.contact_repository import ContactRepository
+from repositories.education_repository import EducationRepository
+from repositories.profile_repository import ProfileRepository
+from repositories.project_repository import ProjectRepository
+from repositories.snapshot_repository import SnapshotRepository
+from repositories.social_network_repository import SocialNetworkRepository
+from repositories.user_repository import UserRepository
+from repositories.work_experience_repository import WorkExperienceRepository
+
+logger = logging.getLogger(__name__)
+
+# Colección -> repositorio que la consulta
+INDEX_REGISTRY: dict[str, type[BaseRepository]] = {
+    "users": UserRepository,
+    "perfil": ProfileRepository,
+    "projects": ProjectRepository,
+    "work_experience": WorkExperienceRepository,
+    "education": EducationRepository,
+    "certifications": CertificationRepository,
+    "contact": ContactRepository,
+    "social_networks": SocialNetworkRepository,
+    "cv_snapshots": SnapshotRepository,
+}
+
+
+def _signature(keys, unique: bool) -> tuple:
+    """Identifica un índice por sus campos, dirección y unicidad (no por su nombre)."""
+    return tuple((field, int(direction)) for field, direction in keys), bool(unique)
+
+
+def _declared(repo_cls: type[BaseRepository]) -> dict[tuple, IndexModel]:
+    return {
+        _signature(model.document["key"].items(), model.document.get("unique", False)): model
+        for model in repo_cls.indexes
+    }
+
+
+async def _existing(collection) -> dict[tuple, str]:
+    info = await collection.index_information()
+    return {
+        _signature(spec["key"], spec.get("unique", False)): name
+        for name, spec in info.items()
+        if name != "_id_"
+    }
+
+
+async def diff_indexes(db) -> dict[str, dict[str, list[str]]]:
+    """Devuelve, por colección, los índices declarados que faltan y los existentes que sobran."""
+    report = {}
+    for name, repo_cls in INDEX_REGISTRY.items():
+        declared = _declared(repo_cls)
+        existing = await _existing(db[name])
+        report[name] = {
+            "missing": [model.document["name"] for sig, model in declared.items() if sig not in existing],
+            "extra": [index_name for sig, index_name in existing.items() if sig not in declared],
+        }
+    return report
+
+
+async def ensure_indexes(db) -> dict[str, list[str]]:
+    """
+    Crea los índices declarados que no existan. Es idempotente y no elimina nada.
+    Un error en una colección (p.ej. duplicados al crear un índice único) se registra
+    y no impide reconciliar las demás. Devuelve los índices creados por colección.
+    """
+    created = {}
+    for name, repo_cls in INDEX_REGISTRY.items():
+        try:
+            existing = await _existing(db[name])
+            missing = [model for sig, model in _declared(repo_cls).items() if sig not in existing]
+            if missing:
+                created[name] = await db[name].create_indexes(missing)
+        except PyMongoError as e:
+            logger.error(f"No se pudieron crear los índices de '{name}': {str(e)}")
+    return created
+
+
+async def drop_extra_indexes(db) -> dict[str, list[str]]:
+    """Elimina los índices que no están declarados en el registro (excepto _id_)."""
+    dropped = {}
+    for name, entry in (await diff_indexes(db)).items():
+        for index_name in entry["extra"]:
+            await db[name].drop_index(index_name)
+            dropped.setdefault(name, []).append(index_name)
+    return dropped
@@ -1,41 +1,45 @@
-from motor.motor_asyncio import AsyncIOMotorCollection
+from repositories.storage.base import StorageCollection
+from pymongo import IndexModel
 from repositories.base_repository import BaseRepository
-from exceptions import (
-    NotFoundException,
-    DatabaseException
-)
+from exceptions import NotFoundException
 
 
 class ProfileRepository(BaseRepository):
-    def __init__(self, collection: AsyncIOMotorCollection):
+    # Índices que se crean al arrancar (ver repositories/indexes.py)
+    indexes = [IndexModel([("username", 1), ("_id", 1)])]
+
+    def __init__(self, collection: StorageCollection):
         super().__init__(collection)
         
-    async def add_skill(self, skill: str, username: str) -> dict:
-        try:
-            result = await self.collection.update_one(
-                {"username": username},
-                {"$push": {"skills": skill}}
-            )
-            if result.modified_count == 0:
-                raise DatabaseException("Error al agregar la habilidad")
-            return {"message": "Habilidad agregada exitosamente"}
-        except Exception as e:
-            raise DatabaseException(f"Excepción al agregar habilidad: {str(e)}")
-        
-    async def remove_skill(self, skill: str, username: str) -> dict:
-        try:
-            exists = await self.collection.find_one({"username": username, "skills": skill})
-            if not exists:
-                raise NotFoundException("La habilidad no existe en el perfil")
+    async def add_skills(self, skills: list[str], username: str) -> dict:
+        """
+        Agrega varias habilidades al perfil en una sola operación. Las que ya estaban
+        se ignoran, así no se acumulan duplicados.
+        """
+        skills = list(dict.fromkeys(skills))
+        before = await self.add_to_array({"username": username}, "skills", skills)
+        if before is None:
+            raise NotFoundException("Perfil no encontrado")
+        return {
+            "message": "Habilidades agregadas exitosamente",
+            "added": [skill for skill in skills if skill not in before],
+            "ignored": [skill for skill in skills if skill in before],
+        }
 
-            result = await self.collection.update_one(
-                {"username": username},
-                {"$pull": {"skills": skill}}
-            )
-            if result.modified_count == 0:
-                raise DatabaseException("Error al remover la habilidad")
-            return {"message": "Habilidad removida exitosamente"}
-        except NotFoundException:
-            raise
-        except Exception as e:
-            raise DatabaseException(f"Excepción al remover habilidad: {str(e)}")
+    async def remove_skills(self, skills: list[str], username: str) -> dict:
+        """
+        Remueve varias habilidades del perfil en una sola operación.
+        Lanza NotFoundException si ninguna estaba en el perfil.
+        """
+        skills = list(dict.fromkeys(skills))
+        before = await self.remove_from_array({"username": username}, "skills", skills)
+        if before is None:
+            raise NotFoundException("Perfil no encontrado")
+        removed = [skill for skill in skills if skill in before]
+        if not removed:
+            raise NotFoundException("La habilidad no existe en el perfil")
+        return {
+            "message": "Habilidades removidas exitosamente",
+            "removed": removed,
+            "missing": [skill for skill in skills if skill not in before],
+        }
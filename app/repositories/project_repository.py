@@ -1,81 +1,50 @@
-from motor.motor_asyncio import AsyncIOMotorCollection
+from repositories.storage.base import StorageCollection
+from pymongo import IndexModel
 from repositories.base_repository import BaseRepository
-from exceptions import (
-    NotFoundException,
-    DatabaseException
-)
-from bson import ObjectId
+from exceptions import NotFoundException
 from typing import Union
 
 
 class ProjectRepository(BaseRepository):
-    def __init__(self, collection: AsyncIOMotorCollection):
+    # Índices que se crean al arrancar (ver repositories/indexes.py)
+    indexes = [IndexModel([("username", 1), ("_id", 1)])]
+
+    def __init__(self, collection: StorageCollection):
         super().__init__(collection)
 
-    async def add_skill(self, skill: str, id: Union[str, int], username: str) -> dict:
+    async def _project_query(self, id: Union[str, int], username: str) -> dict:
+        # Acepta tanto `id` int (legacy) como str con ObjectId (nuevo)
+        return {"_id": await self._validate_id(str(id)), "username": username}
+
+    async def add_skills(self, skills: list[str], id: Union[str, int], username: str) -> dict:
         """
-        Agrega una habilidad al campo 'stack' del proyecto identificado por `id` y `username`.
-        Acepta tanto `id` int (legacy) como str con ObjectId (nuevo).
+        Agrega varias habilidades al 'stack' del proyecto en una sola operación, que
+        además convierte en lista un 'stack' ausente o nulo. Las repetidas se ignoran.
         """
-        try:
-            # 1) Determinar el filtro según el tipo de id
-            if isinstance(id, int) or (isinstance(id, str) and id.isdigit()):
-                filtro = {"_id": int(id), "username": username}
-            else:
-                filtro = {"_id": ObjectId(id), "username": username}
-
-            # 2) Verificar que el proyecto existe
-            doc = await self.collection.find_one(filtro)
-            if doc is None:
-                raise NotFoundException("Proyecto no encontrado para el usuario especificado")
-
-            # 3) Asegurar que 'stack' sea una lista
-            if not isinstance(doc.get("stack"), list):
-                await self.collection.update_one(
-                    filtro,
-                    {"$set": {"stack": []}}
-                )
-
-            # 4) Hacer el $push de la nueva skill
-            result = await self.collection.update_one(
-                filtro,
-                {"$push": {"stack": skill}}
-            )
-            if result.modified_count == 0:
-                raise DatabaseException("Error al agregar la habilidad al proyecto")
-            return {"message": "Habilidad agregada exitosamente"}
-        except NotFoundException:
-            raise
-        except Exception as e:
-            raise DatabaseException(f"Excepción al agregar habilidad: {str(e)}") from e
-
-    async def remove_skill(self, skill: str, id: Union[str, int], username: str) -> dict:
+        skills = list(dict.fromkeys(skills))
+        before = await self.add_to_array(await self._project_query(id, username), "stack", skills)
+        if before is None:
+            raise NotFoundException("Proyecto no encontrado para el usuario especificado")
+        return {
+            "message": "Habilidades agregadas exitosamente",
+            "added": [skill for skill in skills if skill not in before],
+            "ignored": [skill for skill in skills if skill in before],
+        }
+
+    async def remove_skills(self, skills: list[str], id: Union[str, int], username: str) -> dict:
         """
-        Remueve una habilidad del campo 'stack' del proyecto identificado por `id` y `username`.
-        Si la habilidad no existe, lanza NotFoundException.
-        Acepta tanto `id` int (legacy) como str con ObjectId (nuevo).
+        Remueve varias habilidades del 'stack' del proyecto en una sola operación.
+        Lanza NotFoundException si ninguna estaba en el stack.
         """
-        try:
-            # 1) Determinar el filtro según el tipo de id
-            if isinstance(id, int) or (isinstance(id, str) and id.isdigit()):
-                filtro = {"_id": int(id), "username": username}
-            else:
-                filtro = {"_id": ObjectId(id), "username": username}
-
-            # 2) Verificar que la skill exista en el proyecto
-            exists = await self.collection.find_one({**filtro, "stack": skill})
-            if not exists:
-                raise NotFoundException("La habilidad no existe en el stack del proyecto")
-
-            # 3) Hacer el $pull para remover la skill
-            result = await self.collection.update_one(
-                filtro,
-                {"$pull": {"stack": skill}}
-            )
-            if result.modified_count == 0:
-                raise DatabaseException("Error al remover la habilidad del proyecto")
-            return {"message": "Habilidad removida exitosamente"}
-        except NotFoundException:
-            raise
-        except Exception as e:
-            raise DatabaseException(f"Excepción al remover habilidad: {str(e)}") from e
+        skills = list(dict.fromkeys(skills))
+        before = await self.remove_from_array(await self._project_query(id, username), "stack", skills)
+        if before is None:
+            raise NotFoundException("Proyecto no encontrado para el usuario especificado")
+        removed = [skill for skill in skills if skill in before]
+        if not removed:
+            raise NotFoundException("La habilidad no existe en el stack del proyecto")
+        return {
+            "message": "Habilidades removidas exitosamente",
+            "removed": removed,
+            "missing": [skill for skill in skills if skill not in before],
+        }
@@ -0,0 +1,35 @@
+from datetime import datetime, timezone
+from repositories.storage.base import StorageCollection
+from pymongo import IndexModel
+from repositories.base_repository import BaseRepository
+from exceptions import DatabaseException
+
+
+class SnapshotRepository(BaseRepository):
+    # Índices que se crean al arrancar (ver repositories/indexes.py)
+    indexes = [IndexModel([("username", 1)], unique=True)]
+
+    def __init__(self, collection: StorageCollection):
+        super().__init__(collection)
+
+    async def find_snapshot(self, username: str) -> dict | None:
+        try:
+            return await self.collection.find_one({"username": username}, {"_id": 0})
+        except Exception as e:
+            raise DatabaseException(f"Error al obtener snapshot: {str(e)}")
+
+    async def save_snapshot(self, username: str, data: dict) -> None:
+        try:
+            await self.collection.replace_one({"username": username}, data, upsert=True)
+        except Exception as e:
+            raise DatabaseException(f"Error al guardar snapshot: {str(e)}")
+
+    async def delete_snapshot(self, username: str) -> None:
+        try:
+            await self.collection.delete_one({"username": username})
+        except Exception as e:
+            raise DatabaseException(f"Error al eliminar snapshot: {str(e)}")
+
+    def _etag_salt(self) -> str:
+        # Los snapshots de días anteriores se reconstruyen al leerse
+        return f"{super()._etag_salt()}:{datetime.now(timezone.utc).date().isoformat()}"
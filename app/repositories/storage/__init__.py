@@ -0,0 +1,21 @@
+"""
+Backends de almacenamiento de los repositorios. STORAGE_BACKEND elige cuál usa la
+aplicación: "motor" (MongoDB, por defecto) o "memory" (en memoria, sin base de datos).
+"""
+from core.config import settings
+from repositories.storage.base import StorageBackend, StorageCollection
+
+
+def create_storage(backend: str) -> StorageBackend:
+    if backend == "memory":
+        from repositories.storage.memory_backend import MemoryStorage
+        return MemoryStorage()
+    if backend == "motor":
+        from repositories.storage.motor_backend import MotorStorage
+        return MotorStorage()
+    raise ValueError(f"STORAGE_BACKEND no soportado: {backend}")
+
+
+storage = create_storage(settings.STORAGE_BACKEND)
+
+__all__ = ["StorageBackend", "StorageCollection", "create_storage", "storage"]
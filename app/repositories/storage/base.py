@@ -0,0 +1,111 @@
+"""
+Interfaz de almacenamiento que usan los repositorios. Cubre solo las operaciones
+que hacen los repositorios (y los servicios a través de `repo.collection`); los
+filtros y proyecciones siguen el formato de MongoDB en todos los backends.
+"""
+from abc import ABC, abstractmethod
+from typing import Any, AsyncIterator
+
+
+class StorageCollection(ABC):
+    """Una colección de documentos de un backend de almacenamiento."""
+
+    name: str
+
+    @abstractmethod
+    def find(
+        self,
+        query: dict,
+        projection: dict | None = None,
+        sort: list[tuple[str, int]] | None = None,
+        limit: int | None = None,
+        batch_size: int | None = None,
+    ) -> AsyncIterator[dict]:
+        """Recorre los documentos que cumplen `query` en el orden `sort`."""
+
+    @abstractmethod
+    async def find_one(self, query: dict, projection: dict | None = None) -> dict | None:
+        ...
+
+    @abstractmethod
+    async def distinct(self, field: str, query: dict | None = None) -> list:
+        ...
+
+    @abstractmethod
+    async def insert_one(self, doc: dict) -> Any:
+        """Inserta `doc` y devuelve su `_id`."""
+
+    @abstractmethod
+    async def bulk_insert(self, docs: list[dict]) -> dict[int, str]:
+        """
+        Inserta `docs` (con `_id` ya asignado) sin detenerse en el primer fallo.
+        Devuelve {posición: error} de los documentos que no se insertaron.
+        """
+
+    @abstractmethod
+    async def update_one(self, query: dict, fields: dict) -> int:
+        """Aplica `$set` de `fields` al primer documento de `query`. Devuelve cuántos coincidieron."""
+
+    @abstractmethod
+    async def bulk_set(self, updates: list[tuple[Any, dict]]) -> None:
+        """Aplica varios `$set` por `_id` en una sola operación."""
+
+    @abstractmethod
+    async def replace_one(self, query: dict, doc: dict, upsert: bool = False) -> None:
+        ...
+
+    @abstractmethod
+    async def delete_one(self, query: dict) -> int:
+        ...
+
+    @abstractmethod
+    async def delete_many(self, query: dict) -> int:
+        ...
+
+    @abstractmethod
+    async def add_to_array(self, query: dict, field: str, values: list, updated_at: str) -> list | None:
+        """
+        Agrega a `field` los `values` que aún no contiene, conservando el orden, y fija
+        `updated_at`, en una sola operación atómica. Devuelve el arreglo previo
+        (lista vacía si faltaba o no era lista) o None si ningún documento cumple `query`.
+        Si el arreglo no cambia, el documento (y su `updated_at`) queda intacto.
+        """
+
+    @abstractmethod
+    async def remove_from_array(self, query: dict, field: str, values: list, updated_at: str) -> list | None:
+        """Como `add_to_array`, pero quita de `field` todas las apariciones de `values`."""
+
+    @abstractmethod
+    async def aggregate(self, pipeline: list[dict]) -> list[dict]:
+        """Ejecuta una agregación. Los backends que no la soportan lanzan NotImplementedError."""
+
+
+class StorageBackend(ABC):
+    """Origen de las colecciones: se conecta en `lifespan` y se elige con STORAGE_BACKEND."""
+
+    name: str
+
+    @property
+    @abstractmethod
+    def is_connected(self) -> bool:
+        ...
+
+    @abstractmethod
+    async def connect(self) -> None:
+        ...
+
+    @abstractmethod
+    async def disconnect(self) -> None:
+        ...
+
+    @abstractmethod
+    async def get_collection(self, name: str) -> StorageCollection:
+        """Obtiene una colección conectando automáticamente si es necesario."""
+
+    @abstractmethod
+    async def ping(self) -> None:
+        """Lanza una excepción si el backend no responde."""
+
+    @abstractmethod
+    async def ensure_indexes(self) -> dict[str, list[str]]:
+        """Crea los índices declarados que falten. Devuelve los creados por colección."""
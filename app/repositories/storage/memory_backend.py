@@ -0,0 +1,320 @@
+"""
+Backend en memoria: para tests, benchmarks, demos y desarrollo sin MongoDB.
+
+Los documentos viven en diccionarios por `_id` con un índice por `username`, así
+que las consultas por usuario (las de casi todas las rutas) no recorren la
+colección completa. Interpreta el subconjunto de filtros de MongoDB que usan los
+repositorios: igualdad, $gt/$gte/$lt/$lte, $in, $ne, $exists, $type, $or y $and,
+comparando y ordenando por tipo como lo hace MongoDB. Las agregaciones no están
+soportadas y los índices únicos no se aplican. Los datos se pierden al reiniciar.
+"""
+from datetime import datetime
+from typing import Any, AsyncIterator
+from bson import ObjectId
+from pymongo import ASCENDING
+from pymongo.errors import DuplicateKeyError
+from repositories.storage.base import StorageBackend, StorageCollection
+
+MISSING = object()
+
+
+def _clone(value: Any) -> Any:
+    """Copia dicts y listas; el resto de valores que se guardan son inmutables."""
+    if isinstance(value, dict):
+        return {k: _clone(v) for k, v in value.items()}
+    if isinstance(value, list):
+        return [_clone(v) for v in value]
+    return value
+
+
+def _type_order(value: Any) -> int:
+    """Orden de tipos de BSON: null < números < strings < objetos < arrays < ObjectId < bool < fechas."""
+    if value is MISSING or value is None:
+        return 1
+    if isinstance(value, bool):
+        return 8
+    if isinstance(value, (int, float)):
+        return 2
+    if isinstance(value, str):
+        return 3
+    if isinstance(value, dict):
+        return 4
+    if isinstance(value, (list, tuple)):
+        return 5
+    if isinstance(value, ObjectId):
+        return 7
+    if isinstance(value, datetime):
+        return 9
+    return 10
+
+
+def _sort_key(value: Any) -> tuple:
+    order = _type_order(value)
+    return (order, None if order == 1 else value)
+
+
+def _compare(op: str, value: Any, target: Any) -> bool:
+    # Como en MongoDB, los operadores de rango no comparan entre tipos distintos
+    if value is MISSING or _type_order(value) != _type_order(target):
+        return False
+    if op == "$gt":
+        return value > target
+    if op == "$gte":
+        return value >= target
+    if op == "$lt":
+        return value < target
+    return value <= target
+
+
+_TYPES = {
+    "objectId": lambda v: isinstance(v, ObjectId),
+    "number": lambda v: isinstance(v, (int, float)) and not isinstance(v, bool),
+    "string": lambda v: isinstance(v, str),
+    "null": lambda v: v is None,
+    "array": lambda v: isinstance(v, list),
+    "bool": lambda v: isinstance(v, bool),
+    "date": lambda v: isinstance(v, datetime),
+}
+
+
+def _equals(value: Any, target: Any) -> bool:
+    if target is None:
+        return value is MISSING or value is None
+    if value is MISSING:
+        return False
+    if isinstance(value, list) and not isinstance(target, list):
+        return any(_equals(item, target) for item in value)
+    return _type_order(value) == _type_order(target) and value == target
+
+
+def _match_operator(value: Any, op: str, arg: Any) -> bool:
+    if op == "$eq":
+        return _equals(value, arg)
+    if op == "$ne":
+        return not _equals(value, arg)
+    if op in ("$gt", "$gte", "$lt", "$lte"):
+        return _compare(op, value, arg)
+    if op == "$in":
+        return any(_equals(value, item) for item in arg)
+    if op == "$nin":
+        return not any(_equals(value, item) for item in arg)
+    if op == "$exists":
+        return (value is not MISSING) == bool(arg)
+    if op == "$type":
+        return value is not MISSING and _TYPES[arg](value)
+    raise NotImplementedError(f"Operador no soportado en memoria: {op}")
+
+
+def matches(doc: dict, query: dict) -> bool:
+    """Indica si `doc` cumple el filtro de MongoDB `query`."""
+    for key, condition in query.items():
+        if key == "$or":
+            if not any(matches(doc, clause) for clause in condition):
+                return False
+        elif key == "$and":
+            if not all(matches(doc, clause) for clause in condition):
+                return False
+        else:
+            value = doc.get(key, MISSING)
+            if isinstance(condition, dict) and condition and all(k.startswith("$") for k in condition):
+                if not all(_match_operator(value, op, arg) for op, arg in condition.items()):
+                    return False
+            elif not _equals(value, condition):
+                return False
+    return True
+
+
+def project(doc: dict, projection: dict | None) -> dict:
+    """Copia de `doc` con la proyección aplicada (inclusión o exclusión, como en MongoDB)."""
+    if not projection:
+        return _clone(doc)
+    included = [field for field, keep in projection.items() if keep and field != "_id"]
+    if included:
+        result = {"_id": doc["_id"]} if projection.get("_id", 1) else {}
+        result.update({field: _clone(doc[field]) for field in included if field in doc})
+        return result
+    excluded = {field for field, keep in projection.items() if not keep}
+    return {k: _clone(v) for k, v in doc.items() if k not in excluded}
+
+
+class MemoryCollection(StorageCollection):
+    def __init__(self, name: str):
+        self.name = name
+        self._docs: dict[Any, dict] = {}
+        self._by_username: dict[Any, dict[Any, dict]] = {}
+
+    def _candidates(self, query: dict):
+        """Documentos a evaluar: por `_id` o `username` si el filtro los fija, si no todos."""
+        _id = query.get("_id", MISSING)
+        if _id is not MISSING and not isinstance(_id, dict):
+            doc = self._docs.get(_id)
+            return [doc] if doc is not None else []
+        username = query.get("username", MISSING)
+        if isinstance(username, str):
+            return list(self._by_username.get(username, {}).values())
+        return list(self._docs.values())
+
+    def _matching(self, query: dict) -> list[dict]:
+        return [doc for doc in self._candidates(query) if matches(doc, query)]
+
+    def _index(self, doc: dict) -> None:
+        self._docs[doc["_id"]] = doc
+        self._by_username.setdefault(doc.get("username"), {})[doc["_id"]] = doc
+
+    def _unindex(self, doc: dict) -> None:
+        self._docs.pop(doc["_id"], None)
+        bucket = self._by_username.get(doc.get("username"))
+        if bucket is not None:
+            bucket.pop(doc["_id"], None)
+            if not bucket:
+                del self._by_username[doc.get("username")]
+
+    def _store(self, doc: dict) -> Any:
+        doc = _clone(doc)
+        doc.setdefault("_id", ObjectId())
+        if doc["_id"] in self._docs:
+            raise DuplicateKeyError(f"E11000 duplicate key error collection: {self.name} dup key: {doc['_id']}")
+        self._index(doc)
+        return doc["_id"]
+
+    async def find(self, query, projection=None, sort=None, limit=None, batch_size=None) -> AsyncIterator[dict]:
+        docs = self._matching(query)
+        # Orden estable por cada campo, del último al primero
+        for field, direction in reversed(sort or []):
+            docs.sort(key=lambda d: _sort_key(d.get(field, MISSING)), reverse=direction != ASCENDING)
+        if limit:
+            docs = docs[:limit]
+        for doc in docs:
+            yield project(doc, projection)
+
+    async def find_one(self, query, projection=None):
+        for doc in self._candidates(query):
+            if matches(doc, query):
+                return project(doc, projection)
+        return None
+
+    async def distinct(self, field, query=None):
+        values = []
+        for doc in self._matching(query or {}):
+            value = doc.get(field, MISSING)
+            if value is not MISSING and value not in values:
+                values.append(value)
+        return values
+
+    async def insert_one(self, doc):
+        _id = self._store(doc)
+        doc.setdefault("_id", _id)
+        return _id
+
+    async def bulk_insert(self, docs):
+        errors = {}
+        for index, doc in enumerate(docs):
+            try:
+                self._store(doc)
+            except DuplicateKeyError as e:
+                errors[index] = str(e)
+        return errors
+
+    def _set(self, doc: dict, fields: dict) -> None:
+        if "username" in fields and fields["username"] != doc.get("username"):
+            self._unindex(doc)
+            doc.update(_clone(fields))
+            self._index(doc)
+        else:
+            doc.update(_clone(fields))
+
+    async def update_one(self, query, fields):
+        for doc in self._candidates(query):
+            if matches(doc, query):
+                self._set(doc, fields)
+                return 1
+        return 0
+
+    async def bulk_set(self, updates):
+        for _id, fields in updates:
+            doc = self._docs.get(_id)
+            if doc is not None:
+                self._set(doc, fields)
+
+    async def replace_one(self, query, doc, upsert=False):
+        current = await self.find_one(query, {"_id": 1})
+        if current is None:
+            if upsert:
+                self._store(doc)
+            return
+        self._unindex(self._docs[current["_id"]])
+        replacement = _clone(doc)
+        replacement["_id"] = current["_id"]
+        self._index(replacement)
+
+    async def delete_one(self, query):
+        for doc in self._candidates(query):
+            if matches(doc, query):
+                self._unindex(doc)
+                return 1
+        return 0
+
+    async def delete_many(self, query):
+        docs = self._matching(query)
+        for doc in docs:
+            self._unindex(doc)
+        return len(docs)
+
+    async def _update_array(self, query: dict, field: str, update, updated_at: str) -> list | None:
+        for doc in self._candidates(query):
+            if matches(doc, query):
+                previous = doc.get(field)
+                previous = list(previous) if isinstance(previous, list) else []
+                new = update(previous)
+                if new != previous:
+                    doc[field] = new
+                    doc["updated_at"] = updated_at
+                return previous
+        return None
+
+    async def add_to_array(self, query, field, values, updated_at):
+        return await self._update_array(
+            query, field, lambda current: current + [v for v in values if v not in current], updated_at
+        )
+
+    async def remove_from_array(self, query, field, values, updated_at):
+        return await self._update_array(
+            query, field, lambda current: [v for v in current if v not in values], updated_at
+        )
+
+    async def aggregate(self, pipeline):
+        raise NotImplementedError("El backend en memoria no soporta agregaciones")
+
+
+class MemoryStorage(StorageBackend):
+    name = "almacenamiento en memoria"
+
+    def __init__(self):
+        self._collections: dict[str, MemoryCollection] = {}
+        self._connected = False
+
+    @property
+    def is_connected(self) -> bool:
+        return self._connected
+
+    async def connect(self) -> None:
+        if not self._connected:
+            self._connected = True
+            print("Almacenamiento en memoria listo (los datos no se persisten).")
+
+    async def disconnect(self) -> None:
+        self._connected = False
+
+    async def get_collection(self, name: str) -> MemoryCollection:
+        if not self._connected:
+            await self.connect()
+        if name not in self._collections:
+            self._collections[name] = MemoryCollection(name)
+        return self._collections[name]
+
+    async def ping(self) -> None:
+        return None
+
+    async def ensure_indexes(self) -> dict[str, list[str]]:
+        # El índice por username es parte de cada colección en memoria
+        return {}
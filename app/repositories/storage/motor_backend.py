@@ -0,0 +1,150 @@
+from typing import TYPE_CHECKING, AsyncIterator
+from pymongo import InsertOne, UpdateOne, ReturnDocument
+from pymongo.errors import BulkWriteError
+from core.database import mongodb
+from repositories.storage.base import StorageBackend, StorageCollection
+
+if TYPE_CHECKING:
+    from motor.motor_asyncio import AsyncIOMotorCollection
+
+
+def _as_array(field: str) -> dict:
+    """Expresión que normaliza `field` a lista (vacía si falta o no es lista)."""
+    return {"$cond": [{"$isArray": f"${field}"}, f"${field}", []]}
+
+
+class MotorCollection(StorageCollection):
+    """Colección de MongoDB a través de Motor."""
+
+    def __init__(self, collection: "AsyncIOMotorCollection"):
+        self.collection = collection
+        self.name = collection.name
+
+    async def find(self, query, projection=None, sort=None, limit=None, batch_size=None) -> AsyncIterator[dict]:
+        cursor = self.collection.find(query, projection)
+        if sort:
+            cursor = cursor.sort(sort)
+        if limit is not None:
+            cursor = cursor.limit(limit)
+        if batch_size:
+            cursor = cursor.batch_size(batch_size)
+        async for doc in cursor:
+            yield doc
+
+    async def find_one(self, query, projection=None):
+        return await self.collection.find_one(query, projection)
+
+    async def distinct(self, field, query=None):
+        return await self.collection.distinct(field, query)
+
+    async def insert_one(self, doc):
+        result = await self.collection.insert_one(doc)
+        return result.inserted_id
+
+    async def bulk_insert(self, docs):
+        if not docs:
+            return {}
+        try:
+            await self.collection.bulk_write([InsertOne(doc) for doc in docs], ordered=False)
+            return {}
+        except BulkWriteError as e:
+            return {
+                err["index"]: err.get("errmsg", "Error de escritura")
+                for err in e.details.get("writeErrors", [])
+            }
+
+    async def update_one(self, query, fields):
+        result = await self.collection.update_one(query, {"$set": fields})
+        return result.matched_count
+
+    async def bulk_set(self, updates):
+        if not updates:
+            return
+        await self.collection.bulk_write(
+            [UpdateOne({"_id": _id}, {"$set": fields}) for _id, fields in updates],
+            ordered=False,
+        )
+
+    async def replace_one(self, query, doc, upsert=False):
+        await self.collection.replace_one(query, doc, upsert=upsert)
+
+    async def delete_one(self, query):
+        result = await self.collection.delete_one(query)
+        return result.deleted_count
+
+    async def delete_many(self, query):
+        result = await self.collection.delete_many(query)
+        return result.deleted_count
+
+    async def _update_array(self, query: dict, field: str, value: dict, changes: dict, updated_at: str) -> list | None:
+        """
+        Aplica a `field` la expresión `value` con un update pipeline, en una sola
+        operación atómica que además normaliza el campo y actualiza `updated_at`.
+        El filtro exige `changes`: si el arreglo quedaría igual no se escribe nada,
+        así `updated_at` (y el ETag) solo cambian cuando cambia el documento.
+        """
+        before = await self.collection.find_one_and_update(
+            {"$and": [query, {"$expr": changes}]},
+            [{"$set": {field: value, "updated_at": updated_at}}],
+            projection={field: 1},
+            return_document=ReturnDocument.BEFORE,
+        )
+        if before is None:
+            # Sin cambios o sin documento: se distingue con una lectura
+            before = await self.collection.find_one(query, {field: 1})
+            if before is None:
+                return None
+        previous = before.get(field)
+        return previous if isinstance(previous, list) else []
+
+    async def add_to_array(self, query, field, values, updated_at):
+        # $literal evita que un valor que empiece por "$" se lea como ruta de campo
+        new = {"$literal": values}
+        current = _as_array(field)
+        missing = {"$filter": {"input": new, "cond": {"$eq": [{"$in": ["$$this", current]}, False]}}}
+        return await self._update_array(
+            query, field, {"$concatArrays": [current, missing]}, {"$gt": [{"$size": missing}, 0]}, updated_at
+        )
+
+    async def remove_from_array(self, query, field, values, updated_at):
+        values = {"$literal": values}
+        current = _as_array(field)
+        kept = {"$filter": {"input": current, "cond": {"$eq": [{"$in": ["$$this", values]}, False]}}}
+        present = {"$filter": {"input": current, "cond": {"$in": ["$$this", values]}}}
+        return await self._update_array(query, field, kept, {"$gt": [{"$size": present}, 0]}, updated_at)
+
+    async def aggregate(self, pipeline):
+        return await self.collection.aggregate(pipeline).to_list(length=None)
+
+
+class MotorStorage(StorageBackend):
+    """Backend de MongoDB: delega la conexión y el pool en `core.database.mongodb`."""
+
+    name = "MongoDB"
+
+    def __init__(self):
+        self._collections: dict[str, MotorCollection] = {}
+
+    @property
+    def is_connected(self) -> bool:
+        return mongodb.client is not None and mongodb.is_connected
+
+    async def connect(self) -> None:
+        await mongodb.connect()
+
+    async def disconnect(self) -> None:
+        await mongodb.disconnect()
+        self._collections.clear()
+
+    async def get_collection(self, name: str) -> MotorCollection:
+        if name not in self._collections:
+            self._collections[name] = MotorCollection(await mongodb.get_collection(name))
+        return self._collections[name]
+
+    async def ping(self) -> None:
+        await mongodb.client.admin.command("ping")
+
+    async def ensure_indexes(self) -> dict[str, list[str]]:
+        from repositories.indexes import ensure_indexes
+
+        return await ensure_indexes(mongodb.db)
@@ -0,0 +1,70 @@
+from typing import AsyncIterator
+from core.timing import measure
+from repositories.storage.base import StorageCollection
+
+
+class TimedCollection(StorageCollection):
+    """Envuelve una colección y suma el tiempo de cada operación a la fase "db" de Server-Timing."""
+
+    def __init__(self, collection: StorageCollection):
+        self.inner = collection
+        self.name = collection.name
+
+    async def find(self, query, projection=None, sort=None, limit=None, batch_size=None) -> AsyncIterator[dict]:
+        # Se mide cada lote pedido al cursor, no el tiempo que el consumidor pasa entre documentos
+        iterator = self.inner.find(query, projection, sort=sort, limit=limit, batch_size=batch_size).__aiter__()
+        while True:
+            with measure("db"):
+                try:
+                    doc = await iterator.__anext__()
+                except StopAsyncIteration:
+                    return
+            yield doc
+
+    async def find_one(self, query, projection=None):
+        with measure("db"):
+            return await self.inner.find_one(query, projection)
+
+    async def distinct(self, field, query=None):
+        with measure("db"):
+            return await self.inner.distinct(field, query)
+
+    async def insert_one(self, doc):
+        with measure("db"):
+            return await self.inner.insert_one(doc)
+
+    async def bulk_insert(self, docs):
+        with measure("db"):
+            return await self.inner.bulk_insert(docs)
+
+    async def update_one(self, query, fields):
+        with measure("db"):
+            return await self.inner.update_one(query, fields)
+
+    async def bulk_set(self, updates):
+        with measure("db"):
+            await self.inner.bulk_set(updates)
+
+    async def replace_one(self, query, doc, upsert=False):
+        with measure("db"):
+            await self.inner.replace_one(query, doc, upsert=upsert)
+
+    async def delete_one(self, query):
+        with measure("db"):
+            return await self.inner.delete_one(query)
+
+    async def delete_many(self, query):
+        with measure("db"):
+            return await self.inner.delete_many(query)
+
+    async def add_to_array(self, query, field, values, updated_at):
+        with measure("db"):
+            return await self.inner.add_to_array(query, field, values, updated_at)
+
+    async def remove_from_array(self, query, field, values, updated_at):
+        with measure("db"):
+            return await self.inner.remove_from_array(query, field, values, updated_at)
+
+    async def aggregate(self, pipeline):
+        with measure("db"):
+            return await self.inner.aggregate(pipeline)
@@ -1,27 +1,37 @@
-from motor.motor_asyncio import AsyncIOMotorCollection
+from repositories.storage.base import StorageCollection
+from pymongo import IndexModel
 from repositories.base_repository import BaseRepository
 
 class UserRepository(BaseRepository):
-    def __init__(self, collection: AsyncIOMotorCollection):
+    # Índices que se crean al arrancar (ver repositories/indexes.py)
+    indexes = [
+        IndexModel([("email", 1)], unique=True),
+        IndexModel([("username", 1)], unique=True),
+    ]
+
+    def __init__(self, collection: StorageCollection):
         super().__init__(collection)
 
-    async def find_by_username(self, username: str) -> dict:
-        document = await self.collection.find_one({"username": username})
+    async def find_by_username(self, username: str, projection: dict | None = None) -> dict:
+        document = await self.collection.find_one({"username": username}, projection)
         if not document:
             return None
         document["_id"] = str(document["_id"])
         return document
 
-    async def find_by_email(self, email: str) -> dict:
-        document = await self.collection.find_one({"email": email})
+    async def find_by_email(self, email: str, projection: dict | None = None) -> dict:
+        document = await self.collection.find_one({"email": email}, projection)
         if not document:
             return None
         document["_id"] = str(document["_id"])
         return document
 
+    async def etag_for_email(self, email: str) -> str | None:
+        return await self.compute_etag({"email": email})
+
     async def create_user(self, user_data: dict) -> dict:
-        result = await self.collection.insert_one(user_data)
-        return await self.find_by_id(str(result.inserted_id))
+        inserted_id = await self.collection.insert_one(user_data)
+        return await self.find_by_id(str(inserted_id))
 
     async def update_user(self, id: str, update_data: dict) -> dict:
         return await self.update(id, update_data)
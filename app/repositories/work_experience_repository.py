@@ -1,26 +1,72 @@
 # work_experience_repository.py
-from motor.motor_asyncio import AsyncIOMotorCollection
+from repositories.storage.base import StorageCollection
+from pymongo import IndexModel, DESCENDING
 from repositories.base_repository import BaseRepository
 from bson import ObjectId
-from typing import Union, List, Dict
+from datetime import date, datetime
+from typing import Any, AsyncIterator, Union, List, Dict, Tuple
+
+
+def _whole_months(start, end) -> dict:
+    """
+    Meses calendario completos entre dos fechas: $dateDiff en meses cuenta cambios
+    de mes, así que se resta uno si aún no se llega al mismo día del mes final.
+    """
+    return {"$max": [0, {"$subtract": [
+        {"$dateDiff": {"startDate": start, "endDate": end, "unit": "month"}},
+        {"$cond": [{"$lt": [{"$dayOfMonth": end}, {"$dayOfMonth": start}]}, 1, 0]},
+    ]}]}
+
+
+def _merged_months(intervals) -> dict:
+    """
+    Meses de la unión de `intervals` ({s, e} ordenados por s): los periodos que se
+    solapan se funden antes de medirlos, así los trabajos simultáneos no se suman dos veces.
+    """
+    merged = {"$reduce": {
+        "input": intervals,
+        "initialValue": {"months": 0, "s": None, "e": None},
+        "in": {"$cond": [
+            {"$and": [{"$ne": ["$$value.e", None]}, {"$lte": ["$$this.s", "$$value.e"]}]},
+            # Se solapa con el periodo en curso: se extiende
+            {"months": "$$value.months", "s": "$$value.s", "e": {"$max": ["$$value.e", "$$this.e"]}},
+            # No se solapa: se cierra el periodo en curso y empieza otro
+            {
+                "months": {"$add": ["$$value.months", {"$cond": [
+                    {"$eq": ["$$value.s", None]}, 0, _whole_months("$$value.s", "$$value.e"),
+                ]}]},
+                "s": "$$this.s",
+                "e": "$$this.e",
+            },
+        ]},
+    }}
+    return {"$let": {"vars": {"acc": merged}, "in": {"$add": ["$$acc.months", {"$cond": [
+        {"$eq": ["$$acc.s", None]}, 0, _whole_months("$$acc.s", "$$acc.e"),
+    ]}]}}}
 
 
 class WorkExperienceRepository(BaseRepository):
-    def __init__(self, collection: AsyncIOMotorCollection):
+    # Índices que se crean al arrancar (ver repositories/indexes.py).
+    # Cubre el filtro por username y el orden (initial_date, _id) descendente
+    # que usan tanto el listado completo como la paginación por cursor.
+    indexes = [IndexModel([("username", 1), ("initial_date", -1), ("_id", -1)])]
+    page_sort = [("initial_date", DESCENDING), ("_id", DESCENDING)]
+
+    def __init__(self, collection: StorageCollection):
         super().__init__(collection)
 
     async def find_by_username(
-        self, username: str
+        self, username: str, projection: Dict | None = None
     ) -> List[Dict]:
         """
         Devuelve todos los documentos de experiencia laboral del usuario,
         ordenados por initial_date descendente.
         """
-        cursor = self.collection.find({"username": username}).sort("initial_date", -1)
+        cursor = self.collection.find({"username": username}, projection, sort=self.page_sort)
         return [doc async for doc in cursor]
 
     async def find_by_id(
-        self, id: Union[str, int]
+        self, id: Union[str, int], projection: Dict | None = None
     ) -> Dict | None:
         """
         Busca un documento por su _id. Acepta legacy (int) o nuevo (str ObjectId).
@@ -30,6 +76,72 @@ class WorkExperienceRepository(BaseRepository):
         else:
             filtro = {"_id": ObjectId(id)}
 
-        return await self.collection.find_one(filtro)
+        return await self.collection.find_one(filtro, projection)
+
+    async def experience_stats(self, username: str, today: date) -> dict:
+        """
+        Estadísticas de experiencia calculadas en MongoDB con una sola agregación:
+        meses totales (uniendo solapamientos), meses por empresa y el trabajo más
+        largo. Solo viaja un documento pequeño con el resultado. Requiere MongoDB 5.0+;
+        los backends sin agregaciones lanzan NotImplementedError.
+
+        Los trabajos abiertos se miden hasta `today`, la misma fecha que usa el
+        cálculo en Python, y no hasta $$NOW.
+        """
+        until = datetime(today.year, today.month, today.day)
+        interval = {"s": "$s", "e": "$e"}
+        pipeline = [
+            {"$match": {"username": username}},
+            {"$project": {
+                "_id": 0,
+                "company": 1,
+                "rol": 1,
+                "s": {"$dateFromString": {"dateString": "$initial_date", "onError": None, "onNull": None}},
+                # Sin end_date (o inválida) el trabajo sigue abierto: se mide hasta hoy
+                "e": {"$ifNull": [
+                    {"$dateFromString": {"dateString": "$end_date", "onError": None, "onNull": None}},
+                    {"$literal": until},
+                ]},
+            }},
+            {"$match": {"s": {"$ne": None}}},
+            {"$sort": {"s": 1}},
+            {"$facet": {
+                "total": [
+                    {"$group": {"_id": None, "intervals": {"$push": interval}}},
+                    {"$project": {"_id": 0, "months": _merged_months("$intervals")}},
+                ],
+                "by_company": [
+                    {"$group": {"_id": "$company", "intervals": {"$push": interval}}},
+                    {"$project": {"_id": 0, "company": "$_id", "months": _merged_months("$intervals")}},
+                    {"$sort": {"months": -1, "company": 1}},
+                ],
+                "longest": [
+                    {"$project": {"company": 1, "rol": 1, "months": _whole_months("$s", "$e")}},
+                    {"$sort": {"months": -1}},
+                    {"$limit": 1},
+                ],
+            }},
+        ]
+        result = await self.collection.aggregate(pipeline)
+        facets = result[0] if result else {}
+        total = facets.get("total") or [{"months": 0}]
+        longest = facets.get("longest") or [None]
+        return {
+            "total_months": total[0]["months"],
+            "by_company": facets.get("by_company", []),
+            "longest": longest[0],
+        }
+
+    async def iter_durations_to_refresh(self) -> AsyncIterator[Dict]:
+        """
+        Documentos cuya duración guardada puede estar desactualizada: trabajos sin
+        end_date y documentos que aún no tienen `duration_months`.
+        """
+        query = {"$or": [{"end_date": None}, {"duration_months": {"$exists": False}}]}
+        projection = {"username": 1, "initial_date": 1, "end_date": 1, "duration": 1, "duration_months": 1}
+        async for doc in self.collection.find(query, projection):
+            yield doc
 
-    
+    async def set_fields(self, updates: List[Tuple[Any, Dict]]) -> None:
+        """Aplica varios $set por _id en una sola operación."""
+        await self.collection.bulk_set(updates)
@@ -0,0 +1,62 @@
+from repositories.base_repository import BaseRepository
+from services.snapshot_service import notify_write
+from models.bulk_model import BulkItemResult, BulkResult
+
+
+async def bulk_import(
+    repo: BaseRepository,
+    collection: str,
+    username: str,
+    docs: list[dict],
+    replace: bool = False,
+    unique_field: str | None = None,
+) -> BulkResult:
+    """
+    Importa un lote de documentos ya validados en pocas consultas:
+    - si hay `unique_field`, los duplicados (contra la base o dentro del lote) se
+      detectan con un solo find $in y se reportan como conflicto;
+    - el resto se inserta con un bulk_write no ordenado;
+    - replace=True elimina después los documentos que el usuario tenía antes del
+      lote, solo si se crearon todos los elementos. Si alguno falla no se borra
+      nada: el usuario conserva sus datos y los creados, y puede corregir los
+      fallidos y repetir el reemplazo (que también sustituye a los ya creados).
+    La caché y el snapshot del CV se actualizan una sola vez por lote.
+
+    `unique_field` es el mismo campo que comprueba la creación individual (title en
+    proyectos y redes sociales, career en educación, certification en
+    certificaciones; ninguno en experiencia laboral).
+    """
+    # Con replace los existentes no cuentan como conflicto: van a ser reemplazados
+    previous_ids = await repo.ids_by_username(username) if replace else []
+
+    results: dict[int, BulkItemResult] = {}
+    if unique_field:
+        values = [doc.get(unique_field) for doc in docs]
+        seen: set = set()
+        if not replace:
+            cursor = repo.collection.find(
+                {"username": username, unique_field: {"$in": values}}, {unique_field: 1}
+            )
+            seen = {doc.get(unique_field) async for doc in cursor}
+        for index, value in enumerate(values):
+            if value in seen:
+                results[index] = BulkItemResult(
+                    index=index, status="conflict", detail=f"Ya existe '{value}'"
+                )
+            seen.add(value)
+
+    pending = [index for index in range(len(docs)) if index not in results]
+    errors = await repo.bulk_create([docs[index] for index in pending])
+    for position, index in enumerate(pending):
+        if position in errors:
+            results[index] = BulkItemResult(index=index, status="error", detail=errors[position])
+        else:
+            results[index] = BulkItemResult(index=index, status="created", id=str(docs[index]["_id"]))
+
+    items = [results[index] for index in range(len(docs))]
+    created = sum(1 for item in items if item.status == "created")
+    failed = len(items) - created
+    deleted = await repo.delete_by_ids(previous_ids, username) if created and not failed else 0
+    if created or deleted:
+        await notify_write(collection, username)
+    return BulkResult(created=created, failed=failed, deleted=deleted, items=items)
@@ -1,46 +1,78 @@
 from datetime import datetime, timezone
-from core.database import mongodb
+from repositories.storage import storage
+from core.cache import cached
+from utils.projection import projection_for
+from utils.pagination import Page
+from utils.serialization import from_db
+from services.snapshot_service import notify_write
+from services.bulk_service import bulk_import
 from repositories.certification_repository import CertificationRepository
 from models.certification_model import (
     CertificationCreate,
     CertificationResponse
 )
+from models.bulk_model import BulkResult
 from exceptions import (
     NotFoundException,
+    ValidationException,
     ConflictException,
     DatabaseException
 )
 
+
+COLLECTION = "certifications"
+
+
 class CertificationService:
     def __init__(self):
         self.repo = None
 
     async def _init_repo(self):
         if not self.repo:
-            coll = await mongodb.get_collection("certifications")
+            coll = await storage.get_collection(COLLECTION)
             self.repo = CertificationRepository(coll)
     
-    async def list_certifications(self, username: str) -> list[CertificationResponse]:
+    @cached(lambda username, limit=None, cursor=None: (COLLECTION, username, "list", limit, cursor))
+    async def list_certifications(
+        self, username: str, limit: int | None = None, cursor: str | None = None
+    ) -> Page[CertificationResponse]:
         await self._init_repo()
         try:
-            existing = await self.repo.collection.find_one({"username": username})
-            if not existing:
-                raise NotFoundException(f"No se encontraron datos para el usuario {username}")
-            docs = await self.repo.find_by_username(username)
-            return [CertificationResponse(**{**d, "id": d.pop("_id")}) for d in docs]
-        except NotFoundException:
+            docs, next_cursor = await self.repo.list_by_username(
+                username, projection=projection_for(CertificationResponse), limit=limit, cursor=cursor
+            )
+            return Page([from_db(CertificationResponse, {**d, "id": d.pop("_id")}) for d in docs], next_cursor)
+        except (NotFoundException, ValidationException):
             raise
         except Exception as e:
             raise DatabaseException("Error listing certifications") from e
         
+    @cached(lambda id, username: (COLLECTION, username, str(id)))
     async def get_certification(self, id: str, username: str) -> CertificationResponse:
         await self._init_repo()
-        doc = await self.repo.find_by_id(id)
+        doc = await self.repo.find_by_id(id, projection_for(CertificationResponse))
         if not doc or doc.get("username") != username:
             raise NotFoundException("Certification not found")
         # convertir un documento MongoDB en un modelo Pydantic que tiene una propiedad id (en lugar de _id).
-        return CertificationResponse(**{**doc, "id": doc.pop("_id")})
+        return from_db(CertificationResponse, {**doc, "id": doc.pop("_id")})
     
+    @cached(lambda username, id=None: (COLLECTION, username, "etag", str(id)))
+    async def get_etag(self, username: str, id: str | None = None) -> str | None:
+        await self._init_repo()
+        return await self.repo.etag_for(username, id)
+
+    @staticmethod
+    def _to_document(payload: CertificationCreate, username: str, now: str) -> dict:
+        data = payload.model_dump()
+        # Convertir HttpUrl a cadena para almacenamiento
+        data['link'] = str(data['link'])
+        data.update({
+            "username": username,
+            "created_at": now,
+            "updated_at": now
+        })
+        return data
+
     async def create_certification(
         self, payload: CertificationCreate, username: str
     ) -> CertificationResponse:
@@ -51,26 +83,31 @@ class CertificationService:
                 raise ConflictException(f"Certification '{payload.certification}' already exists for user {username}")
             
             now = datetime.now(timezone.utc).isoformat()
-            data = payload.model_dump()
-            # Convertir HttpUrl a cadena para almacenamiento
-            data['link'] = str(data['link'])
-            data.update({
-            "username": username,
-            "created_at": now,
-            "updated_at": now
-            })
-            
+            data = self._to_document(payload, username, now)
             created = await self.repo.create(data)
+            await notify_write(COLLECTION, username)
             return CertificationResponse(**{**created, "id": created.pop("_id")})
+        except ConflictException:
+            raise
         except Exception as e:
             raise DatabaseException("Error creating certification") from e
         
+    async def bulk_create_certifications(
+        self, payloads: list[CertificationCreate], username: str, replace: bool = False
+    ) -> BulkResult:
+        await self._init_repo()
+        now = datetime.now(timezone.utc).isoformat()
+        docs = [self._to_document(p, username, now) for p in payloads]
+        return await bulk_import(
+            self.repo, COLLECTION, username, docs, replace, unique_field="certification"
+        )
+
     async def update_certification(
         self, id: str, payload: CertificationCreate, username: str
     ) -> CertificationResponse:
         await self._init_repo()
         try:
-            doc = await self.repo.find_by_id(id)
+            doc = await self.repo.find_by_id(id, {"username": 1})
             if doc.get("username") != username:
                 raise NotFoundException("Certificación no pertenece al usuario autenticado")
             
@@ -84,6 +121,7 @@ class CertificationService:
             })
             
             updated = await self.repo.update(id, data)
+            await notify_write(COLLECTION, username)
             return CertificationResponse(**{**updated, "id": updated.pop("_id")})
         except NotFoundException:
             raise
@@ -93,11 +131,12 @@ class CertificationService:
     async def delete_certification(self, id: str, username: str) -> None:
         await self._init_repo()
         try:
-            doc = await self.repo.find_by_id(id)
+            doc = await self.repo.find_by_id(id, {"username": 1})
             if not doc or doc.get("username") != username:
                 raise NotFoundException("Certificación no pertenece al usuario autenticado o no existe")
             
             await self.repo.delete(id)
+            await notify_write(COLLECTION, username)
         except NotFoundException:
             raise
         except Exception as e:
@@ -1,5 +1,10 @@
 from datetime import datetime, timezone
-from core.database import mongodb
+from repositories.storage import storage
+from core.cache import cached
+from utils.projection import projection_for
+from utils.pagination import Page
+from utils.serialization import from_db
+from services.snapshot_service import notify_write
 from repositories.contact_repository import ContactRepository
 from models.contact_model import (
     ContactCreate,
@@ -7,32 +12,44 @@ from models.contact_model import (
 )
 from exceptions import (
     NotFoundException,
+    ValidationException,
     ConflictException,
     DatabaseException
 )
 
+
+COLLECTION = "contact"
+
+
 class ContactService:
     def __init__(self):
         self.repo = None
 
     async def _init_repo(self):
         if not self.repo:
-            coll = await mongodb.get_collection("contact")
+            coll = await storage.get_collection(COLLECTION)
             self.repo = ContactRepository(coll)
             
-    async def list_contact(self, username: str) -> list[ContactResponse]:
+    @cached(lambda username, limit=None, cursor=None: (COLLECTION, username, "list", limit, cursor))
+    async def list_contact(
+        self, username: str, limit: int | None = None, cursor: str | None = None
+    ) -> Page[ContactResponse]:
         await self._init_repo()
         try:
-            existing = await self.repo.collection.find_one({"username": username})
-            if not existing:
-                raise NotFoundException(f"No se encontraron datos para el usuario {username}")
-            docs = await self.repo.find_by_username(username)
-            return [ContactResponse(**{**d, "id": d.pop("_id")}) for d in docs]
-        except NotFoundException:
+            docs, next_cursor = await self.repo.list_by_username(
+                username, projection=projection_for(ContactResponse), limit=limit, cursor=cursor
+            )
+            return Page([from_db(ContactResponse, {**d, "id": d.pop("_id")}) for d in docs], next_cursor)
+        except (NotFoundException, ValidationException):
             raise
         except Exception as e:
             raise DatabaseException("Error listing contact") from e
         
+    @cached(lambda username, id=None: (COLLECTION, username, "etag", str(id)))
+    async def get_etag(self, username: str, id: str | None = None) -> str | None:
+        await self._init_repo()
+        return await self.repo.etag_for(username, id)
+
     async def create_contact(
         self, payload: ContactCreate, username: str
     ) -> ContactResponse:
@@ -52,6 +69,7 @@ class ContactService:
             })
             
             created = await self.repo.create(data)
+            await notify_write(COLLECTION, username)
             return ContactResponse(**{**created, "id": created.pop("_id")})
         except Exception as e:
             raise DatabaseException("Error creating contact") from e
@@ -61,7 +79,7 @@ class ContactService:
     ) -> ContactResponse:
         await self._init_repo()
         try:
-            doc = await self.repo.find_by_id(id)
+            doc = await self.repo.find_by_id(id, {"username": 1})
             if doc.get("username") != username:
                 raise NotFoundException("Contacto no pertenece al usuario autenticado")
             
@@ -73,6 +91,7 @@ class ContactService:
             })
             
             updated = await self.repo.update(id, data)
+            await notify_write(COLLECTION, username)
             return ContactResponse(**{**updated, "id": updated.pop("_id")})
         except NotFoundException:
             raise
@@ -82,11 +101,12 @@ class ContactService:
     async def delete_contact(self, id: str, username: str) -> None:
         await self._init_repo()
         try:
-            doc = await self.repo.find_by_id(id)
+            doc = await self.repo.find_by_id(id, {"username": 1})
             if not doc or doc.get("username") != username:
                 raise NotFoundException("Contacto no pertenece al usuario autenticado o no existe")
             
             await self.repo.delete(id)
+            await notify_write(COLLECTION, username)
         except NotFoundException:
             raise
         except Exception as e:
@@ -0,0 +1,103 @@
+import asyncio
+from typing import Awaitable, TypeVar
+from services.profile_service import ProfileService
+from services.project_service import ProjectService
+from services.work_experience_service import WorkExperienceService
+from services.education_service import EducationService
+from services.certification_service import CertificationService
+from services.contact_service import ContactService
+from services.social_network_service import SocialNetworkService
+from services.snapshot_service import snapshot_service, COLLECTION as SNAPSHOT_COLLECTION
+from models.cv_model import CVResponse
+from core.cache import cached
+from utils.pagination import Page
+from exceptions import NotFoundException
+
+T = TypeVar("T")
+
+
+class CVService:
+    """
+    Arma el CV completo de un usuario reutilizando los servicios de cada sección.
+    Las siete colecciones se consultan en paralelo, de modo que la latencia total
+    es la de la consulta más lenta y no la suma de todas.
+    """
+
+    def __init__(self):
+        self.profile_service = ProfileService()
+        self.project_service = ProjectService()
+        self.work_experience_service = WorkExperienceService()
+        self.education_service = EducationService()
+        self.certification_service = CertificationService()
+        self.contact_service = ContactService()
+        self.social_network_service = SocialNetworkService()
+
+    @staticmethod
+    async def _section(coro: Awaitable[Page[T]]) -> list[T]:
+        # Una sección sin datos se devuelve como lista vacía en lugar de 404
+        try:
+            return (await coro).items
+        except NotFoundException:
+            return []
+
+    @staticmethod
+    def is_empty(cv: CVResponse) -> bool:
+        return not any((
+            cv.profile,
+            cv.projects,
+            cv.work_experience,
+            cv.education,
+            cv.certifications,
+            cv.contact,
+            cv.social_networks,
+        ))
+
+    @cached(lambda username: (SNAPSHOT_COLLECTION, username, "etag"))
+    async def get_etag(self, username: str) -> str | None:
+        return await snapshot_service.get_etag(username)
+
+    @cached(lambda username: (SNAPSHOT_COLLECTION, username))
+    async def get_cv(self, username: str) -> CVResponse:
+        """
+        Sirve el CV desde el snapshot materializado. Si no existe (o es de otro día)
+        se arma en vivo y se guarda para las siguientes lecturas.
+        """
+        cv = await snapshot_service.get_snapshot(username)
+        if cv is not None:
+            return cv
+        # Con el lock del usuario, para no pisar el snapshot de una escritura concurrente
+        return await snapshot_service.build_and_save(username)
+
+    async def build_cv(self, username: str) -> CVResponse:
+        (
+            profile,
+            projects,
+            work_experience,
+            education,
+            certifications,
+            contact,
+            social_networks,
+            work_stats,
+        ) = await asyncio.gather(
+            self._section(self.profile_service.list_profiles(username)),
+            self._section(self.project_service.list_projects(username)),
+            self._section(self.work_experience_service.list_WorkExperience(username)),
+            self._section(self.education_service.list_education(username)),
+            self._section(self.certification_service.list_certifications(username)),
+            self._section(self.contact_service.list_contact(username)),
+            self._section(self.social_network_service.list_social_networks(username)),
+            # Total sin contar dos veces los trabajos simultáneos, calculado en MongoDB
+            self.work_experience_service.get_stats(username),
+        )
+
+        return CVResponse(
+            username=username,
+            profile=profile,
+            projects=projects,
+            work_experience=work_experience,
+            education=education,
+            certifications=certifications,
+            contact=contact,
+            social_networks=social_networks,
+            total_years=round(work_stats.total_months / 12),
+        )
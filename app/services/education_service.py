@@ -1,75 +1,109 @@
 from datetime import datetime, timezone
-from core.database import mongodb
+from repositories.storage import storage
+from core.cache import cached
+from utils.projection import projection_for
+from utils.pagination import Page
+from utils.serialization import from_db
+from services.snapshot_service import notify_write
+from services.bulk_service import bulk_import
 from repositories.education_repository import EducationRepository
 from models.education_model import (
     EducationCreate,
     EducationResponse
 )
+from models.bulk_model import BulkResult
 from exceptions import (
     NotFoundException,
+    ValidationException,
     ConflictException,
     DatabaseException
 )
 
+
+COLLECTION = "education"
+
+
 class EducationService:
     def __init__(self):
         self.repo = None
 
     async def _init_repo(self):
         if not self.repo:
-            coll = await mongodb.get_collection("education")
+            coll = await storage.get_collection(COLLECTION)
             self.repo = EducationRepository(coll)
             
-    async def list_education(self, username: str) -> list[EducationResponse]:
+    @cached(lambda username, limit=None, cursor=None: (COLLECTION, username, "list", limit, cursor))
+    async def list_education(
+        self, username: str, limit: int | None = None, cursor: str | None = None
+    ) -> Page[EducationResponse]:
         await self._init_repo()
         try:
-            existing = await self.repo.collection.find_one({"username": username})
-            if not existing:
-                raise NotFoundException(f"No se encontraron datos para el usuario {username}")
-            docs = await self.repo.find_by_username(username)
-            return [EducationResponse(**{**d, "id": d.pop("_id")}) for d in docs]
-        except NotFoundException:
+            docs, next_cursor = await self.repo.list_by_username(
+                username, projection=projection_for(EducationResponse), limit=limit, cursor=cursor
+            )
+            return Page([from_db(EducationResponse, {**d, "id": d.pop("_id")}) for d in docs], next_cursor)
+        except (NotFoundException, ValidationException):
             raise
         except Exception as e:
             raise DatabaseException("Error listing education") from e
     
+    @cached(lambda id, username: (COLLECTION, username, str(id)))
     async def get_education(self, id: str, username: str) -> EducationResponse:
         await self._init_repo()
-        doc = await self.repo.find_by_id(id)
+        doc = await self.repo.find_by_id(id, projection_for(EducationResponse))
         if not doc or doc.get("username") != username:
             raise NotFoundException("Education not found")
         # convertir un documento MongoDB en un modelo Pydantic que tiene una propiedad id (en lugar de _id).
-        return EducationResponse(**{**doc, "id": doc.pop("_id")})
+        return from_db(EducationResponse, {**doc, "id": doc.pop("_id")})
         
+    @cached(lambda username, id=None: (COLLECTION, username, "etag", str(id)))
+    async def get_etag(self, username: str, id: str | None = None) -> str | None:
+        await self._init_repo()
+        return await self.repo.etag_for(username, id)
+
+    @staticmethod
+    def _to_document(payload: EducationCreate, username: str, now: str) -> dict:
+        data = payload.model_dump()
+        data.update({
+            "username": username,
+            "created_at": now,
+            "updated_at": now
+        })
+        return data
+
     async def create_education(
         self, payload: EducationCreate, username: str
     ) -> EducationResponse:
         await self._init_repo()
         try:
-            existing = await self.repo.collection.find_one({"education": payload.career, "username": username})
+            existing = await self.repo.collection.find_one({"career": payload.career, "username": username})
             if existing:
                 raise ConflictException(f"Education '{payload.career}' already exists for user {username}")
             
             now = datetime.now(timezone.utc).isoformat()
-            data = payload.model_dump()
-            
-            data.update({
-            "username": username,
-            "created_at": now,
-            "updated_at": now
-            })
-            
+            data = self._to_document(payload, username, now)
             created = await self.repo.create(data)
+            await notify_write(COLLECTION, username)
             return EducationResponse(**{**created, "id": created.pop("_id")})
+        except ConflictException:
+            raise
         except Exception as e:
             raise DatabaseException("Error creating education") from e
         
+    async def bulk_create_education(
+        self, payloads: list[EducationCreate], username: str, replace: bool = False
+    ) -> BulkResult:
+        await self._init_repo()
+        now = datetime.now(timezone.utc).isoformat()
+        docs = [self._to_document(p, username, now) for p in payloads]
+        return await bulk_import(self.repo, COLLECTION, username, docs, replace, unique_field="career")
+
     async def update_education(
         self, id: str, payload: EducationCreate, username: str
     ) -> EducationResponse:
         await self._init_repo()
         try:
-            doc = await self.repo.find_by_id(id)
+            doc = await self.repo.find_by_id(id, {"username": 1})
             if doc.get("username") != username:
                 raise NotFoundException("Education no pertenece al usuario autenticado")
             
@@ -81,6 +115,7 @@ class EducationService:
             })
             
             updated = await self.repo.update(id, data)
+            await notify_write(COLLECTION, username)
             return EducationResponse(**{**updated, "id": updated.pop("_id")})
         except NotFoundException:
             raise
@@ -90,11 +125,12 @@ class EducationService:
     async def delete_education(self, id: str, username: str) -> None:
         await self._init_repo()
         try:
-            doc = await self.repo.find_by_id(id)
+            doc = await self.repo.find_by_id(id, {"username": 1})
             if not doc or doc.get("username") != username:
                 raise NotFoundException("Education no pertenece al usuario autenticado o no existe")
             
             await self.repo.delete(id)
+            await notify_write(COLLECTION, username)
         except NotFoundException:
             raise
         except Exception as e:
@@ -0,0 +1,56 @@
+import logging
+from typing import AsyncIterator
+from bson import json_util
+from bson.json_util import RELAXED_JSON_OPTIONS
+from core.config import settings
+from repositories.storage import storage
+from repositories.indexes import INDEX_REGISTRY
+from services.snapshot_service import SECTION_COLLECTIONS
+
+logger = logging.getLogger(__name__)
+
+# Tamaño aproximado de cada trozo enviado al cliente
+CHUNK_BYTES = 64 * 1024
+
+
+class ExportService:
+    """
+    Exporta todos los documentos de un usuario en las siete colecciones del CV como
+    NDJSON: una línea por documento con la forma {"collection": ..., "document": ...}.
+    Los documentos se leen en lotes del cursor y se escriben a medida que llegan,
+    así la memoria no crece con el volumen de datos del usuario.
+    """
+
+    def __init__(self, batch_size: int | None = None):
+        self.batch_size = batch_size or settings.EXPORT_BATCH_SIZE
+
+    @staticmethod
+    def encode(collection: str, doc: dict) -> bytes:
+        # Extended JSON relajado: conserva ObjectId y fechas sin perder legibilidad
+        line = json_util.dumps(
+            {"collection": collection, "document": doc},
+            json_options=RELAXED_JSON_OPTIONS,
+            ensure_ascii=False,
+        )
+        return line.encode() + b"\n"
+
+    async def stream(self, username: str) -> AsyncIterator[bytes]:
+        buffer = bytearray()
+        for name in SECTION_COLLECTIONS:
+            repo = INDEX_REGISTRY[name](await storage.get_collection(name))
+            try:
+                async for doc in repo.iter_by_username(username, self.batch_size):
+                    buffer += self.encode(name, doc)
+                    if len(buffer) >= CHUNK_BYTES:
+                        yield bytes(buffer)
+                        buffer.clear()
+            except Exception:
+                # Con la respuesta ya iniciada no se puede cambiar el status: se corta
+                # el stream y el cliente detecta la exportación incompleta.
+                logger.exception("Error exportando %s de %s", name, username)
+                raise
+        if buffer:
+            yield bytes(buffer)
+
+
+export_service = ExportService()
@@ -1,5 +1,10 @@
 from datetime import datetime, timezone
-from core.database import mongodb
+from repositories.storage import storage
+from core.cache import cached
+from utils.projection import projection_for
+from utils.pagination import Page
+from utils.serialization import from_db
+from services.snapshot_service import notify_write
 from repositories.profile_repository import ProfileRepository
 from models.profile_model import (
     ProfileCreate,
@@ -7,32 +12,44 @@ from models.profile_model import (
 )
 from exceptions import (
     NotFoundException,
+    ValidationException,
     ConflictException,
     DatabaseException
 )
 
+
+COLLECTION = "perfil"
+
+
 class ProfileService:
     def __init__(self):
         self.repo = None
 
     async def _init_repo(self):
         if not self.repo:
-            coll = await mongodb.get_collection("perfil")
+            coll = await storage.get_collection(COLLECTION)
             self.repo = ProfileRepository(coll)
     
-    async def list_profiles(self, username: str) -> list[ProfileResponse]:
+    @cached(lambda username, limit=None, cursor=None: (COLLECTION, username, "list", limit, cursor))
+    async def list_profiles(
+        self, username: str, limit: int | None = None, cursor: str | None = None
+    ) -> Page[ProfileResponse]:
         await self._init_repo()
         try:
-            existing = await self.repo.collection.find_one({"username": username})
-            if not existing:
-                raise NotFoundException(f"No se encontraron datos para el usuario {username}")
-            docs = await self.repo.find_by_username(username)
-            return [ProfileResponse(**{**d, "id": d.pop("_id")}) for d in docs]
-        except NotFoundException:
+            docs, next_cursor = await self.repo.list_by_username(
+                username, projection=projection_for(ProfileResponse), limit=limit, cursor=cursor
+            )
+            return Page([from_db(ProfileResponse, {**d, "id": d.pop("_id")}) for d in docs], next_cursor)
+        except (NotFoundException, ValidationException):
             raise
         except Exception as e:
             raise DatabaseException(f"Error listing profile: {e}") from e
          
+    @cached(lambda username, id=None: (COLLECTION, username, "etag", str(id)))
+    async def get_etag(self, username: str, id: str | None = None) -> str | None:
+        await self._init_repo()
+        return await self.repo.etag_for(username, id)
+
     async def create_profile(
         self, payload: ProfileCreate, username: str
     ) -> ProfileResponse:
@@ -55,6 +72,7 @@ class ProfileService:
             })
             
             created = await self.repo.create(data)
+            await notify_write(COLLECTION, username)
             return ProfileResponse(**{**created, "id": created.pop("_id")})
         except Exception as e:
             raise DatabaseException("Error creating profile") from e
@@ -64,7 +82,7 @@ class ProfileService:
     ) -> ProfileResponse:
         await self._init_repo()
         try:
-            doc = await self.repo.find_by_id(id)
+            doc = await self.repo.find_by_id(id, {"username": 1})
             if doc.get("username") != username:
                 raise NotFoundException("Profile no pertenece al usuario autenticado")
             
@@ -78,6 +96,7 @@ class ProfileService:
             })
             
             updated = await self.repo.update(id, data)
+            await notify_write(COLLECTION, username)
             return ProfileResponse(**{**updated, "id": updated.pop("_id")})
         except NotFoundException:
             raise
@@ -87,37 +106,49 @@ class ProfileService:
     async def delete_profile(self, id: str, username: str) -> None:
         await self._init_repo()
         try:
-            doc = await self.repo.find_by_id(id)
+            doc = await self.repo.find_by_id(id, {"username": 1})
             if not doc or doc.get("username") != username:
                 raise NotFoundException("Profile no pertenece al usuario autenticado o no existe")
             
             await self.repo.delete(id)
+            await notify_write(COLLECTION, username)
         except NotFoundException:
             raise
         except Exception as e:
             raise DatabaseException("Error deleting profile") from e
         
     # ----------------------------
-    # Skills: add_skill y remove_skill
+    # Skills: una o varias por operación
     # ----------------------------
-    async def add_skill(self, skill: str, username: str) -> dict:
+    async def add_skills(self, skills: list[str], username: str) -> dict:
         await self._init_repo()
         try:
-            result = await self.repo.add_skill(skill, username)
+            result = await self.repo.add_skills(skills, username)
+            if result["added"]:
+                await notify_write(COLLECTION, username)
             return result
         except NotFoundException:
             # Si no existe ningún documento con ese username
             raise NotFoundException(f"No se encontró ningún perfil para el usuario '{username}'")
         except Exception as e:
-            raise DatabaseException(f"Error agregando habilidad: {str(e)}") from e
+            raise DatabaseException(f"Error agregando habilidades: {str(e)}") from e
 
-    async def remove_skill(self, skill: str, username: str) -> dict:
+    async def remove_skills(self, skills: list[str], username: str) -> dict:
         await self._init_repo()
         try:
-            result = await self.repo.remove_skill(skill, username)
+            result = await self.repo.remove_skills(skills, username)
+            await notify_write(COLLECTION, username)
             return result
         except NotFoundException:
-            # Si la habilidad no existe en el perfil o no hay perfil
+            # Si las habilidades no existen en el perfil o no hay perfil
             raise
         except Exception as e:
-            raise DatabaseException(f"Error removiendo habilidad: {str(e)}") from e
\ No newline at end of file
+            raise DatabaseException(f"Error removiendo habilidades: {str(e)}") from e
+
+    async def add_skill(self, skill: str, username: str) -> dict:
+        await self.add_skills([skill], username)
+        return {"message": "Habilidad agregada exitosamente"}
+
+    async def remove_skill(self, skill: str, username: str) -> dict:
+        await self.remove_skills([skill], username)
+        return {"message": "Habilidad removida exitosamente"}
@@ -1,79 +1,114 @@
 from datetime import datetime, timezone
-from core.database import mongodb
+from repositories.storage import storage
+from core.cache import cached
+from utils.projection import projection_for
+from utils.pagination import Page
+from utils.serialization import from_db
+from services.snapshot_service import notify_write
+from services.bulk_service import bulk_import
 from repositories.project_repository import ProjectRepository
 from models.project_model import (
     ProjectCreate,
     ProjectResponse
 )
+from models.bulk_model import BulkResult
 from exceptions import (
     NotFoundException,
+    ValidationException,
     ConflictException,
     DatabaseException
 )
 
+
+COLLECTION = "projects"
+
+
 class ProjectService:
     def __init__(self):
         self.repo = None
 
     async def _init_repo(self):
         if not self.repo:
-            coll = await mongodb.get_collection("projects")
+            coll = await storage.get_collection(COLLECTION)
             self.repo = ProjectRepository(coll)
     
-    async def list_projects(self, username: str) -> list[ProjectResponse]:
+    @cached(lambda username, limit=None, cursor=None: (COLLECTION, username, "list", limit, cursor))
+    async def list_projects(
+        self, username: str, limit: int | None = None, cursor: str | None = None
+    ) -> Page[ProjectResponse]:
         await self._init_repo()
         try:
-            existing = await self.repo.collection.find_one({"username": username})
-            if not existing:
-                raise NotFoundException(f"No se encontraron datos para el usuario {username}")
-            docs = await self.repo.find_by_username(username)
-            return [ProjectResponse(**{**d, "id": d.pop("_id")}) for d in docs]
-        except NotFoundException:
+            docs, next_cursor = await self.repo.list_by_username(
+                username, projection=projection_for(ProjectResponse), limit=limit, cursor=cursor
+            )
+            return Page([from_db(ProjectResponse, {**d, "id": d.pop("_id")}) for d in docs], next_cursor)
+        except (NotFoundException, ValidationException):
             raise
         except Exception as e:
             raise DatabaseException(f"Error listing project: {e}") from e
         
+    @cached(lambda id, username: (COLLECTION, username, str(id)))
     async def get_project(self, id: str, username: str) -> ProjectResponse:
         await self._init_repo()
-        doc = await self.repo.find_by_id(id)
+        doc = await self.repo.find_by_id(id, projection_for(ProjectResponse))
         if not doc or doc.get("username") != username:
             raise NotFoundException("Project not found")
         # convertir un documento MongoDB en un modelo Pydantic que tiene una propiedad id (en lugar de _id).
-        return ProjectResponse(**{**doc, "id": doc.pop("_id")})
+        return from_db(ProjectResponse, {**doc, "id": doc.pop("_id")})
          
+    @cached(lambda username, id=None: (COLLECTION, username, "etag", str(id)))
+    async def get_etag(self, username: str, id: str | None = None) -> str | None:
+        await self._init_repo()
+        return await self.repo.etag_for(username, id)
+
+    @staticmethod
+    def _to_document(payload: ProjectCreate, username: str, now: str) -> dict:
+        data = payload.model_dump()
+        # Convertir HttpUrl a cadena para almacenamiento
+        data['link'] = str(data['link']) if data.get('link') else None
+        data['image'] = str(data['image'])
+        if data.get("stack") is None:
+            data["stack"] = []
+        data.update({
+            "username": username,
+            "created_at": now,
+            "updated_at": now
+        })
+        return data
+
     async def create_project(
         self, payload: ProjectCreate, username: str
     ) -> ProjectResponse:
         await self._init_repo()
         try:
-            existing = await self.repo.collection.find_one({"project": payload.title, "username": username})
+            existing = await self.repo.collection.find_one({"title": payload.title, "username": username})
             if existing:
                 raise ConflictException(f"Project '{payload.title}' already exists for user {username}")
             
             now = datetime.now(timezone.utc).isoformat()
-            data = payload.model_dump()
-            # Convertir HttpUrl a cadena para almacenamiento
-            data['link'] = str(data['link'])
-            data['image'] = str(data['image'])
-            if data.get("stack") is None:
-                data["stack"] = []
-            data.update({
-            "username": username,
-            "created_at": now,
-            "updated_at": now
-            })
-            
+            data = self._to_document(payload, username, now)
             created = await self.repo.create(data)
+            await notify_write(COLLECTION, username)
             return ProjectResponse(**{**created, "id": created.pop("_id")})
+        except ConflictException:
+            raise
         except Exception as e:
             raise DatabaseException("Error creating project") from e
         
+    async def bulk_create_projects(
+        self, payloads: list[ProjectCreate], username: str, replace: bool = False
+    ) -> BulkResult:
+        await self._init_repo()
+        now = datetime.now(timezone.utc).isoformat()
+        docs = [self._to_document(p, username, now) for p in payloads]
+        return await bulk_import(self.repo, COLLECTION, username, docs, replace, unique_field="title")
+
     async def update_project(
         self, id: str, payload: ProjectCreate, username: str
     ) -> ProjectResponse:
         await self._init_repo()
         try:
-            doc = await self.repo.find_by_id(id)
+            doc = await self.repo.find_by_id(id, {"username": 1})
             if doc.get("username") != username:
                 raise NotFoundException("Project no pertenece al usuario autenticado")
             
@@ -89,6 +124,7 @@ class ProjectService:
             })
             
             updated = await self.repo.update(id, data)
+            await notify_write(COLLECTION, username)
             return ProjectResponse(**{**updated, "id": updated.pop("_id")})
         except NotFoundException:
             raise
@@ -98,11 +134,12 @@ class ProjectService:
     async def delete_project(self, id: str, username: str) -> None:
         await self._init_repo()
         try:
-            doc = await self.repo.find_by_id(id)
+            doc = await self.repo.find_by_id(id, {"username": 1})
             if not doc or doc.get("username") != username:
                 raise NotFoundException("Project no pertenece al usuario autenticado o no existe")
             
             await self.repo.delete(id)
+            await notify_write(COLLECTION, username)
         except NotFoundException:
             raise
         except Exception as e:
@@ -111,34 +148,45 @@ class ProjectService:
     # ----------------------------
     # Métodos para agregar y remover skills en el stack
     # ----------------------------
-    async def add_skill(self, skill: str, id: str, username: str) -> dict:
+    async def add_skills(self, skills: list[str], id: str, username: str) -> dict:
         """
-        Agrega una habilidad al stack del proyecto indicado.
+        Agrega varias habilidades al stack del proyecto indicado en una sola operación.
         'id' puede ser string (ObjectId) o int (legacy).
         """
         await self._init_repo()
         try:
-            result = await self.repo.add_skill(skill, id, username)
+            result = await self.repo.add_skills(skills, id, username)
+            if result["added"]:
+                await notify_write(COLLECTION, username)
             return result
         except NotFoundException:
             raise
         except DatabaseException:
             raise
         except Exception as e:
-            raise DatabaseException(f"Error agregando habilidad: {str(e)}") from e
+            raise DatabaseException(f"Error agregando habilidades: {str(e)}") from e
 
-    async def remove_skill(self, skill: str, id: str, username: str) -> dict:
+    async def remove_skills(self, skills: list[str], id: str, username: str) -> dict:
         """
-        Remueve una habilidad del stack del proyecto indicado.
+        Remueve varias habilidades del stack del proyecto indicado en una sola operación.
         'id' puede ser string (ObjectId) o int (legacy).
         """
         await self._init_repo()
         try:
-            result = await self.repo.remove_skill(skill, id, username)
+            result = await self.repo.remove_skills(skills, id, username)
+            await notify_write(COLLECTION, username)
             return result
         except NotFoundException:
             raise
         except DatabaseException:
             raise
         except Exception as e:
-            raise DatabaseException(f"Error removiendo habilidad: {str(e)}") from e
\ No newline at end of file
+            raise DatabaseException(f"Error removiendo habilidades: {str(e)}") from e
+
+    async def add_skill(self, skill: str, id: str, username: str) -> dict:
+        await self.add_skills([skill], id, username)
+        return {"message": "Habilidad agregada exitosamente"}
+
+    async def remove_skill(self, skill: str, id: str, username: str) -> dict:
+        await self.remove_skills([skill], id, username)
+        return {"message": "Habilidad removida exitosamente"}
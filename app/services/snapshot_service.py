@@ -0,0 +1,161 @@
+import asyncio
+import logging
+from contextlib import asynccontextmanager
+from datetime import datetime, timezone
+from core.cache import fresh_reads, response_cache, stale_responses
+from repositories.storage import storage
+from repositories.snapshot_repository import SnapshotRepository
+from models.cv_model import CVResponse
+from utils.serialization import from_db
+
+logger = logging.getLogger(__name__)
+
+COLLECTION = "cv_snapshots"
+
+# Colecciones que forman el CV de un usuario
+SECTION_COLLECTIONS = (
+    "perfil",
+    "projects",
+    "work_experience",
+    "education",
+    "certifications",
+    "contact",
+    "social_networks",
+)
+
+
+class SnapshotService:
+    """
+    Mantiene en `cv_snapshots` un documento por usuario con el CV público ya armado
+    y validado. Se reconstruye en cada escritura de una sección y las lecturas
+    públicas del CV lo sirven con un único find_one por username.
+
+    Las reconstrucciones de un mismo usuario se serializan: si dos escrituras
+    concurrentes terminaran en otro orden, el snapshot más viejo pisaría al nuevo
+    y se serviría (con su ETag) hasta la siguiente escritura.
+    """
+
+    def __init__(self):
+        self.repo = None
+        # username -> [lock, reconstrucciones en curso o en espera]
+        self._locks: dict[str, list] = {}
+
+    @asynccontextmanager
+    async def _user_lock(self, username: str):
+        entry = self._locks.get(username)
+        if entry is None:
+            entry = self._locks[username] = [asyncio.Lock(), 0]
+        entry[1] += 1
+        try:
+            async with entry[0]:
+                yield
+        finally:
+            entry[1] -= 1
+            if entry[1] == 0:
+                del self._locks[username]
+
+    async def _init_repo(self):
+        if not self.repo:
+            coll = await storage.get_collection(COLLECTION)
+            self.repo = SnapshotRepository(coll)
+
+    async def get_snapshot(self, username: str) -> CVResponse | None:
+        """
+        Devuelve el snapshot del usuario o None si no existe. Un snapshot construido
+        otro día también se considera ausente, porque las duraciones de los trabajos
+        actuales y el total de años dependen de la fecha.
+        """
+        await self._init_repo()
+        doc = await self.repo.find_snapshot(username)
+        if not doc:
+            return None
+        built_at = doc.pop("built_at", None)
+        doc.pop("updated_at", None)
+        today = datetime.now(timezone.utc).date().isoformat()
+        if not built_at or not built_at.startswith(today):
+            return None
+        return from_db(CVResponse, doc)
+
+    async def save(self, cv: CVResponse) -> None:
+        await self._init_repo()
+        now = datetime.now(timezone.utc).isoformat()
+        # Las secciones pueden venir de model_construct (sin validar): sin avisos de tipo
+        data = cv.model_dump(mode="json", warnings=False)
+        data.update({
+            "built_at": now,
+            "updated_at": now
+        })
+        await self.repo.save_snapshot(cv.username, data)
+        response_cache.invalidate(COLLECTION, cv.username)
+
+    async def delete(self, username: str) -> None:
+        await self._init_repo()
+        await self.repo.delete_snapshot(username)
+        response_cache.invalidate(COLLECTION, username)
+
+    async def build_and_save(self, username: str) -> CVResponse:
+        """
+        Arma el CV con los datos actuales y guarda el snapshot (o lo elimina si el
+        usuario ya no tiene datos), con el lock del usuario tomado durante todo el
+        proceso para que el último en guardar sea siempre el último en leer.
+        """
+        # Import diferido: cv_service importa los servicios de sección, que a su vez importan este módulo
+        from services.cv_service import CVService
+
+        async with self._user_lock(username):
+            # Sin copias obsoletas: el snapshot debe reflejar la escritura que lo disparó
+            with fresh_reads():
+                cv = await CVService().build_cv(username)
+            if CVService.is_empty(cv):
+                await self.delete(username)
+            else:
+                await self.save(cv)
+            return cv
+
+    async def rebuild(self, username: str) -> CVResponse | None:
+        """
+        Reconstruye el snapshot con los datos actuales. Si el usuario ya no tiene
+        datos, el snapshot se elimina. Un fallo no interrumpe la escritura que lo
+        disparó: se elimina el snapshot para que la lectura arme el CV en vivo.
+        """
+        from services.cv_service import CVService
+
+        try:
+            cv = await self.build_and_save(username)
+            return None if CVService.is_empty(cv) else cv
+        except Exception as e:
+            logger.error(f"Error reconstruyendo snapshot de {username}: {str(e)}")
+            try:
+                await self.delete(username)
+            except Exception:
+                pass
+            return None
+
+    async def rebuild_all(self) -> int:
+        """Reconstruye el snapshot de todos los usuarios con datos. Devuelve cuántos se procesaron."""
+        usernames: set[str] = set()
+        for name in SECTION_COLLECTIONS:
+            coll = await storage.get_collection(name)
+            usernames.update(u for u in await coll.distinct("username") if u)
+        for username in sorted(usernames):
+            await self.rebuild(username)
+        return len(usernames)
+
+    async def get_etag(self, username: str) -> str | None:
+        await self._init_repo()
+        return await self.repo.etag_for(username)
+
+
+snapshot_service = SnapshotService()
+
+
+async def notify_write(collection: str, username: str) -> None:
+    """
+    Debe llamarse tras cada escritura de una sección: invalida la caché de esa
+    sección y reconstruye el snapshot del CV del usuario. Si la base de datos
+    aceptó la escritura, ya responde: se sale del modo degradado para que las
+    lecturas siguientes no devuelvan datos anteriores a ella.
+    """
+    stale_responses.recovered()
+    response_cache.invalidate(collection, username)
+    await snapshot_service.rebuild(username)
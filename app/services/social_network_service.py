@@ -1,49 +1,65 @@
 from datetime import datetime, timezone
-from core.database import mongodb
+from repositories.storage import storage
+from core.cache import cached
+from utils.projection import projection_for
+from utils.pagination import Page
+from utils.serialization import from_db
+from services.snapshot_service import notify_write
+from services.bulk_service import bulk_import
 from repositories.social_network_repository import SocialNetworkRepository
 from models.social_network_model import (
     SocialNetworkCreate,
     SocialNetworkResponse
 )
+from models.bulk_model import BulkResult
 from exceptions import (
     NotFoundException,
     ConflictException,
     DatabaseException
 )
 
+
+COLLECTION = "social_networks"
+
+
 class SocialNetworkService:
     def __init__(self):
         self.repo = None
 
     async def _init_repo(self):
         if not self.repo:
-            coll = await mongodb.get_collection("social_networks")
+            coll = await storage.get_collection(COLLECTION)
             self.repo = SocialNetworkRepository(coll)
 
-    async def list_social_networks(self, username: str) -> list[SocialNetworkResponse]:
+    @cached(lambda username, limit=None, cursor=None: (COLLECTION, username, "list", limit, cursor))
+    async def list_social_networks(
+        self, username: str, limit: int | None = None, cursor: str | None = None
+    ) -> Page[SocialNetworkResponse]:
         await self._init_repo()
-        existing = await self.repo.collection.find_one({"username": username})
-        if not existing:
-            raise NotFoundException(f"No se encontraron redes sociales para el usuario {username}")
-        docs = await self.repo.find_by_username(username)
-        return [SocialNetworkResponse(**{**d, "id": d.pop("_id")}) for d in docs]
+        docs, next_cursor = await self.repo.list_by_username(
+            username,
+            f"No se encontraron redes sociales para el usuario {username}",
+            projection=projection_for(SocialNetworkResponse),
+            limit=limit,
+            cursor=cursor,
+        )
+        return Page([from_db(SocialNetworkResponse, {**d, "id": d.pop("_id")}) for d in docs], next_cursor)
 
+    @cached(lambda id, username: (COLLECTION, username, str(id)))
     async def get_social_network(self, id: str, username: str) -> SocialNetworkResponse:
         await self._init_repo()
-        doc = await self.repo.find_by_id(id)
+        doc = await self.repo.find_by_id(id, projection_for(SocialNetworkResponse))
         if doc.get("username") != username:
             raise NotFoundException("Social network no pertenece al usuario autenticado")
-        return SocialNetworkResponse(**{**doc, "id": doc.pop("_id")})
+        return from_db(SocialNetworkResponse, {**doc, "id": doc.pop("_id")})
 
-    async def create_social_network(
-        self, payload: SocialNetworkCreate, username: str
-    ) -> SocialNetworkResponse:
+    @cached(lambda username, id=None: (COLLECTION, username, "etag", str(id)))
+    async def get_etag(self, username: str, id: str | None = None) -> str | None:
         await self._init_repo()
-        existing = await self.repo.collection.find_one({"title": payload.title, "username": username})
-        if existing:
-            raise ConflictException(f"Social network '{payload.title}' already exists for user {username}")
+        return await self.repo.etag_for(username, id)
 
-        now = datetime.now(timezone.utc).isoformat()
+    @staticmethod
+    def _to_document(payload: SocialNetworkCreate, username: str, now: str) -> dict:
         data = payload.model_dump()
         # Convertir HttpUrl a cadena para almacenamiento
         data['url'] = str(data['url'])
@@ -52,15 +68,35 @@ class SocialNetworkService:
             "created_at": now,
             "updated_at": now
         })
+        return data
+
+    async def create_social_network(
+        self, payload: SocialNetworkCreate, username: str
+    ) -> SocialNetworkResponse:
+        await self._init_repo()
+        existing = await self.repo.collection.find_one({"title": payload.title, "username": username})
+        if existing:
+            raise ConflictException(f"Social network '{payload.title}' already exists for user {username}")
 
+        now = datetime.now(timezone.utc).isoformat()
+        data = self._to_document(payload, username, now)
         created = await self.repo.create(data)
+        await notify_write(COLLECTION, username)
         return SocialNetworkResponse(**{**created, "id": created.pop("_id")})
 
+    async def bulk_create_social_networks(
+        self, payloads: list[SocialNetworkCreate], username: str, replace: bool = False
+    ) -> BulkResult:
+        await self._init_repo()
+        now = datetime.now(timezone.utc).isoformat()
+        docs = [self._to_document(p, username, now) for p in payloads]
+        return await bulk_import(self.repo, COLLECTION, username, docs, replace, unique_field="title")
+
     async def update_social_network(
         self, id: str, payload: SocialNetworkCreate, username: str
     ) -> SocialNetworkResponse:
         await self._init_repo()
-        doc = await self.repo.find_by_id(id)
+        doc = await self.repo.find_by_id(id, {"username": 1})
         if doc.get("username") != username:
             raise NotFoundException("Social network no pertenece al usuario autenticado")
 
@@ -71,11 +107,13 @@ class SocialNetworkService:
         data["updated_at"] = datetime.now(timezone.utc).isoformat()
 
         updated = await self.repo.update(id, data)
+        await notify_write(COLLECTION, username)
         return SocialNetworkResponse(**{**updated, "id": updated.pop("_id")})
 
     async def delete_social_network(self, id: str, username: str) -> None:
         await self._init_repo()
-        doc = await self.repo.find_by_id(id)
+        doc = await self.repo.find_by_id(id, {"username": 1})
         if doc.get("username") != username:
             raise NotFoundException("Social network no pertenece al usuario autenticado")
-        await self.repo.delete(id)
\ No newline at end of file
+        await self.repo.delete(id)
+        await notify_write(COLLECTION, username)
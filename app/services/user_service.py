@@ -6,7 +6,9 @@ from models.user_model import (
     ResetPasswordModel,
     UserResponseModel,
 )
-from core.database import mongodb
+from repositories.storage import storage
+from core.cache import cached, principal_cache, response_cache, stale_responses
+from utils.projection import projection_for
 from repositories.user_repository import UserRepository
 from utils.hash_and_verify_password import hash_password
 from exceptions import (
@@ -15,8 +17,27 @@ from exceptions import (
     UnauthorizedException,
     ValidationException,
     DatabaseException,
+    ServiceUnavailableException,
 )
 
+COLLECTION = "users"
+# Las lecturas por email se cachean aparte, con el email en lugar del username
+BY_EMAIL = "users_by_email"
+
+
+def _invalidate(username: str, *emails: str | None) -> None:
+    """
+    Invalida las lecturas públicas cacheadas del usuario (por username y por email)
+    tras una escritura, que además muestra que la base de datos vuelve a responder.
+    """
+    stale_responses.recovered()
+    principal_cache.invalidate("principal", username)
+    response_cache.invalidate(COLLECTION, username)
+    for email in emails:
+        if email:
+            response_cache.invalidate(BY_EMAIL, email)
+
+
 class UserService:
     def __init__(self):
         self.repo = None
@@ -24,15 +45,15 @@ class UserService:
     async def _init_repo(self):
         """Inicializa el repositorio de usuarios de forma asíncrona"""
         if self.repo is None:
-            users_collection = await mongodb.get_collection("users")
+            users_collection = await storage.get_collection("users")
             self.repo = UserRepository(users_collection)
 
     async def create_user(self, new_user: UserModel) -> UserResponseModel:
         await self._init_repo()
         try:
-            if await self.repo.find_by_email(new_user.email):
+            if await self.repo.find_by_email(new_user.email, {"_id": 1}):
                 raise ConflictException("Email ya en uso")
-            if await self.repo.find_by_username(new_user.username):
+            if await self.repo.find_by_username(new_user.username, {"_id": 1}):
                 raise ConflictException("Username ya en uso")
 
             now = datetime.now(timezone.utc).isoformat()
@@ -46,17 +67,21 @@ class UserService:
             })
 
             created = await self.repo.create_user(user_data)
+            # Puede haber un ETag vacío cacheado de cuando el usuario no existía
+            _invalidate(new_user.username, new_user.email)
             return UserResponseModel(**{**created, "id": created.pop("_id")})
         
-        except ValidationException:
+        except (ValidationException, ServiceUnavailableException):
             raise
         except Exception as ex:
             raise DatabaseException(str(ex))
 
+    @cached(lambda username: (COLLECTION, username))
     async def get_user(self, username: str) -> UserResponseModel:
         await self._init_repo()
         try:
-            found = await self.repo.find_by_username(username)
+            # Sin contraseña ni secreto: solo los campos de UserResponseModel
+            found = await self.repo.find_by_username(username, projection_for(UserResponseModel))
             if not found:
                 raise NotFoundException("Usuario no encontrado")
             return UserResponseModel(**{**found, "id": found.pop("_id")})
@@ -65,10 +90,11 @@ class UserService:
         except Exception as ex:
             raise DatabaseException(str(ex))
         
+    @cached(lambda email: (BY_EMAIL, email))
     async def get_user_by_email(self, email: EmailStr) -> UserResponseModel:
         await self._init_repo()
         try:
-            found = await self.repo.find_by_email(email)
+            found = await self.repo.find_by_email(email, projection_for(UserResponseModel))
             if not found:
                 raise NotFoundException("Usuario no encontrado")
             return UserResponseModel(**{**found, "id": found.pop("_id")})
@@ -77,6 +103,16 @@ class UserService:
         except Exception as ex:
             raise DatabaseException(str(ex))
 
+    @cached(lambda username: (COLLECTION, username, "etag"))
+    async def get_etag(self, username: str) -> str | None:
+        await self._init_repo()
+        return await self.repo.etag_for(username)
+
+    @cached(lambda email: (BY_EMAIL, email, "etag"))
+    async def get_etag_by_email(self, email: EmailStr) -> str | None:
+        await self._init_repo()
+        return await self.repo.etag_for_email(email)
+
     # Nuevo método para actualizar usuario autenticado
     async def update_authenticated_user(
         self, 
@@ -92,7 +128,7 @@ class UserService:
 
             # Verificar nuevo email si es diferente
             if payload.email and payload.email != existing["email"]:
-                if await self.repo.find_by_email(payload.email):
+                if await self.repo.find_by_email(payload.email, {"_id": 1}):
                     raise ConflictException("Email en uso")
 
             data = payload.model_dump(
@@ -107,9 +143,10 @@ class UserService:
             data["updated_at"] = datetime.now(timezone.utc).isoformat()
 
             updated = await self.repo.update_user(existing["_id"], data)
+            _invalidate(existing["username"], existing.get("email"), data.get("email"))
             return UserResponseModel(**{**updated, "id": updated.pop("_id")})
         
-        except (NotFoundException, ConflictException):
+        except (NotFoundException, ConflictException, ServiceUnavailableException):
             raise
         except Exception as ex:
             raise DatabaseException(str(ex))
@@ -122,6 +159,7 @@ class UserService:
             if not existing:
                 raise NotFoundException("Usuario no existe")
             await self.repo.delete_user(existing["_id"])
+            _invalidate(existing["username"], existing.get("email"))
         except NotFoundException:
             raise
         except Exception as ex:
@@ -137,7 +175,7 @@ class UserService:
 
             # Verificar nuevo email si es diferente
             if payload.email and payload.email != existing["email"]:
-                if await self.repo.find_by_email(payload.email):
+                if await self.repo.find_by_email(payload.email, {"_id": 1}):
                     raise ConflictException("Email en uso")
 
             data = payload.model_dump(
@@ -152,9 +190,10 @@ class UserService:
             data["updated_at"] = datetime.now(timezone.utc).isoformat()
 
             updated = await self.repo.update_user(existing["_id"], data)
+            _invalidate(existing["username"], existing.get("email"), data.get("email"))
             return UserResponseModel(**{**updated, "id": updated.pop("_id")})
         
-        except (NotFoundException, ConflictException):
+        except (NotFoundException, ConflictException, ServiceUnavailableException):
             raise
         except Exception as ex:
             raise DatabaseException(str(ex))
@@ -186,9 +225,10 @@ class UserService:
             data["updated_at"] = datetime.now(timezone.utc).isoformat()
 
             updated = await self.repo.update_user(existing["_id"], data)
+            _invalidate(existing["username"], existing.get("email"), data.get("email"))
             return UserResponseModel(**{**updated, "id": updated.pop("_id")})
         
-        except (NotFoundException, UnauthorizedException):
+        except (NotFoundException, UnauthorizedException, ServiceUnavailableException):
             raise
         except Exception as ex:
             raise DatabaseException(str(ex))
@@ -200,6 +240,7 @@ class UserService:
             if not existing:
                 raise NotFoundException("Usuario no existe")
             await self.repo.delete_user(existing["_id"])
+            _invalidate(existing["username"], existing.get("email"))
         except NotFoundException:
             raise
         except Exception as ex:
@@ -1,16 +1,33 @@
-from datetime import datetime
-from core.database import mongodb
+import logging
+from datetime import date, datetime, timezone
+from pymongo.errors import OperationFailure
+from repositories.storage import storage
+from core.cache import cached
+from utils.projection import projection_for
+from utils.pagination import Page
+from utils.serialization import from_db
+from services.snapshot_service import notify_write
+from services.bulk_service import bulk_import
 from repositories.work_experience_repository import WorkExperienceRepository
 from models.work_experience_model import (
     WorkExperienceCreate,
-    WorkExperienceResponse
+    WorkExperienceResponse,
+    WorkExperienceStats,
+    CompanyExperience,
+    LongestTenure,
 )
+from models.bulk_model import BulkResult
 from exceptions import (
     NotFoundException,
+    ValidationException,
     DatabaseException
 )
 from typing import List, Union
 
+logger = logging.getLogger(__name__)
+
+COLLECTION = "work_experience"
+
 
 class WorkExperienceService:
     def __init__(self):
@@ -18,82 +35,106 @@ class WorkExperienceService:
 
     async def _init_repo(self):
         if not self.repo:
-            coll = await mongodb.get_collection("work_experience")
+            coll = await storage.get_collection(COLLECTION)
             self.repo = WorkExperienceRepository(coll)
 
     # ----------------------------
     # Funciones de cálculo de duración
     # ----------------------------
     @staticmethod
-    def calculate_duration(initial_date: str, end_date: str | None) -> str:
+    def calculate_months(initial_date: str, end_date: str | None, today: date | None = None) -> int:
         """
-        Calcula la duración entre initial_date y end_date en formato:
-        - "X años y Y meses"  
-        - "X años" si meses = 0  
-        - "Y meses" si años = 0  
-        Si end_date es None, usa la fecha actual.
+        Meses calendario completos entre initial_date y end_date (o `today`, por
+        defecto la fecha actual, si end_date es None). Un mes cuenta cuando se
+        alcanza el mismo día del mes siguiente: 2020-01-15 → 2020-03-14 son 1 mes.
         """
-        # Parsear fechas
-        initial_dt = datetime.fromisoformat(initial_date)
-        end_dt = datetime.now() if end_date is None else datetime.fromisoformat(end_date)
-        diff = end_dt - initial_dt
+        start = datetime.fromisoformat(initial_date).date()
+        end = (today or date.today()) if end_date is None else datetime.fromisoformat(end_date).date()
+        return WorkExperienceService._months_between(start, end)
 
-        total_days = diff.days
-        years = total_days // 365
-        months = (total_days % 365) // 30
+    @staticmethod
+    def _months_between(start: date, end: date) -> int:
+        months = (end.year - start.year) * 12 + (end.month - start.month)
+        if end.day < start.day:
+            months -= 1
+        return max(months, 0)
 
+    @staticmethod
+    def format_duration(months: int) -> str:
+        """
+        Formatea una duración en meses como:
+        - "X años y Y meses"
+        - "X años" si meses = 0
+        - "Y meses" si años = 0
+        """
+        years, months = divmod(months, 12)
         if years == 0:
-            return f"{months} meses" if months != 0 else "0 meses"
+            return f"{months} meses"
         if months == 0:
             return f"{years} años"
         años_str = f"{years} año{'s' if years > 1 else ''}"
         meses_str = f"{months} mes{'es' if months > 1 else ''}"
         return f"{años_str} y {meses_str}"
 
-    @staticmethod
-    def calculate_duration_years(initial_date: str, end_date: str | None) -> float:
+    @classmethod
+    def calculate_duration(cls, initial_date: str, end_date: str | None) -> str:
+        """Duración legible entre initial_date y end_date (fecha actual si es None)."""
+        return cls.format_duration(cls.calculate_months(initial_date, end_date))
+
+    @classmethod
+    def calculate_duration_years(cls, initial_date: str, end_date: str | None) -> float:
         """
         Calcula la duración en años (float) entre initial_date y end_date.
         Si end_date es None, usa la fecha actual.
         """
-        initial_dt = datetime.fromisoformat(initial_date)
-        end_dt = datetime.now() if end_date is None else datetime.fromisoformat(end_date)
-        diff = end_dt - initial_dt
-        return diff.days / 365
+        return cls.calculate_months(initial_date, end_date) / 12
+
+    @classmethod
+    def duration_fields(cls, initial_date: str, end_date: str | None, today: date | None = None) -> dict:
+        """Campos de duración que se guardan en el documento al escribirlo."""
+        try:
+            months = cls.calculate_months(initial_date, end_date, today)
+        except (TypeError, ValueError):
+            raise ValidationException(
+                f"Fechas inválidas ({initial_date}, {end_date}): se espera el formato YYYY-MM-DD"
+            )
+        return {"duration": cls.format_duration(months), "duration_months": months}
+
+    @classmethod
+    def _to_response(cls, doc: dict) -> WorkExperienceResponse:
+        raw_id = doc.pop("_id")
+        # Documentos previos a la duración almacenada: se calcula al vuelo
+        duration_str = doc.get("duration") or cls.calculate_duration(doc["initial_date"], doc.get("end_date"))
+        payload = {
+            "id": str(raw_id),
+            "rol": doc.get("rol", ""),
+            "company": doc.get("company", ""),
+            "location": doc.get("location", ""),
+            "activities": doc.get("activities", ""),
+            "initial_date": doc.get("initial_date", ""),
+            "end_date": doc.get("end_date"),
+            "username": doc.get("username"),
+            "duration": duration_str
+        }
+        return from_db(WorkExperienceResponse, payload)
 
     # ----------------------------
     # Listar experiencias con duración
     # ----------------------------
-    async def list_WorkExperience(self, username: str) -> List[WorkExperienceResponse]:
+    @cached(lambda username, limit=None, cursor=None: (COLLECTION, username, "list", limit, cursor))
+    async def list_WorkExperience(
+        self, username: str, limit: int | None = None, cursor: str | None = None
+    ) -> Page[WorkExperienceResponse]:
         await self._init_repo()
         try:
-            # Verificar que exista al menos un documento para el usuario
-            exists = await self.repo.collection.find_one({"username": username})
-            if not exists:
-                raise NotFoundException(f"No se encontraron datos para el usuario {username}")
-
-            docs = await self.repo.find_by_username(username)
-            respuestas: List[WorkExperienceResponse] = []
-
-            for d in docs:
-                raw_id = d.pop("_id")
-                duration_str = self.calculate_duration(d["initial_date"], d.get("end_date"))
-                payload = {
-                    "id": str(raw_id),
-                    "rol": d.get("rol", ""),
-                    "company": d.get("company", ""),
-                    "location": d.get("location", ""),
-                    "activities": d.get("activities", ""),
-                    "initial_date": d.get("initial_date", ""),
-                    "end_date": d.get("end_date"),
-                    "username": d.get("username"),
-                    "duration": duration_str
-                }
-                respuestas.append(WorkExperienceResponse(**payload))
-
-            return respuestas
+            # Una sola consulta: el repositorio lanza NotFoundException si no hay documentos
+            docs, next_cursor = await self.repo.list_by_username(
+                username, projection=projection_for(WorkExperienceResponse), limit=limit, cursor=cursor
+            )
+            # La duración viene guardada en el documento: no se recalcula al leer
+            return Page([self._to_response(d) for d in docs], next_cursor)
 
-        except NotFoundException:
+        except (NotFoundException, ValidationException):
             raise
         except Exception as e:
             raise DatabaseException(f"Error listing WorkExperience: {e}") from e
@@ -101,26 +142,29 @@ class WorkExperienceService:
     # ----------------------------
     # Obtener experiencia por ID con duración
     # ----------------------------
+    @cached(lambda id, username: (COLLECTION, username, str(id)))
     async def get_WorkExperience(self, id: Union[str, int], username: str) -> WorkExperienceResponse:
         await self._init_repo()
-        doc = await self.repo.find_by_id(id)
+        doc = await self.repo.find_by_id(id, projection_for(WorkExperienceResponse))
         if not doc or doc.get("username") != username:
             raise NotFoundException("WorkExperience not found")
+        return self._to_response(doc)
 
-        raw_id = doc.pop("_id")
-        duration_str = self.calculate_duration(doc["initial_date"], doc.get("end_date"))
-        payload = {
-            "id": str(raw_id),
-            "rol": doc.get("rol", ""),
-            "company": doc.get("company", ""),
-            "location": doc.get("location", ""),
-            "activities": doc.get("activities", ""),
-            "initial_date": doc.get("initial_date", ""),
-            "end_date": doc.get("end_date"),
-            "username": doc.get("username"),
-            "duration": duration_str
-        }
-        return WorkExperienceResponse(**payload)
+    @cached(lambda username, id=None: (COLLECTION, username, "etag", str(id)))
+    async def get_etag(self, username: str, id: str | None = None) -> str | None:
+        await self._init_repo()
+        return await self.repo.etag_for(username, id)
+
+    @classmethod
+    def _to_document(cls, payload: WorkExperienceCreate, username: str, now: str) -> dict:
+        data = payload.model_dump()
+        data.update(cls.duration_fields(data["initial_date"], data.get("end_date")))
+        data.update({
+            "username": username,
+            "created_at": now,
+            "updated_at": now
+        })
+        return data
 
     # ----------------------------
     # Crear experiencia laboral
@@ -132,33 +176,27 @@ class WorkExperienceService:
         try:
             # Opcional: puedes chequear duplicados según algún criterio, p.ej. rol + empresa.
             now_iso = datetime.now().isoformat()
-            data = payload.model_dump()
-            data.update({
-                "username": username,
-                "created_at": now_iso,
-                "updated_at": now_iso
-            })
-
+            data = self._to_document(payload, username, now_iso)
             created = await self.repo.create(data)
-            raw_id = created.pop("_id")
-            duration_str = self.calculate_duration(created["initial_date"], created.get("end_date"))
-
-            respuesta = {
-                "id": str(raw_id),
-                "rol": created.get("rol", ""),
-                "company": created.get("company", ""),
-                "location": created.get("location", ""),
-                "activities": created.get("activities", ""),
-                "initial_date": created.get("initial_date", ""),
-                "end_date": created.get("end_date"),
-                "username": created.get("username"),
-                "duration": duration_str
-            }
-            return WorkExperienceResponse(**respuesta)
+            await notify_write(COLLECTION, username)
+            return self._to_response(created)
 
+        except ValidationException:
+            raise
         except Exception as e:
             raise DatabaseException(f"Error creating WorkExperience: {e}") from e
 
+    # ----------------------------
+    # Importación masiva
+    # ----------------------------
+    async def bulk_create_WorkExperience(
+        self, payloads: List[WorkExperienceCreate], username: str, replace: bool = False
+    ) -> BulkResult:
+        await self._init_repo()
+        now_iso = datetime.now().isoformat()
+        docs = [self._to_document(p, username, now_iso) for p in payloads]
+        return await bulk_import(self.repo, COLLECTION, username, docs, replace)
+
     # ----------------------------
     # Actualizar experiencia laboral
     # ----------------------------
@@ -167,31 +205,21 @@ class WorkExperienceService:
     ) -> WorkExperienceResponse:
         await self._init_repo()
         try:
-            doc = await self.repo.find_by_id(id)
+            doc = await self.repo.find_by_id(id, {"username": 1, "initial_date": 1, "end_date": 1})
             if not doc or doc.get("username") != username:
                 raise NotFoundException("WorkExperience no pertenece al usuario autenticado")
 
             data = payload.model_dump(exclude_unset=True)
+            # La duración se recalcula con las fechas resultantes de la actualización
+            dates = {**doc, **data}
+            data.update(self.duration_fields(dates["initial_date"], dates.get("end_date")))
             data["updated_at"] = datetime.now().isoformat()
 
             updated = await self.repo.update(id, data)
-            raw_id = updated.pop("_id")
-            duration_str = self.calculate_duration(updated["initial_date"], updated.get("end_date"))
-
-            respuesta = {
-                "id": str(raw_id),
-                "rol": updated.get("rol", ""),
-                "company": updated.get("company", ""),
-                "location": updated.get("location", ""),
-                "activities": updated.get("activities", ""),
-                "initial_date": updated.get("initial_date", ""),
-                "end_date": updated.get("end_date"),
-                "username": updated.get("username"),
-                "duration": duration_str
-            }
-            return WorkExperienceResponse(**respuesta)
+            await notify_write(COLLECTION, username)
+            return self._to_response(updated)
 
-        except NotFoundException:
+        except (NotFoundException, ValidationException):
             raise
         except Exception as e:
             raise DatabaseException(f"Error updating WorkExperience: {e}") from e
@@ -202,31 +230,139 @@ class WorkExperienceService:
     async def delete_WorkExperience(self, id: Union[str, int], username: str) -> None:
         await self._init_repo()
         try:
-            doc = await self.repo.find_by_id(id)
+            doc = await self.repo.find_by_id(id, {"username": 1})
             if not doc or doc.get("username") != username:
                 raise NotFoundException("WorkExperience no pertenece al usuario autenticado o no existe")
 
             await self.repo.delete(id)
+            await notify_write(COLLECTION, username)
         except NotFoundException:
             raise
         except Exception as e:
             raise DatabaseException(f"Error deleting WorkExperience: {e}") from e
 
     # ----------------------------
-    # Total de años de experiencia laboral
+    # Estadísticas de experiencia laboral
     # ----------------------------
-    async def get_total_work_experience(self, username: str) -> int:
+    @cached(lambda username: (COLLECTION, username, "stats"))
+    async def get_stats(self, username: str) -> WorkExperienceStats:
+        """
+        Total de experiencia (sin contar dos veces los trabajos simultáneos), experiencia
+        por empresa y trabajo más largo, calculados con una agregación en MongoDB.
+        """
         await self._init_repo()
+        # Una sola fecha (UTC, como el snapshot del CV) para la agregación y el cálculo en Python
+        today = datetime.now(timezone.utc).date()
         try:
-            docs = await self.repo.find_by_username(username)
-            if not docs:
-                return 0
-
-            total_years = 0.0
-            for d in docs:
-                total_years += self.calculate_duration_years(
-                    d["initial_date"], d.get("end_date")
-                )
-            return round(total_years)
+            try:
+                raw = await self.repo.experience_stats(username, today)
+            except NotImplementedError as e:
+                # Backend sin agregaciones (memoria): es el camino normal, no un problema
+                logger.debug("Estadísticas de experiencia calculadas en Python: %s", e)
+                raw = await self._stats_in_python(username, today)
+            except OperationFailure as e:
+                # MongoDB < 5.0 (sin $dateDiff)
+                logger.warning("Estadísticas de experiencia calculadas en Python: %s", e)
+                raw = await self._stats_in_python(username, today)
         except Exception as e:
-            raise DatabaseException(f"Error calculating total work experience: {e}") from e
+            raise DatabaseException(f"Error calculating work experience stats: {e}") from e
+
+        longest = raw["longest"]
+        return WorkExperienceStats(
+            total_months=raw["total_months"],
+            total_years=round(raw["total_months"] / 12, 1),
+            by_company=[
+                CompanyExperience(company=c["company"] or "", months=c["months"], years=round(c["months"] / 12, 1))
+                for c in raw["by_company"]
+            ],
+            longest_tenure=LongestTenure(
+                company=longest.get("company") or "",
+                rol=longest.get("rol") or "",
+                months=longest["months"],
+                years=round(longest["months"] / 12, 1),
+            ) if longest else None,
+        )
+
+    async def _stats_in_python(self, username: str, today: date) -> dict:
+        """Mismo cálculo que WorkExperienceRepository.experience_stats, hecho en Python."""
+        docs = await self.repo.find_by_username(
+            username, {"company": 1, "rol": 1, "initial_date": 1, "end_date": 1}
+        )
+        jobs = []
+        for d in docs:
+            try:
+                start = datetime.fromisoformat(d["initial_date"]).date()
+            except (KeyError, TypeError, ValueError):
+                continue
+            try:
+                end = datetime.fromisoformat(d["end_date"]).date()
+            except (KeyError, TypeError, ValueError):
+                end = today
+            jobs.append((start, end, d))
+
+        by_company: dict[str, list] = {}
+        for start, end, d in jobs:
+            by_company.setdefault(d.get("company"), []).append((start, end))
+        longest = max(jobs, key=lambda job: self._months_between(job[0], job[1]), default=None)
+        return {
+            "total_months": self._merged_months([(start, end) for start, end, _ in jobs]),
+            "by_company": sorted(
+                ({"company": company, "months": self._merged_months(intervals)}
+                 for company, intervals in by_company.items()),
+                key=lambda c: (-c["months"], c["company"] or ""),
+            ),
+            "longest": {
+                "company": longest[2].get("company"),
+                "rol": longest[2].get("rol"),
+                "months": self._months_between(longest[0], longest[1]),
+            } if longest else None,
+        }
+
+    @classmethod
+    def _merged_months(cls, intervals: list[tuple[date, date]]) -> int:
+        """Meses de la unión de los intervalos: los que se solapan se funden antes de medirlos."""
+        total = 0
+        current = None
+        for start, end in sorted(intervals):
+            if current and start <= current[1]:
+                current = (current[0], max(current[1], end))
+                continue
+            if current:
+                total += cls._months_between(*current)
+            current = (start, end)
+        if current:
+            total += cls._months_between(*current)
+        return total
+
+    async def get_total_work_experience(self, username: str) -> int:
+        return round((await self.get_stats(username)).total_months / 12)
+
+    # ----------------------------
+    # Refresco diario de duraciones
+    # ----------------------------
+    async def refresh_durations(self, today: date | None = None) -> int:
+        """
+        Recalcula la duración guardada de los trabajos sin end_date (y de los
+        documentos antiguos que aún no la tienen). Solo escribe los que cambian y
+        actualiza la caché y el snapshot de sus usuarios. Devuelve cuántos cambiaron.
+        """
+        await self._init_repo()
+        today = today or date.today()
+        now_iso = datetime.now().isoformat()
+        updates: list[tuple] = []
+        usernames: set[str] = set()
+        async for doc in self.repo.iter_durations_to_refresh():
+            try:
+                fields = self.duration_fields(doc.get("initial_date"), doc.get("end_date"), today)
+            except ValidationException as e:
+                logger.warning("Duración no recalculada para %s: %s", doc["_id"], e.detail)
+                continue
+            if doc.get("duration_months") == fields["duration_months"] and doc.get("duration") == fields["duration"]:
+                continue
+            updates.append((doc["_id"], {**fields, "updated_at": now_iso}))
+            usernames.add(doc["username"])
+
+        await self.repo.set_fields(updates)
+        for username in usernames:
+            await notify_write(COLLECTION, username)
+        return len(updates)
@@ -0,0 +1,212 @@
+"""
+Benchmark de arranque en frío.
+
+Cada ejecución usa procesos nuevos de Python, como una instancia recién creada en
+una plataforma que escala a cero, y mide:
+- la importación de la aplicación con `python -X importtime -c "import main"`,
+  con los módulos y paquetes que más tardan y si los diferidos (Motor, jose,
+  bcrypt) siguen fuera del arranque;
+- el tiempo desde lanzar uvicorn (como el CMD del Dockerfile) hasta la primera
+  respuesta 200 de /healthcheck y hasta que informa "healthy".
+
+Por defecto la app arranca con STORAGE_BACKEND=memory; con --mongo-uri se conecta
+a un mongod real y "healthy" incluye el ping y la creación de índices.
+
+Uso (desde la carpeta app/):
+    python -m tests.benchmarks.cold_start [--runs 5] [--top 15] [--timeout 60]
+        [--mongo-uri mongodb://localhost:27017] [--output cold_start.json]
+        [--baseline cold_start_anterior.json]
+"""
+import argparse
+import json
+import os
+import platform
+import socket
+import statistics
+import subprocess
+import sys
+import time
+from datetime import datetime, timezone
+from typing import Optional
+
+import httpx
+
+from tests.benchmarks.endpoints import git_commit
+
+APP_DIR = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+# Dependencias que la app carga al primer uso, no al importarse
+DEFERRED_MODULES = ("motor", "jose", "bcrypt")
+
+
+def child_env(mongo_uri: Optional[str]) -> dict[str, str]:
+    env = dict(os.environ)
+    env.setdefault("JWT_SECRET_KEY", "benchmark-secret")
+    env["MONGO_URI"] = mongo_uri or env.get("MONGO_URI", "mongodb://localhost:27017")
+    env["STORAGE_BACKEND"] = "motor" if mongo_uri else "memory"
+    return env
+
+
+def parse_importtime(stderr: str) -> list[tuple[str, int, int]]:
+    """Líneas de -X importtime como (módulo, µs propios, µs acumulados)."""
+    modules = []
+    for line in stderr.splitlines():
+        if not line.startswith("import time:") or "imported package" in line:
+            continue
+        self_us, cumulative_us, name = line[len("import time:"):].split("|", 2)
+        modules.append((name.strip(), int(self_us), int(cumulative_us)))
+    return modules
+
+
+def measure_imports(env: dict[str, str], top: int) -> dict:
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", "import main"],
+        cwd=APP_DIR, env=env, capture_output=True, text=True,
+    )
+    if result.returncode != 0:
+        raise RuntimeError(f"No se pudo importar la app:\n{result.stderr[-2000:]}")
+    modules = parse_importtime(result.stderr)
+    total_us = next(cumulative for name, _, cumulative in modules if name == "main")
+    packages: dict[str, int] = {}
+    for name, self_us, _ in modules:
+        package = name.split(".")[0]
+        packages[package] = packages.get(package, 0) + self_us
+    loaded = {name.split(".")[0] for name, _, _ in modules}
+    return {
+        "total_ms": total_us / 1000,
+        "top_modules": [
+            {"module": name, "cumulative_ms": cumulative / 1000}
+            for name, _, cumulative in sorted(modules, key=lambda m: m[2], reverse=True)[:top]
+        ],
+        "top_packages": [
+            {"package": package, "self_ms": self_us / 1000}
+            for package, self_us in sorted(packages.items(), key=lambda p: p[1], reverse=True)[:top]
+        ],
+        "deferred": {module: module not in loaded for module in DEFERRED_MODULES},
+    }
+
+
+def free_port() -> int:
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+def measure_startup(env: dict[str, str], timeout: float) -> dict:
+    """Lanza uvicorn y consulta /healthcheck hasta que responde "healthy" (o vence `timeout`)."""
+    port = free_port()
+    url = f"http://127.0.0.1:{port}/healthcheck"
+    started = time.perf_counter()
+    process = subprocess.Popen(
+        [sys.executable, "-m", "uvicorn", "main:app", "--host", "127.0.0.1", "--port", str(port),
+         "--log-level", "warning"],
+        cwd=APP_DIR, env=env, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL,
+    )
+    first_ok_ms = healthy_ms = None
+    try:
+        with httpx.Client(timeout=1.0) as client:
+            while time.perf_counter() - started < timeout and process.poll() is None:
+                try:
+                    response = client.get(url)
+                except httpx.TransportError:
+                    time.sleep(0.005)
+                    continue
+                elapsed_ms = (time.perf_counter() - started) * 1000
+                if response.status_code == 200:
+                    first_ok_ms = first_ok_ms or elapsed_ms
+                    if response.json().get("status") == "healthy":
+                        healthy_ms = elapsed_ms
+                        break
+                time.sleep(0.005)
+    finally:
+        process.terminate()
+        try:
+            process.wait(timeout=10)
+        except subprocess.TimeoutExpired:
+            process.kill()
+    return {"first_ok_ms": first_ok_ms, "healthy_ms": healthy_ms}
+
+
+def summary(samples: list[Optional[float]]) -> dict:
+    values = [s for s in samples if s is not None]
+    if not values:
+        return {"median_ms": None, "min_ms": None, "max_ms": None, "failed": len(samples)}
+    return {
+        "median_ms": round(statistics.median(values), 2),
+        "min_ms": round(min(values), 2),
+        "max_ms": round(max(values), 2),
+        "failed": len(samples) - len(values),
+    }
+
+
+def compare(report: dict, baseline_path: str) -> None:
+    with open(baseline_path, encoding="utf-8") as f:
+        baseline = json.load(f)
+    print(f"\nComparación con {baseline_path} (mediana):")
+    for name in ("import", "first_ok", "healthy"):
+        before = baseline["results"][name]["median_ms"]
+        after = report["results"][name]["median_ms"]
+        if not before or not after:
+            continue
+        change = (after - before) / before * 100
+        print(f"{name:<10} {before:>9.2f} -> {after:>9.2f} ms ({change:+.1f}%)")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--runs", type=int, default=5, help="Arranques medidos (cada uno en procesos nuevos)")
+    parser.add_argument("--top", type=int, default=15, help="Módulos y paquetes a listar")
+    parser.add_argument("--timeout", type=float, default=60.0, help="Segundos máximos de espera por arranque")
+    parser.add_argument("--mongo-uri", help="Arrancar con Motor contra este mongod (por defecto, en memoria)")
+    parser.add_argument("--output", default="cold_start_results.json", help="Archivo JSON de resultados")
+    parser.add_argument("--baseline", help="JSON de una ejecución anterior con el que comparar")
+    args = parser.parse_args()
+
+    env = child_env(args.mongo_uri)
+    imports = [measure_imports(env, args.top) for _ in range(args.runs)]
+    startups = [measure_startup(env, args.timeout) for _ in range(args.runs)]
+
+    report = {
+        "commit": git_commit(),
+        "created_at": datetime.now(timezone.utc).isoformat(),
+        "python": platform.python_version(),
+        "backend": "mongod" if args.mongo_uri else "memory",
+        "config": {"runs": args.runs},
+        "results": {
+            "import": summary([run["total_ms"] for run in imports]),
+            "first_ok": summary([run["first_ok_ms"] for run in startups]),
+            "healthy": summary([run["healthy_ms"] for run in startups]),
+        },
+        # Desglose de la ejecución con la importación más rápida (la menos ruidosa)
+        "imports": min(imports, key=lambda run: run["total_ms"]),
+    }
+
+    fastest = report["imports"]
+    print(f"{'Módulo':<50} {'acumulado ms':>12}")
+    for entry in fastest["top_modules"]:
+        print(f"{entry['module']:<50} {entry['cumulative_ms']:>12.2f}")
+    print(f"\n{'Paquete':<50} {'propio ms':>12}")
+    for entry in fastest["top_packages"]:
+        print(f"{entry['package']:<50} {entry['self_ms']:>12.2f}")
+    print("\nDiferidos (no importados al arrancar): " + ", ".join(
+        f"{module}={'sí' if deferred else 'no'}" for module, deferred in fastest["deferred"].items()
+    ))
+    print(f"\n{'Medida':<10} {'mediana ms':>12} {'mín ms':>10} {'máx ms':>10} {'fallos':>7}")
+    for name, result in report["results"].items():
+        if result["median_ms"] is None:
+            print(f"{name:<10} {'-':>12} {'-':>10} {'-':>10} {result['failed']:>7}")
+            continue
+        print(
+            f"{name:<10} {result['median_ms']:>12.2f} {result['min_ms']:>10.2f} "
+            f"{result['max_ms']:>10.2f} {result['failed']:>7}"
+        )
+
+    with open(args.output, "w", encoding="utf-8") as f:
+        json.dump(report, f, ensure_ascii=False, indent=2)
+    print(f"\nResultados guardados en {args.output}")
+
+    if args.baseline:
+        compare(report, args.baseline)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,411 @@
+"""
+Benchmark de endpoints de la API.
+
+Ejecuta la app real de FastAPI con un cliente ASGI en proceso (httpx) sin una
+base de datos real: por defecto con el backend de almacenamiento en memoria
+(STORAGE_BACKEND=memory), con --backend mongomock sobre Motor y mongomock-motor,
+o con --mongo-uri contra un mongod local desechable (se usa una base temporal
+que se borra al terminar). Mide cada ruta pública /p/, el login, la exportación y cada
+escritura de administración, y reporta latencia p50/p95/p99 y peticiones/s.
+
+Los resultados se guardan en JSON para comparar entre commits (--baseline).
+
+Uso (desde la carpeta app/):
+    python -m tests.benchmarks.endpoints [--requests 200] [--concurrency 1]
+        [--slow-requests 10] [--items 20] [--no-cache]
+        [--backend memory|mongomock] [--mongo-uri mongodb://localhost:27017] [--output resultados.json]
+        [--baseline resultados_anteriores.json]
+"""
+import argparse
+import asyncio
+import itertools
+import json
+import math
+import os
+import platform
+import subprocess
+import time
+from dataclasses import dataclass, field
+from datetime import datetime, timezone
+from typing import Callable, Optional
+
+# La configuración exige estas variables al importarse; para el benchmark bastan valores locales
+os.environ.setdefault("MONGO_URI", "mongodb://localhost:27017")
+os.environ.setdefault("JWT_SECRET_KEY", "benchmark-secret")
+
+import httpx
+
+USERNAME = "benchmark"
+EMAIL = "benchmark@example.com"
+PASSWORD = "Benchmark1!"
+
+# Secciones con escritura de administración: prefijo -> payload de creación
+SECTIONS: dict[str, Callable[[int], dict]] = {
+    "projects": lambda i: {
+        "title": f"Proyecto {i}",
+        "description": "Aplicación web construida con FastAPI y Astro",
+        "image": f"https://cdn.example.com/projects/{i}.png",
+        "link": f"https://github.com/example/project-{i}",
+        "stack": ["python", "fastapi", "mongodb"],
+    },
+    "education": lambda i: {"company": f"Universidad {i}", "career": f"Carrera {i}", "year": 2000 + i % 50},
+    "certifications": lambda i: {
+        "company": "Google",
+        "certification": f"Certificación {i}",
+        "link": f"https://cert.example.com/{i}",
+    },
+    "social_networks": lambda i: {"title": f"Red {i}", "url": f"https://social.example.com/{i}"},
+    "work_experience": lambda i: {
+        "rol": f"Desarrollador {i}",
+        "company": f"Empresa {i % 5}",
+        "location": "Remoto",
+        "activities": "Desarrollo de APIs",
+        "initial_date": f"{2010 + i % 10}-0{1 + i % 9}-15",
+        "end_date": None if i % 4 == 0 else f"{2020 + i % 4}-0{1 + i % 9}-10",
+    },
+    "profile": lambda i: {
+        "rol": f"Rol {i}",
+        "description": "Desarrollador Full Stack",
+        "skills": ["python", "fastapi"],
+        "avatar": f"https://cdn.example.com/avatars/{i}.png",
+    },
+    "contact": lambda i: {
+        "nationality": "Colombiana",
+        "phone_number": f"+57 300 000 {i:04d}",
+        "i_live_in": "Medellín",
+        "email": f"contacto{i}@example.com",
+    },
+}
+BULK_SECTIONS = ("projects", "education", "certifications", "social_networks", "work_experience")
+
+
+@dataclass
+class Case:
+    """Una ruta a medir: `request(i)` devuelve (método, url, kwargs de httpx) para la iteración i."""
+    name: str
+    request: Callable[[int], tuple[str, str, dict]]
+    on_response: Optional[Callable[[httpx.Response], None]] = None
+    iterations: Optional[int] = None
+
+
+@dataclass
+class Result:
+    name: str
+    count: int
+    errors: int
+    p50_ms: float
+    p95_ms: float
+    p99_ms: float
+    mean_ms: float
+    rps: float
+    statuses: dict[str, int] = field(default_factory=dict)
+
+
+def percentile(sorted_samples: list[float], pct: float) -> float:
+    """Percentil por rango más cercano sobre muestras ya ordenadas."""
+    if not sorted_samples:
+        return 0.0
+    rank = max(0, math.ceil(pct / 100 * len(sorted_samples)) - 1)
+    return sorted_samples[rank]
+
+
+async def run_case(client: httpx.AsyncClient, case: Case, iterations: int, concurrency: int) -> Result:
+    durations: list[float] = []
+    statuses: dict[str, int] = {}
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def one(i: int) -> None:
+        method, url, kwargs = case.request(i)
+        async with semaphore:
+            started = time.perf_counter()
+            response = await client.request(method, url, **kwargs)
+            durations.append(time.perf_counter() - started)
+        statuses[str(response.status_code)] = statuses.get(str(response.status_code), 0) + 1
+        if case.on_response and response.status_code < 400:
+            case.on_response(response)
+
+    started = time.perf_counter()
+    await asyncio.gather(*(one(i) for i in range(iterations)))
+    elapsed = time.perf_counter() - started
+
+    samples = sorted(d * 1000 for d in durations)
+    errors = sum(n for status, n in statuses.items() if int(status) >= 400)
+    return Result(
+        name=case.name,
+        count=len(samples),
+        errors=errors,
+        p50_ms=round(percentile(samples, 50), 3),
+        p95_ms=round(percentile(samples, 95), 3),
+        p99_ms=round(percentile(samples, 99), 3),
+        mean_ms=round(sum(samples) / len(samples), 3) if samples else 0.0,
+        rps=round(len(samples) / elapsed, 1) if elapsed else 0.0,
+        statuses=statuses,
+    )
+
+
+async def use_stand_in(backend: str, mongo_uri: Optional[str]) -> None:
+    """Prepara el almacenamiento elegido: en memoria, mongomock o un mongod local desechable."""
+    from core.config import settings
+    from core.database import mongodb
+    from repositories.storage import storage
+
+    if mongo_uri:
+        settings.MONGO_URI = mongo_uri
+        settings.MONGODB_NAME = f"jimcostdev_api_bench_{os.getpid()}"
+    elif backend == "mongomock":
+        from mongomock_motor import AsyncMongoMockClient
+
+        mongodb.client = AsyncMongoMockClient()
+        mongodb.db = mongodb.client[settings.MONGODB_NAME]
+        mongodb.is_connected = True
+    await storage.connect()
+    await storage.ensure_indexes()
+
+
+async def seed(client: httpx.AsyncClient, items: int) -> dict[str, str]:
+    """Crea el usuario administrador y su portafolio a través de la propia API. Devuelve sus cabeceras de auth."""
+    from repositories.storage import storage
+    from utils.hash_and_verify_password import hash_password
+
+    now = datetime.now(timezone.utc).isoformat()
+    users = await storage.get_collection("users")
+    await users.insert_one({
+        "full_name": "Benchmark",
+        "username": USERNAME,
+        "email": EMAIL,
+        "secret": "benchmark",
+        "password": await hash_password(PASSWORD),
+        "roles": ["admin"],
+        "created_at": now,
+        "updated_at": now,
+    })
+    login = await client.post("/auth/login", json={"email": EMAIL, "password": PASSWORD})
+    login.raise_for_status()
+    auth = {"Authorization": f"Bearer {login.json()['access_token']}"}
+
+    for prefix in BULK_SECTIONS:
+        payloads = [SECTIONS[prefix](-(i + 1)) for i in range(items)]
+        response = await client.post(f"/{prefix}/bulk", json=payloads, headers=auth)
+        response.raise_for_status()
+    for prefix in ("profile", "contact"):
+        response = await client.post(f"/{prefix}/", json=SECTIONS[prefix](0), headers=auth)
+        response.raise_for_status()
+    return auth
+
+
+async def first_ids(client: httpx.AsyncClient, routes: list[str]) -> dict[str, str]:
+    """Primer id publicado de cada sección, para las rutas /p/{username}/{id}."""
+    ids = {}
+    for route in routes:
+        if not route.endswith("/{id}"):
+            continue
+        listing = route.removesuffix("/{id}").format(username=USERNAME)
+        response = await client.get(listing)
+        response.raise_for_status()
+        ids[route] = response.json()[0]["id"]
+    return ids
+
+
+def public_cases(app, ids: dict[str, str]) -> list[Case]:
+    """Una lectura por cada ruta GET pública (/p/) declarada en la app."""
+    cases = []
+    for route, operations in app.openapi()["paths"].items():
+        if "/p/" not in route or "get" not in operations:
+            continue
+        url = route.format(username=USERNAME, email=EMAIL, id=ids.get(route, ""))
+        cases.append(Case(f"GET {route}", lambda i, url=url: ("GET", url, {})))
+    return cases
+
+
+def write_cases(auth: dict[str, str], project_id: str, slow_requests: int) -> list[Case]:
+    """Escrituras de administración: crear, actualizar y borrar en cada sección, bulk y skills."""
+    counter = itertools.count(1)
+    cases: list[Case] = []
+
+    for prefix, payload in SECTIONS.items():
+        created: list[str] = []
+        cases += [
+            Case(
+                f"POST /{prefix}/",
+                lambda i, prefix=prefix, payload=payload: (
+                    "POST", f"/{prefix}/", {"json": payload(next(counter)), "headers": auth}
+                ),
+                on_response=lambda r, created=created: created.append(r.json()["id"]),
+            ),
+            Case(
+                f"PUT /{prefix}/{{id}}",
+                lambda i, prefix=prefix, payload=payload, created=created: (
+                    "PUT", f"/{prefix}/{created[i % len(created)]}",
+                    {"json": payload(next(counter)), "headers": auth},
+                ),
+            ),
+            Case(
+                f"DELETE /{prefix}/{{id}}",
+                lambda i, prefix=prefix, created=created: (
+                    "DELETE", f"/{prefix}/{created[i]}", {"headers": auth}
+                ),
+            ),
+        ]
+        if prefix in BULK_SECTIONS:
+            cases.append(Case(
+                f"POST /{prefix}/bulk",
+                lambda i, prefix=prefix, payload=payload: (
+                    "POST", f"/{prefix}/bulk",
+                    {"json": [payload(next(counter)) for _ in range(10)], "headers": auth},
+                ),
+            ))
+
+    cases += [
+        Case("POST /profile/skills", lambda i: (
+            "POST", "/profile/skills", {"json": {"skills": [f"skill-{i}", f"tool-{i}"]}, "headers": auth}
+        )),
+        Case("POST /profile/skills/remove", lambda i: (
+            "POST", "/profile/skills/remove", {"json": {"skills": [f"skill-{i}", f"tool-{i}"]}, "headers": auth}
+        )),
+        Case("POST /profile/skill", lambda i: (
+            "POST", "/profile/skill", {"json": {"skill": f"single-{i}"}, "headers": auth}
+        )),
+        Case("DELETE /profile/skill/{skill}", lambda i: (
+            "DELETE", f"/profile/skill/single-{i}", {"headers": auth}
+        )),
+        Case("POST /projects/{id}/skills", lambda i: (
+            "POST", f"/projects/{project_id}/skills", {"json": {"skills": [f"skill-{i}"]}, "headers": auth}
+        )),
+        Case("POST /projects/{id}/skills/remove", lambda i: (
+            "POST", f"/projects/{project_id}/skills/remove", {"json": {"skills": [f"skill-{i}"]}, "headers": auth}
+        )),
+        Case("POST /projects/{id}/skill", lambda i: (
+            "POST", f"/projects/{project_id}/skill", {"json": {"skill": f"single-{i}"}, "headers": auth}
+        )),
+        Case("DELETE /projects/{id}/skill/{skill}", lambda i: (
+            "DELETE", f"/projects/{project_id}/skill/single-{i}", {"headers": auth}
+        )),
+        Case("PUT /users/", lambda i: (
+            "PUT", "/users/", {"json": {"full_name": f"Benchmark {i}"}, "headers": auth}
+        )),
+        # bcrypt domina estas rutas: se miden con menos iteraciones
+        Case("POST /users/p/", lambda i: ("POST", "/users/p/", {"json": {
+            "full_name": "Usuario",
+            "username": f"usuario{next(counter)}",
+            "email": f"usuario{next(counter)}@example.com",
+            "secret": "secreto",
+            "password": PASSWORD,
+            "confirm_password": PASSWORD,
+        }}), iterations=slow_requests),
+    ]
+    return cases
+
+
+def git_commit() -> Optional[str]:
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True, check=True
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def compare(results: list[Result], baseline_path: str) -> None:
+    with open(baseline_path, encoding="utf-8") as f:
+        baseline = {r["name"]: r for r in json.load(f)["results"]}
+    print(f"\nComparación con {baseline_path} (p95):")
+    for result in results:
+        before = baseline.get(result.name)
+        if not before or not before["p95_ms"]:
+            continue
+        change = (result.p95_ms - before["p95_ms"]) / before["p95_ms"] * 100
+        print(f"{result.name:<45} {before['p95_ms']:>9.2f} -> {result.p95_ms:>9.2f} ms ({change:+.1f}%)")
+
+
+async def run(args: argparse.Namespace) -> list[Result]:
+    from main import app
+    from core.cache import response_cache
+    from core.config import settings
+    from core.database import mongodb
+    from repositories.storage import storage
+    from utils.hash_and_verify_password import hashing_engine
+
+    if args.no_cache:
+        response_cache.enabled = False
+        response_cache.clear()
+
+    await use_stand_in(args.backend, args.mongo_uri)
+    transport = httpx.ASGITransport(app=app)
+    results: list[Result] = []
+    try:
+        async with httpx.AsyncClient(transport=transport, base_url="http://benchmark") as client:
+            auth = await seed(client, args.items)
+            routes = [route for route in app.openapi()["paths"] if "/p/" in route]
+            ids = await first_ids(client, routes)
+
+            cases = public_cases(app, ids)
+            cases += [
+                Case("POST /auth/login", lambda i: (
+                    "POST", "/auth/login", {"json": {"email": EMAIL, "password": PASSWORD}}
+                ), iterations=args.slow_requests),
+                Case("GET /export/{username}", lambda i: (
+                    "GET", f"/export/{USERNAME}", {"headers": auth}
+                ), iterations=max(1, args.requests // 10)),
+            ]
+            cases += write_cases(auth, ids["/projects/p/{username}/{id}"], args.slow_requests)
+
+            for case in cases:
+                result = await run_case(client, case, case.iterations or args.requests, args.concurrency)
+                results.append(result)
+                print(
+                    f"{result.name:<45} p50 {result.p50_ms:>8.2f}  p95 {result.p95_ms:>8.2f}  "
+                    f"p99 {result.p99_ms:>8.2f} ms  {result.rps:>9.1f} req/s"
+                    + (f"  errores {result.errors}" if result.errors else "")
+                )
+    finally:
+        if args.mongo_uri:
+            await mongodb.client.drop_database(settings.MONGODB_NAME)
+        await storage.disconnect()
+        hashing_engine.shutdown()
+    return results
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--requests", type=int, default=200, help="Peticiones por ruta")
+    parser.add_argument("--slow-requests", type=int, default=10, help="Peticiones para rutas con bcrypt (login, registro)")
+    parser.add_argument("--concurrency", type=int, default=1, help="Peticiones simultáneas por ruta")
+    parser.add_argument("--items", type=int, default=20, help="Documentos sembrados por sección")
+    parser.add_argument("--no-cache", action="store_true", help="Desactivar la caché de respuestas públicas")
+    parser.add_argument(
+        "--backend", choices=["memory", "mongomock"], default="memory",
+        help="Almacenamiento en memoria o Motor sobre mongomock-motor",
+    )
+    parser.add_argument("--mongo-uri", help="Usar Motor contra un mongod local (ignora --backend)")
+    parser.add_argument("--output", default="benchmark_results.json", help="Archivo JSON de resultados")
+    parser.add_argument("--baseline", help="JSON de una ejecución anterior con el que comparar")
+    args = parser.parse_args()
+
+    # Debe fijarse antes de importar la app: el backend se elige al cargar la configuración
+    os.environ["STORAGE_BACKEND"] = "memory" if args.backend == "memory" and not args.mongo_uri else "motor"
+    results = asyncio.run(run(args))
+
+    report = {
+        "commit": git_commit(),
+        "created_at": datetime.now(timezone.utc).isoformat(),
+        "python": platform.python_version(),
+        "backend": "mongod" if args.mongo_uri else args.backend,
+        "config": {
+            "requests": args.requests,
+            "slow_requests": args.slow_requests,
+            "concurrency": args.concurrency,
+            "items": args.items,
+            "cache": not args.no_cache,
+        },
+        "results": [result.__dict__ for result in results],
+    }
+    with open(args.output, "w", encoding="utf-8") as f:
+        json.dump(report, f, ensure_ascii=False, indent=2)
+    print(f"\nResultados guardados en {args.output}")
+
+    if args.baseline:
+        compare(results, args.baseline)
+
+
+if __name__ == "__main__":
+    main()
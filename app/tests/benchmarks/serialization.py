@@ -0,0 +1,72 @@
+"""
+Micro-benchmark de serialización de respuestas públicas.
+
+Compara, para una lista de proyectos leída de MongoDB, el camino estándar
+(modelo validado + validación de `response_model` + jsonable_encoder + json)
+con el camino rápido (`from_db` con model_construct + orjson).
+
+Uso (desde la carpeta app/):
+    python -m tests.benchmarks.serialization [--docs 50] [--rounds 2000]
+"""
+import argparse
+import json
+import timeit
+from bson import ObjectId
+from fastapi.encoders import jsonable_encoder
+from pydantic import TypeAdapter
+from models.project_model import ProjectResponse
+from utils.serialization import FastJSONResponse, from_db
+
+
+def sample_docs(n: int) -> list[dict]:
+    return [
+        {
+            "_id": ObjectId(),
+            "title": f"Proyecto {i}",
+            "description": "Aplicación web construida con FastAPI y Astro " * 3,
+            "image": f"https://cdn.example.com/projects/{i}.png",
+            "link": f"https://github.com/example/project-{i}",
+            "stack": ["python", "fastapi", "mongodb", "astro", "docker"],
+            "username": "jimcostdev",
+        }
+        for i in range(n)
+    ]
+
+
+response_adapter = TypeAdapter(list[ProjectResponse])
+
+
+def standard_path(docs: list[dict]) -> bytes:
+    items = [ProjectResponse(**{**d, "id": str(d["_id"])}) for d in docs]
+    # FastAPI vuelve a validar contra response_model y codifica con json estándar
+    validated = response_adapter.validate_python(items, from_attributes=True)
+    content = jsonable_encoder(response_adapter.dump_python(validated, mode="json"))
+    return json.dumps(content, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+
+
+def fast_path(docs: list[dict]) -> bytes:
+    items = [from_db(ProjectResponse, {**d, "id": str(d["_id"])}) for d in docs]
+    return FastJSONResponse(items).body
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--docs", type=int, default=50, help="Documentos por respuesta")
+    parser.add_argument("--rounds", type=int, default=2000, help="Respuestas simuladas por camino")
+    args = parser.parse_args()
+
+    docs = sample_docs(args.docs)
+    # Ambos caminos deben producir el mismo JSON
+    assert json.loads(standard_path(docs)) == json.loads(fast_path(docs))
+
+    results = {}
+    for name, fn in (("estándar", standard_path), ("rápido", fast_path)):
+        best = min(timeit.repeat(lambda: fn(docs), number=args.rounds, repeat=3))
+        results[name] = best / args.rounds * 1_000_000
+        print(f"{name:<10} {results[name]:>10.1f} µs/respuesta")
+    print(f"{'ahorro':<10} {results['estándar'] - results['rápido']:>10.1f} µs/respuesta "
+          f"({results['estándar'] / results['rápido']:.1f}x)")
+
+
+if __name__ == "__main__":
+    main()
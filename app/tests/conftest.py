@@ -0,0 +1,25 @@
+import os
+
+# Settings exige estas variables al importarse; las pruebas no se conectan a MongoDB
+os.environ.setdefault("MONGO_URI", "mongodb://localhost:27017")
+os.environ.setdefault("JWT_SECRET_KEY", "test-secret")
+os.environ.setdefault("STORAGE_BACKEND", "memory")
+
+import pytest
+from mongomock_motor import AsyncMongoMockClient
+from repositories.storage.memory_backend import MemoryCollection
+from repositories.storage.motor_backend import MotorCollection
+
+BACKENDS = ("memory", "motor")
+
+
+def make_collection(backend: str, name: str = "items"):
+    """Colección vacía del backend indicado; "motor" usa Motor sobre mongomock como referencia."""
+    if backend == "memory":
+        return MemoryCollection(name)
+    return MotorCollection(AsyncMongoMockClient()["tests"][name])
+
+
+@pytest.fixture(params=BACKENDS)
+def collection(request):
+    return make_collection(request.param)
@@ -0,0 +1,70 @@
+"""
+Importación por lotes: rechaza el mismo campo repetido que la creación
+individual y, con replace, solo borra lo anterior si el lote entero se creó.
+"""
+import pytest
+from exceptions import ConflictException
+from models.certification_model import CertificationCreate
+from models.education_model import EducationCreate
+from models.project_model import ProjectCreate
+from models.social_network_model import SocialNetworkCreate
+from services.certification_service import CertificationService
+from services.education_service import EducationService
+from services.project_service import ProjectService
+from services.social_network_service import SocialNetworkService
+
+CASES = [
+    (ProjectService, "create_project", "bulk_create_projects", ProjectCreate,
+     {"image": "https://example.com/i.png", "title": "api", "description": "d"}),
+    (EducationService, "create_education", "bulk_create_education", EducationCreate,
+     {"company": "U", "career": "Sistemas", "year": 2020}),
+    (CertificationService, "create_certification", "bulk_create_certifications", CertificationCreate,
+     {"company": "G", "certification": "GCP", "link": "https://example.com/c"}),
+    (SocialNetworkService, "create_social_network", "bulk_create_social_networks", SocialNetworkCreate,
+     {"title": "github", "url": "https://github.com/ana"}),
+]
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("service_class, create, bulk, model, payload", CASES)
+async def test_single_create_and_bulk_share_the_unique_field(service_class, create, bulk, model, payload):
+    service = service_class()
+    username = f"bulk-{create}"
+    await getattr(service, create)(model(**payload), username)
+
+    with pytest.raises(ConflictException):
+        await getattr(service, create)(model(**payload), username)
+    result = await getattr(service, bulk)([model(**payload)], username)
+    assert [item.status for item in result.items] == ["conflict"]
+
+
+def _projects(*titles: str) -> list[ProjectCreate]:
+    return [ProjectCreate(image="https://example.com/i.png", title=title, description="d") for title in titles]
+
+
+async def _titles(service: ProjectService, username: str) -> list[str]:
+    return sorted(p.title for p in (await service.list_projects(username)).items)
+
+
+@pytest.mark.asyncio
+async def test_replace_swaps_the_documents_when_every_item_is_created():
+    service = ProjectService()
+    await service.bulk_create_projects(_projects("a", "b"), "bulk-replace")
+    result = await service.bulk_create_projects(_projects("b", "c"), "bulk-replace", replace=True)
+    assert (result.created, result.failed, result.deleted) == (2, 0, 2)
+    assert await _titles(service, "bulk-replace") == ["b", "c"]
+
+
+@pytest.mark.asyncio
+async def test_replace_with_failed_items_keeps_the_previous_documents():
+    service = ProjectService()
+    await service.bulk_create_projects(_projects("a", "b"), "bulk-partial")
+    # "c" repetido en el lote: el segundo es un conflicto
+    result = await service.bulk_create_projects(_projects("c", "c"), "bulk-partial", replace=True)
+    assert (result.created, result.failed, result.deleted) == (1, 1, 0)
+    assert await _titles(service, "bulk-partial") == ["a", "b", "c"]
+
+    # Corregido el lote, el reemplazo sustituye también lo creado en el intento anterior
+    result = await service.bulk_create_projects(_projects("c", "d"), "bulk-partial", replace=True)
+    assert (result.created, result.failed, result.deleted) == (2, 0, 3)
+    assert await _titles(service, "bulk-partial") == ["c", "d"]
@@ -0,0 +1,93 @@
+import asyncio
+import pytest
+from core.cache import MISSING, TTLCache
+from exceptions import DatabaseException
+
+KEY = ("projects", "ana", "list")
+
+
+def make_cache(**kwargs) -> TTLCache:
+    return TTLCache(**{"max_entries": 100, "max_bytes": 1_000_000, "ttl_seconds": 60, **kwargs})
+
+
+class Loader:
+    """Carga controlada desde la prueba: cuenta las llamadas y espera a `release`."""
+
+    def __init__(self, value="v1"):
+        self.value = value
+        self.calls = 0
+        self.release = asyncio.Event()
+        self.error: Exception | None = None
+
+    async def __call__(self):
+        self.calls += 1
+        await self.release.wait()
+        if self.error is not None:
+            raise self.error
+        return self.value
+
+
+@pytest.mark.asyncio
+async def test_concurrent_loads_share_one_call():
+    cache, loader = make_cache(), Loader()
+    tasks = [asyncio.create_task(cache.get_or_load(KEY, loader)) for _ in range(5)]
+    await asyncio.sleep(0)
+    loader.release.set()
+    assert await asyncio.gather(*tasks) == ["v1"] * 5
+    assert loader.calls == 1
+    assert await cache.get_or_load(KEY, loader) == "v1"
+    assert loader.calls == 1
+
+
+@pytest.mark.asyncio
+async def test_shared_load_failure_reaches_every_caller_and_is_not_cached():
+    cache, loader = make_cache(), Loader()
+    loader.error = DatabaseException("caída")
+    tasks = [asyncio.create_task(cache.get_or_load(KEY, loader)) for _ in range(3)]
+    await asyncio.sleep(0)
+    loader.release.set()
+    results = await asyncio.gather(*tasks, return_exceptions=True)
+    assert all(isinstance(result, DatabaseException) for result in results)
+    assert loader.calls == 1
+    assert cache.get(KEY) is MISSING
+
+
+@pytest.mark.asyncio
+async def test_write_during_load_discards_the_loaded_value():
+    cache, loader = make_cache(), Loader()
+    task = asyncio.create_task(cache.get_or_load(KEY, loader))
+    await asyncio.sleep(0)
+    # Una escritura llega mientras la lectura está en curso
+    cache.invalidate("projects", "ana")
+    loader.release.set()
+    assert await task == "v1"
+    assert cache.get(KEY) is MISSING
+
+    loader.value = "v2"
+    assert await cache.get_or_load(KEY, loader) == "v2"
+    assert cache.get(KEY) == "v2"
+
+
+@pytest.mark.asyncio
+async def test_invalidate_only_touches_that_user_and_collection():
+    cache = make_cache()
+    cache.set(KEY, 1)
+    cache.set(("projects", "ana", "id", "1"), 2)
+    cache.set(("projects", "bob", "list"), 3)
+    cache.set(("education", "ana", "list"), 4)
+    cache.invalidate("projects", "ana")
+    assert cache.get(KEY) is MISSING
+    assert cache.get(("projects", "ana", "id", "1")) is MISSING
+    assert cache.get(("projects", "bob", "list")) == 3
+    assert cache.get(("education", "ana", "list")) == 4
+
+
+def test_lru_eviction_by_entries():
+    cache = make_cache(max_entries=2)
+    cache.set(("c", "u", 1), 1)
+    cache.set(("c", "u", 2), 2)
+    cache.get(("c", "u", 1))
+    cache.set(("c", "u", 3), 3)
+    assert cache.get(("c", "u", 2)) is MISSING
+    assert cache.get(("c", "u", 1)) == 1
+    assert cache.evictions == 1
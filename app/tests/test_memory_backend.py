@@ -0,0 +1,109 @@
+"""
+El backend en memoria debe filtrar y ordenar como MongoDB: se comparan sus
+resultados con los de Motor (sobre mongomock) para los mismos documentos.
+"""
+import pytest
+import pytest_asyncio
+from bson import ObjectId
+from pymongo import ASCENDING, DESCENDING
+from tests.conftest import make_collection
+
+OID_1 = ObjectId("65a000000000000000000001")
+OID_2 = ObjectId("65a000000000000000000002")
+
+DOCS = [
+    {"_id": 1, "username": "ana", "title": "b", "year": 2020, "stack": ["py", "go"]},
+    {"_id": 2, "username": "ana", "title": "a", "year": None, "stack": []},
+    {"_id": 3, "username": "ana", "title": "c", "stack": None},
+    {"_id": OID_1, "username": "ana", "title": "d", "year": 2018, "stack": ["js"]},
+    {"_id": OID_2, "username": "bob", "title": "a", "year": "2019"},
+]
+
+QUERIES = [
+    {"username": "ana"},
+    {"title": "a"},
+    {"stack": "py"},
+    {"year": None},
+    {"year": {"$exists": False}},
+    {"year": {"$gt": 2018}},
+    {"year": {"$lte": 2020}},
+    {"year": {"$gte": "2000"}},
+    {"year": {"$ne": None}},
+    {"_id": {"$gt": 1}},
+    {"_id": {"$gt": OID_1}},
+    {"_id": {"$type": "objectId"}},
+    {"_id": {"$type": "number"}},
+    {"_id": {"$in": [2, OID_2, 99]}},
+    {"title": {"$nin": ["a", "b"]}},
+    {"$or": [{"title": "c"}, {"year": 2018}]},
+    {"$and": [{"username": "ana"}, {"$or": [{"_id": {"$gt": 2}}, {"_id": {"$type": "objectId"}}]}]},
+]
+
+SORTS = [
+    [("_id", ASCENDING)],
+    [("_id", DESCENDING)],
+    [("year", ASCENDING), ("_id", ASCENDING)],
+    [("year", DESCENDING), ("_id", DESCENDING)],
+    [("username", ASCENDING), ("title", DESCENDING), ("_id", ASCENDING)],
+]
+
+
+async def _ids(collection, query, sort=None, limit=None) -> list:
+    return [doc["_id"] async for doc in collection.find(query, {"_id": 1}, sort=sort, limit=limit)]
+
+
+@pytest_asyncio.fixture
+async def backends():
+    memory, motor = make_collection("memory"), make_collection("motor")
+    for collection in (memory, motor):
+        await collection.bulk_insert([dict(doc) for doc in DOCS])
+    return memory, motor
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("query", QUERIES)
+async def test_matches_like_mongodb(backends, query):
+    memory, motor = backends
+    expected = await _ids(motor, query, sort=[("_id", ASCENDING)])
+    assert await _ids(memory, query, sort=[("_id", ASCENDING)]) == expected
+    assert (await memory.find_one(query, {"_id": 1}) is None) == (not expected)
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("sort", SORTS)
+async def test_sorts_like_mongodb(backends, sort):
+    memory, motor = backends
+    assert await _ids(memory, {}, sort=sort) == await _ids(motor, {}, sort=sort)
+    assert await _ids(memory, {}, sort=sort, limit=2) == await _ids(motor, {}, sort=sort, limit=2)
+
+
+@pytest.mark.asyncio
+async def test_projection_and_distinct_like_mongodb(backends):
+    memory, motor = backends
+    for projection in ({"title": 1}, {"title": 1, "_id": 0}, {"stack": 0, "year": 0}):
+        query = {"username": "ana"}
+        sort = [("_id", ASCENDING)]
+        assert [d async for d in memory.find(query, projection, sort=sort)] == [
+            d async for d in motor.find(query, projection, sort=sort)
+        ]
+    assert sorted(await memory.distinct("title", {"username": "ana"})) == sorted(
+        await motor.distinct("title", {"username": "ana"})
+    )
+
+
+@pytest.mark.asyncio
+async def test_returned_documents_are_copies(collection):
+    await collection.insert_one({"_id": 1, "username": "ana", "stack": ["py"]})
+    doc = await collection.find_one({"_id": 1})
+    doc["stack"].append("go")
+    assert (await collection.find_one({"_id": 1}))["stack"] == ["py"]
+
+
+@pytest.mark.asyncio
+async def test_update_moves_document_between_usernames(collection):
+    await collection.insert_one({"_id": 1, "username": "ana"})
+    assert await collection.update_one({"_id": 1}, {"username": "bob"}) == 1
+    assert await _ids(collection, {"username": "ana"}) == []
+    assert await _ids(collection, {"username": "bob"}) == [1]
+    assert await collection.delete_many({"username": "bob"}) == 1
+    assert await collection.find_one({"_id": 1}) is None
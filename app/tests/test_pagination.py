@@ -0,0 +1,82 @@
+"""
+Paginación por cursor (keyset) con colecciones que mezclan `_id` int (legacy) y
+ObjectId: recorrer todas las páginas debe devolver cada documento una sola vez
+y en el mismo orden que el listado completo.
+"""
+import httpx
+import pytest
+from bson import ObjectId
+from core.config import settings
+from exceptions import ValidationException
+from repositories.project_repository import ProjectRepository
+from repositories.work_experience_repository import WorkExperienceRepository
+from utils.pagination import encode_cursor
+
+OIDS = [ObjectId(f"65a0000000000000000000{i:02x}") for i in range(1, 5)]
+
+
+async def _walk(repo, username: str, limit: int) -> list:
+    ids, cursor = [], None
+    while True:
+        docs, cursor = await repo.find_page(username, limit=limit, cursor=cursor)
+        ids += [doc["_id"] for doc in docs]
+        if cursor is None:
+            return ids
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("limit", [1, 2, 3, 10])
+async def test_ascending_pages_cross_from_ints_to_object_ids(collection, limit):
+    await collection.bulk_insert(
+        [{"_id": _id, "username": "ana"} for _id in [OIDS[2], 7, OIDS[0], 2, OIDS[1], 11]]
+        + [{"_id": 5, "username": "bob"}, {"_id": OIDS[3], "username": "bob"}]
+    )
+    repo = ProjectRepository(collection)
+    expected = ["2", "7", "11", str(OIDS[0]), str(OIDS[1]), str(OIDS[2])]
+    assert await _walk(repo, "ana", limit) == expected
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("limit", [1, 2, 4])
+async def test_descending_pages_with_ties_and_mixed_ids(collection, limit):
+    docs = [
+        {"_id": 1, "initial_date": "2020-01-01"},
+        {"_id": OIDS[0], "initial_date": "2020-01-01"},
+        {"_id": 3, "initial_date": "2020-01-01"},
+        {"_id": OIDS[1], "initial_date": "2022-06-01"},
+        {"_id": 2, "initial_date": "2019-03-01"},
+    ]
+    await collection.bulk_insert([{**doc, "username": "ana"} for doc in docs])
+    repo = WorkExperienceRepository(collection)
+    # initial_date descendente y, a igual fecha, _id descendente (ObjectId antes que int)
+    expected = [str(OIDS[1]), str(OIDS[0]), "3", "1", "2"]
+    assert await _walk(repo, "ana", limit) == expected
+    assert [str(doc["_id"]) for doc in await repo.find_by_username("ana")] == expected
+
+
+@pytest.mark.asyncio
+async def test_last_page_has_no_cursor(collection):
+    await collection.bulk_insert([{"_id": i, "username": "ana"} for i in range(1, 4)])
+    repo = ProjectRepository(collection)
+    docs, cursor = await repo.find_page("ana", limit=3)
+    assert len(docs) == 3 and cursor is None
+    docs, cursor = await repo.find_page("ana", limit=2, cursor=encode_cursor([3]))
+    assert docs == [] and cursor is None
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("cursor", ["no-es-base64!", encode_cursor([1, 2]), encode_cursor("x"), "e30"])
+async def test_invalid_cursor_is_rejected(collection, cursor):
+    with pytest.raises(ValidationException):
+        await ProjectRepository(collection).find_page("ana", limit=2, cursor=cursor)
+
+
+@pytest.mark.asyncio
+async def test_invalid_cursor_returns_422():
+    from main import app
+
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+        response = await client.get(f"{settings.API_PREFIX}/projects/p/ana", params={"limit": 2, "cursor": "basura"})
+    assert response.status_code == 422
+    assert response.json()["detail"] == "Cursor inválido"
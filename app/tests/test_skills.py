@@ -0,0 +1,117 @@
+"""
+add_skills/remove_skills de proyectos y perfil: el update pipeline de Motor y el
+backend en memoria deben dejar el mismo arreglo, reportar lo mismo y no tocar
+`updated_at` cuando nada cambia.
+"""
+import pytest
+from bson import ObjectId
+from exceptions import NotFoundException
+from repositories.profile_repository import ProfileRepository
+from repositories.project_repository import ProjectRepository
+
+PROJECT_ID = ObjectId("65a000000000000000000001")
+OLD = "2024-01-01T00:00:00+00:00"
+ABSENT = object()
+
+
+async def _project(collection, **fields) -> ProjectRepository:
+    await collection.insert_one({"_id": PROJECT_ID, "username": "ana", "updated_at": OLD, **fields})
+    return ProjectRepository(collection)
+
+
+async def _stored(collection) -> dict:
+    return await collection.find_one({"_id": PROJECT_ID})
+
+
+@pytest.mark.asyncio
+async def test_add_skills_appends_only_new_ones_in_order(collection):
+    repo = await _project(collection, stack=["py", "go"])
+    result = await repo.add_skills(["rust", "py", "js", "rust"], str(PROJECT_ID), "ana")
+    assert result["added"] == ["rust", "js"]
+    assert result["ignored"] == ["py"]
+    stored = await _stored(collection)
+    assert stored["stack"] == ["py", "go", "rust", "js"]
+    assert stored["updated_at"] != OLD
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("stack", [None, "py", ABSENT])
+async def test_add_skills_turns_a_missing_or_invalid_stack_into_a_list(collection, stack):
+    fields = {} if stack is ABSENT else {"stack": stack}
+    repo = await _project(collection, **fields)
+    result = await repo.add_skills(["py"], str(PROJECT_ID), "ana")
+    assert result["added"] == ["py"]
+    assert (await _stored(collection))["stack"] == ["py"]
+
+
+@pytest.mark.asyncio
+async def test_adding_existing_skills_leaves_the_document_untouched(collection):
+    repo = await _project(collection, stack=["py", "go"])
+    result = await repo.add_skills(["go", "py"], str(PROJECT_ID), "ana")
+    assert result["added"] == []
+    assert result["ignored"] == ["go", "py"]
+    stored = await _stored(collection)
+    assert stored["stack"] == ["py", "go"]
+    assert stored["updated_at"] == OLD
+
+
+@pytest.mark.asyncio
+async def test_remove_skills_removes_every_occurrence(collection):
+    repo = await _project(collection, stack=["py", "go", "py", "js"])
+    result = await repo.remove_skills(["py", "rust"], str(PROJECT_ID), "ana")
+    assert result["removed"] == ["py"]
+    assert result["missing"] == ["rust"]
+    stored = await _stored(collection)
+    assert stored["stack"] == ["go", "js"]
+    assert stored["updated_at"] != OLD
+
+
+@pytest.mark.asyncio
+async def test_removing_absent_skills_is_not_found_and_changes_nothing(collection):
+    repo = await _project(collection, stack=["go"])
+    with pytest.raises(NotFoundException):
+        await repo.remove_skills(["py"], str(PROJECT_ID), "ana")
+    stored = await _stored(collection)
+    assert stored["stack"] == ["go"]
+    assert stored["updated_at"] == OLD
+
+
+@pytest.mark.asyncio
+async def test_skills_of_another_users_project_are_not_found(collection):
+    repo = await _project(collection, stack=["go"])
+    with pytest.raises(NotFoundException):
+        await repo.add_skills(["py"], str(PROJECT_ID), "bob")
+    with pytest.raises(NotFoundException):
+        await repo.remove_skills(["go"], str(PROJECT_ID), "bob")
+    assert (await _stored(collection))["stack"] == ["go"]
+
+
+@pytest.mark.asyncio
+async def test_legacy_int_ids_are_accepted(collection):
+    await collection.insert_one({"_id": 7, "username": "ana", "stack": []})
+    repo = ProjectRepository(collection)
+    await repo.add_skills(["py"], "7", "ana")
+    assert (await collection.find_one({"_id": 7}))["stack"] == ["py"]
+
+
+@pytest.mark.asyncio
+async def test_skills_values_are_stored_literally(collection):
+    # Un valor que empieza por "$" no debe interpretarse como ruta de campo
+    repo = await _project(collection, stack=[])
+    await repo.add_skills(["$stack", "c++"], str(PROJECT_ID), "ana")
+    assert (await _stored(collection))["stack"] == ["$stack", "c++"]
+    await repo.remove_skills(["$stack"], str(PROJECT_ID), "ana")
+    assert (await _stored(collection))["stack"] == ["c++"]
+
+
+@pytest.mark.asyncio
+async def test_profile_skills(collection):
+    await collection.insert_one({"username": "ana", "skills": ["py"], "updated_at": OLD})
+    repo = ProfileRepository(collection)
+    assert (await repo.add_skills(["py", "go"], "ana"))["added"] == ["go"]
+    assert (await repo.remove_skills(["py"], "ana"))["removed"] == ["py"]
+    assert (await collection.find_one({"username": "ana"}))["skills"] == ["go"]
+    with pytest.raises(NotFoundException):
+        await repo.add_skills(["py"], "bob")
+    with pytest.raises(NotFoundException):
+        await repo.remove_skills(["rust"], "ana")
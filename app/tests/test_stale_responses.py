@@ -0,0 +1,185 @@
+import asyncio
+import time
+import pytest
+from core.cache import StaleStore
+from exceptions import DatabaseException, NotFoundException, ServiceUnavailableException
+from tests.test_cache import KEY, Loader, make_cache
+
+
+def make_stale_store(**kwargs) -> StaleStore:
+    return StaleStore(**{
+        "max_entries": 100, "max_bytes": 1_000_000, "max_age_seconds": 60, "retry_seconds": 30, **kwargs
+    })
+
+
+async def failing():
+    raise DatabaseException("sin conexión")
+
+
+@pytest.mark.asyncio
+async def test_stale_copy_is_served_while_the_database_is_down():
+    store, cache = make_stale_store(), make_cache()
+    store.remember(KEY, "copia")
+
+    assert await store.serve(KEY, failing, cache) == "copia"
+    assert store.stats()["degraded"] is True
+    assert store.stale_served == 1
+
+    # En modo degradado no se vuelve a esperar a la base: se sirve la copia y se refresca aparte
+    loader = Loader("nuevo")
+    assert await store.serve(KEY, loader, cache) == "copia"
+    assert store.stale_served == 2
+    assert store.stats()["refreshing"] == 1
+
+
+@pytest.mark.asyncio
+async def test_background_refresh_ends_degraded_mode():
+    store, cache = make_stale_store(), make_cache()
+    store.remember(KEY, "copia")
+    await store.serve(KEY, failing, cache)
+
+    loader = Loader("nuevo")
+    await store.serve(KEY, loader, cache)
+    loader.release.set()
+    for _ in range(10):
+        await asyncio.sleep(0)
+    assert loader.calls == 1
+    assert store.refreshes == 1
+    assert store.stats()["degraded"] is False
+    assert store.stats()["refreshing"] == 0
+
+    # Recuperada la base, las lecturas vuelven a ir a ella
+    fresh = Loader("más nuevo")
+    fresh.release.set()
+    assert await store.serve(KEY, fresh, cache) == "más nuevo"
+    assert fresh.calls == 1
+
+
+@pytest.mark.asyncio
+async def test_failed_refresh_keeps_serving_the_copy():
+    store, cache = make_stale_store(), make_cache()
+    store.remember(KEY, "copia")
+    await store.serve(KEY, failing, cache)
+
+    loader = Loader()
+    loader.error = DatabaseException("sigue caída")
+    loader.release.set()
+    await store.serve(KEY, loader, cache)
+    for _ in range(10):
+        await asyncio.sleep(0)
+    assert store.stats()["degraded"] is True
+    assert await store.serve(KEY, failing, cache) == "copia"
+
+
+@pytest.mark.asyncio
+async def test_without_copy_the_outage_is_a_503():
+    store = make_stale_store()
+    with pytest.raises(ServiceUnavailableException):
+        await store.serve(KEY, failing, make_cache())
+    assert store.unavailable == 1
+
+
+@pytest.mark.asyncio
+async def test_application_errors_are_not_masked():
+    store = make_stale_store()
+    store.remember(KEY, "copia")
+
+    async def not_found():
+        raise NotFoundException()
+
+    with pytest.raises(NotFoundException):
+        await store.serve(KEY, not_found, make_cache())
+    assert store.stats()["degraded"] is False
+
+
+@pytest.mark.asyncio
+async def test_copies_older_than_max_age_are_not_served():
+    store = make_stale_store(max_age_seconds=0)
+    store.remember(KEY, "copia")
+    with pytest.raises(ServiceUnavailableException):
+        await store.serve(KEY, failing, make_cache())
+
+
+@pytest.mark.asyncio
+async def test_snapshot_rebuilt_after_a_write_never_uses_stale_copies():
+    from core.cache import stale_responses
+    from models.project_model import ProjectCreate
+    from services.project_service import ProjectService
+    from services.snapshot_service import snapshot_service
+
+    service = ProjectService()
+    payload = {"image": "https://example.com/i.png", "description": "d"}
+    try:
+        await service.create_project(ProjectCreate(title="old", **payload), "stale-user")
+        assert [p.title for p in (await service.list_projects("stale-user")).items] == ["old"]
+
+        # La base acaba de fallar en otra lectura; luego una escritura funciona
+        stale_responses.degraded_until = time.monotonic() + 60
+        await service.create_project(ProjectCreate(title="new", **payload), "stale-user")
+
+        assert stale_responses.stats()["degraded"] is False
+        snapshot = await snapshot_service.get_snapshot("stale-user")
+        assert [p["title"] for p in snapshot.projects] == ["old", "new"]
+        assert [p.title for p in (await service.list_projects("stale-user")).items] == ["old", "new"]
+    finally:
+        stale_responses.degraded_until = 0.0
+
+
+@pytest.mark.asyncio
+async def test_fresh_reads_skip_the_degraded_window():
+    from core.cache import fresh_reads
+
+    store, cache = make_stale_store(), make_cache()
+    store.remember(KEY, "copia")
+    await store.serve(KEY, failing, cache)
+
+    loader = Loader("actual")
+    loader.release.set()
+    with fresh_reads():
+        assert await store.serve(KEY, loader, cache) == "actual"
+    assert loader.calls == 1
+
+
+@pytest.mark.asyncio
+async def test_public_user_reads_fall_back_to_stale_copies_or_503(monkeypatch):
+    import httpx
+    from pymongo.errors import ServerSelectionTimeoutError
+    from core.cache import response_cache, stale_responses
+    from core.config import settings
+    from main import app
+    from repositories.storage import storage
+    from repositories.storage.memory_backend import MemoryCollection
+
+    users = await storage.get_collection("users")
+    await users.insert_one({
+        "username": "stale-user", "full_name": "Ana", "email": "stale@example.com",
+        "roles": ["admin"], "updated_at": "2024-01-01T00:00:00+00:00",
+    })
+    transport = httpx.ASGITransport(app=app)
+    try:
+        async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+            by_name = f"{settings.API_PREFIX}/users/p/stale-user"
+            by_email = f"{settings.API_PREFIX}/users/p/email/stale@example.com"
+            assert (await client.get(by_name)).status_code == 200
+            assert (await client.get(by_email)).status_code == 200
+
+            async def find_down(*args, **kwargs):
+                raise ServerSelectionTimeoutError("sin servidores")
+                yield
+
+            async def find_one_down(*args, **kwargs):
+                raise ServerSelectionTimeoutError("sin servidores")
+
+            monkeypatch.setattr(MemoryCollection, "find", find_down)
+            monkeypatch.setattr(MemoryCollection, "find_one", find_one_down)
+            response_cache.clear()
+
+            for url in (by_name, by_email):
+                response = await client.get(url)
+                assert response.status_code == 200
+                assert response.json()["username"] == "stale-user"
+                assert "warning" in response.headers
+            assert (await client.get(f"{settings.API_PREFIX}/users/p/nadie")).status_code == 503
+    finally:
+        stale_responses.degraded_until = 0.0
+        await users.delete_many({"username": "stale-user"})
@@ -0,0 +1,119 @@
+import os
+import uuid
+from datetime import date
+import pytest
+import pytest_asyncio
+from repositories.work_experience_repository import WorkExperienceRepository
+from repositories.storage.motor_backend import MotorCollection
+from services.work_experience_service import WorkExperienceService
+
+months_between = WorkExperienceService._months_between
+merged_months = WorkExperienceService._merged_months
+
+
+@pytest.mark.parametrize("start, end, expected", [
+    (date(2020, 1, 15), date(2020, 1, 31), 0),
+    (date(2020, 1, 15), date(2020, 2, 14), 0),
+    (date(2020, 1, 15), date(2020, 2, 15), 1),
+    (date(2020, 1, 31), date(2020, 2, 29), 0),
+    (date(2019, 11, 1), date(2021, 3, 1), 16),
+    (date(2021, 3, 1), date(2020, 1, 1), 0),
+])
+def test_months_between_counts_whole_months(start, end, expected):
+    assert months_between(start, end) == expected
+
+
+def test_merged_months_without_overlap_is_the_sum():
+    intervals = [(date(2018, 1, 1), date(2019, 1, 1)), (date(2020, 1, 1), date(2020, 7, 1))]
+    assert merged_months(intervals) == 18
+
+
+def test_overlapping_jobs_are_not_counted_twice():
+    intervals = [
+        (date(2020, 1, 1), date(2021, 1, 1)),
+        (date(2020, 7, 1), date(2021, 7, 1)),
+    ]
+    assert merged_months(intervals) == 18
+
+
+def test_contained_and_unsorted_intervals():
+    intervals = [
+        (date(2021, 3, 1), date(2021, 5, 1)),
+        (date(2020, 1, 1), date(2022, 1, 1)),
+        (date(2023, 1, 1), date(2023, 4, 1)),
+        (date(2022, 1, 1), date(2022, 3, 1)),
+    ]
+    # 2020-01 .. 2022-03 (se toca en el borde) + 2023-01 .. 2023-04
+    assert merged_months(intervals) == 26 + 3
+
+
+def test_merged_months_of_nothing_is_zero():
+    assert merged_months([]) == 0
+
+
+@pytest.mark.asyncio
+async def test_stats_in_python_merge_overlaps_per_company(collection):
+    await collection.bulk_insert([
+        {"username": "ana", "company": "A", "rol": "dev", "initial_date": "2020-01-01", "end_date": "2021-01-01"},
+        {"username": "ana", "company": "A", "rol": "lead", "initial_date": "2020-07-01", "end_date": "2021-09-01"},
+        {"username": "ana", "company": "B", "rol": "consultor", "initial_date": "2021-06-01", "end_date": "2022-03-01"},
+        {"username": "ana", "company": "C", "rol": "sin fecha", "initial_date": None},
+    ])
+    service = WorkExperienceService()
+    service.repo = WorkExperienceRepository(collection)
+
+    stats = await service._stats_in_python("ana", date(2024, 1, 1))
+    # A: 2020-01 .. 2021-09 (20 meses); B se solapa con A y llega hasta 2022-03
+    assert stats["total_months"] == 26
+    assert stats["by_company"] == [{"company": "A", "months": 20}, {"company": "B", "months": 9}]
+    assert stats["longest"] == {"company": "A", "rol": "lead", "months": 14}
+
+
+# La agregación usa $dateDiff (MongoDB 5.0+), que mongomock no implementa: se
+# compara contra un mongod real si hay uno en MONGO_TEST_URI (o en localhost).
+MONGO_TEST_URI = os.environ.get("MONGO_TEST_URI", "mongodb://localhost:27017")
+
+JOBS = [
+    # Solapados en la misma empresa
+    {"company": "A", "rol": "dev", "initial_date": "2015-01-31", "end_date": "2016-02-29"},
+    {"company": "A", "rol": "lead", "initial_date": "2015-09-15", "end_date": "2017-03-14"},
+    # Contenido en otro y tocando el borde del siguiente
+    {"company": "B", "rol": "consultor", "initial_date": "2016-06-01", "end_date": "2016-08-31"},
+    {"company": "B", "rol": "arquitecto", "initial_date": "2017-03-14", "end_date": "2017-12-01T10:30:00"},
+    # Abiertos: sin end_date o con una inválida
+    {"company": "C", "rol": "cto", "initial_date": "2019-02-28", "end_date": None},
+    {"company": "D", "rol": "asesor", "initial_date": "2023-12-31", "end_date": "no es fecha"},
+    # Sin fecha de inicio válida: no cuenta
+    {"company": "E", "rol": "sin fecha", "initial_date": "??", "end_date": "2020-01-01"},
+]
+
+
+@pytest_asyncio.fixture
+async def mongod_collection():
+    from motor.motor_asyncio import AsyncIOMotorClient
+
+    client = AsyncIOMotorClient(MONGO_TEST_URI, serverSelectionTimeoutMS=500)
+    try:
+        info = await client.server_info()
+    except Exception:
+        client.close()
+        pytest.skip(f"Sin mongod en {MONGO_TEST_URI}")
+    if tuple(info["versionArray"][:2]) < (5, 0):
+        client.close()
+        pytest.skip("La agregación requiere MongoDB 5.0+")
+    collection = client["jimcostdev_api_tests"][f"work_experience_{uuid.uuid4().hex}"]
+    try:
+        yield MotorCollection(collection)
+    finally:
+        await collection.drop()
+        client.close()
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("today", [date(2024, 2, 29), date(2024, 3, 1), date(2024, 12, 31)])
+async def test_aggregation_matches_the_python_fallback(mongod_collection, today):
+    await mongod_collection.bulk_insert([{**job, "username": "ana"} for job in JOBS])
+    service = WorkExperienceService()
+    service.repo = WorkExperienceRepository(mongod_collection)
+
+    assert await service.repo.experience_stats("ana", today) == await service._stats_in_python("ana", today)
@@ -0,0 +1,15 @@
+# Funciones que se ejecutan en los procesos del pool de hashing.
+# Este módulo no importa nada más para que los procesos hijos arranquen rápido;
+# bcrypt se carga con el primer hash, no al arrancar la aplicación.
+
+
+def hash_password_sync(password: bytes) -> bytes:
+    import bcrypt
+
+    return bcrypt.hashpw(password, bcrypt.gensalt())
+
+
+def verify_password_sync(plain_password: bytes, hashed_password: bytes) -> bool:
+    import bcrypt
+
+    return bcrypt.checkpw(plain_password, hashed_password)
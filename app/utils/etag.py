@@ -0,0 +1,25 @@
+from fastapi import Request, Response, status
+
+
+def _matches(if_none_match: str | None, etag: str) -> bool:
+    if not if_none_match:
+        return False
+    if if_none_match.strip() == "*":
+        return True
+    # If-None-Match usa comparación débil: se ignora el prefijo W/
+    candidates = (tag.strip().removeprefix("W/") for tag in if_none_match.split(","))
+    return etag in candidates
+
+
+def check_etag(request: Request, response: Response, etag: str | None) -> Response | None:
+    """
+    Agrega el ETag a la respuesta. Si el cliente envía un If-None-Match que coincide,
+    devuelve una respuesta 304 vacía para retornarla directamente desde el endpoint,
+    sin cargar ni serializar el cuerpo.
+    """
+    if etag is None:
+        return None
+    response.headers["ETag"] = etag
+    if _matches(request.headers.get("if-none-match"), etag):
+        return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers={"ETag": etag})
+    return None
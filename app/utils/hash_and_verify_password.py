@@ -1,12 +1,120 @@
-import aiobcrypt
+import asyncio
+import multiprocessing
+import time
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from typing import Any, Callable
+from core.config import settings
+from exceptions import ServiceUnavailableException
+from utils.bcrypt_worker import hash_password_sync, verify_password_sync
+
+
+class HashingEngine:
+    """
+    Ejecuta bcrypt en un pool de procesos dedicado, fuera del GIL y del thread pool
+    por defecto del event loop. Limita las operaciones simultáneas y, si una petición
+    espera turno más de `queue_timeout` segundos, responde 503 en lugar de encolarse
+    indefinidamente.
+
+    Con `workers <= 0` se usa el thread pool por defecto (útil en tests).
+    """
+
+    def __init__(self, workers: int, max_in_flight: int, queue_timeout: float):
+        self.workers = workers
+        self.max_in_flight = max_in_flight
+        self.queue_timeout = queue_timeout
+        self._executor: ProcessPoolExecutor | None = None
+        self._semaphore = asyncio.Semaphore(max_in_flight)
+        self.waiting = 0
+        self.in_flight = 0
+        self.completed = 0
+        self.failed = 0
+        self.rejected = 0
+        self.total_wait_seconds = 0.0
+        self.total_latency_seconds = 0.0
+        self.max_latency_seconds = 0.0
+
+    def _get_executor(self) -> ProcessPoolExecutor | None:
+        if self._executor is None and self.workers > 0:
+            # spawn: hacer fork de un proceso con los hilos de Motor no es seguro
+            self._executor = ProcessPoolExecutor(
+                max_workers=self.workers,
+                mp_context=multiprocessing.get_context("spawn"),
+            )
+        return self._executor
+
+    async def run(self, fn: Callable[..., Any], *args: Any) -> Any:
+        queued_at = time.perf_counter()
+        self.waiting += 1
+        try:
+            await asyncio.wait_for(self._semaphore.acquire(), timeout=self.queue_timeout)
+        except asyncio.TimeoutError:
+            self.rejected += 1
+            raise ServiceUnavailableException(
+                "Servicio de autenticación saturado, intenta de nuevo en unos segundos"
+            )
+        finally:
+            self.waiting -= 1
+
+        started_at = time.perf_counter()
+        self.total_wait_seconds += started_at - queued_at
+        self.in_flight += 1
+        try:
+            loop = asyncio.get_running_loop()
+            result = await loop.run_in_executor(self._get_executor(), fn, *args)
+            self.completed += 1
+            return result
+        except BrokenProcessPool:
+            # Un proceso murió: se descarta el pool para recrearlo en la siguiente llamada
+            self.failed += 1
+            self._executor = None
+            raise
+        except Exception:
+            self.failed += 1
+            raise
+        finally:
+            latency = time.perf_counter() - started_at
+            self.total_latency_seconds += latency
+            self.max_latency_seconds = max(self.max_latency_seconds, latency)
+            self.in_flight -= 1
+            self._semaphore.release()
+
+    def shutdown(self) -> None:
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
+
+    def stats(self) -> dict:
+        finished = self.completed + self.failed
+        return {
+            "workers": self.workers,
+            "max_in_flight": self.max_in_flight,
+            "queue_timeout_seconds": self.queue_timeout,
+            "queue_depth": self.waiting,
+            "in_flight": self.in_flight,
+            "completed": self.completed,
+            "failed": self.failed,
+            "rejected": self.rejected,
+            "avg_wait_seconds": round(self.total_wait_seconds / finished, 6) if finished else 0.0,
+            "avg_latency_seconds": round(self.total_latency_seconds / finished, 6) if finished else 0.0,
+            "max_latency_seconds": round(self.max_latency_seconds, 6),
+        }
+
+
+hashing_engine = HashingEngine(
+    workers=settings.HASH_POOL_WORKERS,
+    max_in_flight=settings.HASH_MAX_IN_FLIGHT,
+    queue_timeout=settings.HASH_QUEUE_TIMEOUT_SECONDS,
+)
+
 
 # Función asíncrona para hashear la contraseña
 async def hash_password(password: str) -> str:
     try:
-        # Generar salt y hashear de forma asíncrona
-        salt = await aiobcrypt.gensalt()
-        hashed_bytes = await aiobcrypt.hashpw(password.encode('utf-8'), salt)
+        hashed_bytes = await hashing_engine.run(hash_password_sync, password.encode('utf-8'))
         return hashed_bytes.decode('utf-8')
+    except ServiceUnavailableException:
+        raise
     except Exception as e:
         raise RuntimeError(f"Error al hashear la contraseña: {e}") from e
 
@@ -17,7 +125,8 @@ async def verify_password(plain_password: str, hashed_password: str) -> bool:
         plain_bytes = plain_password.encode('utf-8')
         hashed_bytes = hashed_password.encode('utf-8')
         
-        # Verificar de forma asíncrona
-        return await aiobcrypt.checkpw(plain_bytes, hashed_bytes)
+        return await hashing_engine.run(verify_password_sync, plain_bytes, hashed_bytes)
+    except ServiceUnavailableException:
+        raise
     except Exception as e:
-        raise RuntimeError(f"Error al verificar la contraseña: {e}") from e
\ No newline at end of file
+        raise RuntimeError(f"Error al verificar la contraseña: {e}") from e
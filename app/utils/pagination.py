@@ -0,0 +1,61 @@
+import base64
+import binascii
+from dataclasses import dataclass, field
+from typing import Annotated, Any, Generic, TypeVar
+from bson import json_util
+from bson.errors import BSONError
+from fastapi import Query, Response
+from core.config import settings
+from exceptions import ValidationException
+
+T = TypeVar("T")
+
+NEXT_CURSOR_HEADER = "X-Next-Cursor"
+
+# Parámetros opcionales de los listados públicos
+LimitQuery = Annotated[
+    int | None,
+    Query(
+        ge=1,
+        le=settings.PAGE_MAX_LIMIT,
+        description="Tamaño de página. Sin él se devuelven todos los elementos.",
+    ),
+]
+CursorQuery = Annotated[
+    str | None,
+    Query(description="Cursor opaco de la cabecera X-Next-Cursor de la página anterior."),
+]
+
+
+@dataclass
+class Page(Generic[T]):
+    """Una página de resultados y el cursor para pedir la siguiente (None si es la última)."""
+    items: list[T] = field(default_factory=list)
+    next_cursor: str | None = None
+
+
+def encode_cursor(values: list[Any]) -> str:
+    """
+    Codifica los valores de la clave de orden del último documento como un cursor
+    opaco. Se usa Extended JSON para conservar el tipo de `_id` (int u ObjectId).
+    """
+    raw = json_util.dumps(values, separators=(",", ":")).encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str, size: int) -> list[Any]:
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4))
+        values = json_util.loads(raw)
+    except (binascii.Error, ValueError, BSONError):
+        raise ValidationException("Cursor inválido")
+    if not isinstance(values, list) or len(values) != size:
+        raise ValidationException("Cursor inválido")
+    return values
+
+
+def paginate(response: Response, page: Page[T]) -> list[T]:
+    """Expone el cursor de la siguiente página en la cabecera X-Next-Cursor y devuelve los elementos."""
+    if page.next_cursor:
+        response.headers[NEXT_CURSOR_HEADER] = page.next_cursor
+    return page.items
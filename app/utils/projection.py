@@ -0,0 +1,21 @@
+from functools import lru_cache
+from pydantic import BaseModel
+
+
+@lru_cache(maxsize=None)
+def _fields(model: type[BaseModel]) -> tuple[str, ...]:
+    return tuple(
+        field.alias or name
+        for name, field in model.model_fields.items()
+        # `id` se construye a partir de `_id`, que MongoDB siempre devuelve
+        if (field.alias or name) != "id"
+    )
+
+
+def projection_for(model: type[BaseModel]) -> dict[str, int]:
+    """
+    Proyección de MongoDB con los campos que usa `model`. Así las lecturas solo
+    traen lo que la respuesta necesita (sin created_at, updated_at, campos legacy,
+    contraseñas, etc.).
+    """
+    return {field: 1 for field in _fields(model)}